@@ -1,6 +1,6 @@
 from contextlib import asynccontextmanager
+import asyncio
 import os
-import threading
 import logging
 
 from fastapi import FastAPI
@@ -26,7 +26,7 @@ async def lifespan(app: FastAPI):
     
     # Iniciar MLflow Monitor em background se habilitado
     enable_monitor = os.getenv("ENABLE_MLFLOW_MONITOR", "false").lower() == "true"
-    monitor_thread = None
+    monitor_task = None
     
     if enable_monitor:
         logger.info("Iniciando MLflow Monitor em background...")
@@ -57,12 +57,10 @@ async def lifespan(app: FastAPI):
             logger.warning("S3 não configurado - defina S3_BUCKET_NAME no .env")
         
         if mlflow_monitor.initialize():
-            monitor_thread = threading.Thread(
-                target=mlflow_monitor.start_monitoring,
-                args=(experiments, True),
-                daemon=True
+            monitor_task = asyncio.create_task(
+                mlflow_monitor.start_monitoring(experiments, True)
             )
-            monitor_thread.start()
+            mlflow_monitor._task = monitor_task
             logger.info(f"MLflow Monitor iniciado (intervalo: {polling_interval}s, experimentos: {experiments})")
         else:
             logger.error("Falha ao inicializar MLflow Monitor")
@@ -74,10 +72,13 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown: parar monitor se estiver rodando
-    if monitor_thread and monitor_thread.is_alive():
+    if monitor_task and not monitor_task.done():
         logger.info("Parando MLflow Monitor...")
         mlflow_monitor.stop_monitoring()
-        monitor_thread.join(timeout=5)
+        try:
+            await asyncio.wait_for(monitor_task, timeout=5)
+        except asyncio.TimeoutError:
+            monitor_task.cancel()
 
 
 app = FastAPI(
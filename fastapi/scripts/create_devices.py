@@ -377,24 +377,31 @@ def process_csv_data(df: pd.DataFrame) -> List[Dict]:
         'Hora UTC': 'time'
     }
     
-    for _, row in df.iterrows():
+    # Nomes mapeados e colunas de data resolvidos uma vez por coluna
+    mapped_names = [
+        column_mapping.get(col, col.lower().replace(' ', '_')) for col in df.columns
+    ]
+    columns = [
+        (mapped_name, 'data' in col.lower() or 'timestamp' in mapped_name)
+        for col, mapped_name in zip(df.columns, mapped_names)
+    ]
+    
+    # Máscara de NaN calculada uma vez para o DataFrame inteiro
+    notna = df.notna().to_numpy()
+    
+    for values, present in zip(df.itertuples(index=False, name=None), notna):
         try:
             telemetry = {}
             timestamp = None
             
             # Processar cada coluna
-            for col in df.columns:
-                value = row[col]
-                
+            for (mapped_name, is_date), value, has_value in zip(columns, values, present):
                 # Pular valores NaN
-                if pd.isna(value):
+                if not has_value:
                     continue
                 
-                # Tentar mapear para nome simplificado
-                mapped_name = column_mapping.get(col, col.lower().replace(' ', '_'))
-                
                 # Lidar com timestamps
-                if 'data' in col.lower() or 'timestamp' in mapped_name:
+                if is_date:
                     try:
                         # Tentar parsear a data
                         if isinstance(value, str):
@@ -6,11 +6,27 @@ Lê os arquivos JSON da pasta reports/graficos_thingsboard e cria/atualiza os da
 import os
 import sys
 import json
+import base64
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # fallback para o json da biblioteca padrão
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Adicionar o diretório fastapi ao path
 fastapi_dir = Path(__file__).parent.parent
@@ -25,6 +41,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Número máximo de dashboards importados em paralelo
+MAX_IMPORT_WORKERS = 10
+
+# Renovar o JWT quando faltar menos que isso (segundos) para expirar
+TOKEN_REFRESH_MARGIN = 60
+
 # Carregar variáveis de ambiente
 # Em Docker: /app/.env, localmente: fastapi/.env
 if Path("/app/.env").exists():
@@ -36,6 +58,22 @@ if env_path.exists():
     load_dotenv(env_path)
 
 
+def _load_json(file_path: Path) -> Any:
+    """Lê um arquivo JSON (orjson quando disponível)."""
+    if orjson is not None:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dumps(payload: Any) -> bytes:
+    """Serializa um payload em JSON compacto (orjson quando disponível)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
 class ThingsBoardDashboardImporter:
     """Importador de dashboards para ThingsBoard."""
 
@@ -52,7 +90,29 @@ class ThingsBoardDashboardImporter:
         self.username = username
         self.password = password
         self.jwt_token = None
+        self._token_exp: Optional[float] = None
+        self._auth_lock = threading.Lock()
+        # Índice título → dashboard (preenchido por prime_index)
+        self._title_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Um lock por título: arquivos com o mesmo título não podem ambos criar
+        self._title_locks: Dict[str, threading.Lock] = {}
+        self._title_locks_lock = threading.Lock()
         self.session = requests.Session()
+        # Pool keep-alive para um único host, compartilhado pelas threads de
+        # importação, com retry para falhas transitórias do gateway (apenas
+        # nos métodos idempotentes padrão: repetir o POST de criação poderia
+        # duplicar o dashboard)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def authenticate(self) -> bool:
         """
@@ -69,6 +129,7 @@ class ThingsBoardDashboardImporter:
             response.raise_for_status()
 
             self.jwt_token = response.json().get("token")
+            self._token_exp = self._jwt_exp(self.jwt_token)
             self.session.headers.update(
                 {
                     "Authorization": f"Bearer {self.jwt_token}",
@@ -83,6 +144,107 @@ class ThingsBoardDashboardImporter:
             logger.error(f"✗ Erro ao autenticar no ThingsBoard: {e}")
             return False
 
+    @staticmethod
+    def _jwt_exp(token: Optional[str]) -> Optional[float]:
+        """
+        Lê o claim 'exp' do payload do JWT (sem validar a assinatura).
+
+        Args:
+            token: JWT emitido pelo ThingsBoard
+
+        Returns:
+            Expiração em epoch (segundos) ou None se não for possível ler
+        """
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+            return float(exp) if exp is not None else None
+        except Exception:
+            return None
+
+    def _refresh_token(self, stale_token: Optional[str]) -> bool:
+        """
+        Reautentica uma única vez, mesmo com várias threads pedindo ao mesmo tempo.
+
+        Args:
+            stale_token: Token que estava em uso quando a renovação foi pedida
+
+        Returns:
+            True se há um token válido após a chamada
+        """
+        with self._auth_lock:
+            if self.jwt_token != stale_token:
+                # Outra thread já renovou o token
+                return True
+            logger.info("Renovando token JWT do ThingsBoard...")
+            return self.authenticate()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Faz uma requisição autenticada, renovando o JWT quando necessário.
+
+        O token é renovado antes de expirar e, se ainda assim a resposta for
+        401, a requisição é repetida uma vez após reautenticar.
+
+        Args:
+            method: Método HTTP
+            url: URL da requisição
+            **kwargs: Argumentos repassados para session.request
+
+        Returns:
+            Resposta da requisição
+        """
+        token = self.jwt_token
+        if (
+            self._token_exp is not None
+            and time.time() > self._token_exp - TOKEN_REFRESH_MARGIN
+        ):
+            self._refresh_token(token)
+            token = self.jwt_token
+
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code == 401 and self._refresh_token(token):
+            response = self.session.request(method, url, **kwargs)
+        return response
+
+    def prime_index(self) -> bool:
+        """
+        Carrega todos os dashboards do tenant em um índice por título.
+
+        Com o índice carregado, get_dashboard_by_title não faz mais requisições.
+
+        Returns:
+            True se o índice foi carregado com sucesso
+        """
+        try:
+            url = f"{self.tb_url}/api/tenant/dashboards"
+            index: Dict[str, Dict[str, Any]] = {}
+            page = 0
+
+            while True:
+                response = self._request(
+                    "GET", url, params={"pageSize": 1000, "page": page}, timeout=30
+                )
+                response.raise_for_status()
+                data = response.json()
+
+                for dashboard in data.get("data", []):
+                    index.setdefault(dashboard.get("title"), dashboard)
+
+                if not data.get("hasNext"):
+                    break
+                page += 1
+
+            self._title_index = index
+            logger.info(f"✓ {len(index)} dashboards existentes indexados")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Não foi possível indexar dashboards: {e}")
+            self._title_index = None
+            return False
+
     def get_dashboard_by_title(self, title: str) -> Optional[Dict[str, Any]]:
         """
         Busca um dashboard pelo título.
@@ -93,11 +255,14 @@ class ThingsBoardDashboardImporter:
         Returns:
             Dashboard encontrado ou None
         """
+        if self._title_index is not None:
+            return self._title_index.get(title)
+
         try:
             url = f"{self.tb_url}/api/tenant/dashboards"
             params = {"pageSize": 1000, "page": 0, "textSearch": title}
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._request("GET", url, params=params, timeout=10)
             response.raise_for_status()
 
             dashboards = response.json().get("data", [])
@@ -128,7 +293,13 @@ class ThingsBoardDashboardImporter:
         try:
             url = f"{self.tb_url}/api/dashboard"
 
-            response = self.session.post(url, json=dashboard_data, timeout=30)
+            response = self._request(
+                "POST",
+                url,
+                data=_dumps(dashboard_data),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
             response.raise_for_status()
 
             return response.json()
@@ -158,7 +329,13 @@ class ThingsBoardDashboardImporter:
             # Adicionar ID ao payload
             dashboard_data["id"] = {"id": dashboard_id, "entityType": "DASHBOARD"}
 
-            response = self.session.post(url, json=dashboard_data, timeout=30)
+            response = self._request(
+                "POST",
+                url,
+                data=_dumps(dashboard_data),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
             response.raise_for_status()
 
             return response.json()
@@ -169,6 +346,40 @@ class ThingsBoardDashboardImporter:
                 logger.error(f"Resposta: {e.response.text}")
             return None
 
+    @staticmethod
+    def _peek_title(file_path: Path) -> str:
+        """
+        Extrai o título de primeiro nível do JSON sem montar o documento inteiro.
+
+        Args:
+            file_path: Caminho do arquivo JSON
+
+        Returns:
+            Título do dashboard ou o nome do arquivo, se não houver título
+        """
+        with open(file_path, "rb") as f:
+            return next(
+                (
+                    value
+                    for prefix, event, value in ijson.parse(f)
+                    if prefix == "title" and event == "string"
+                ),
+                file_path.stem,
+            )
+
+    def _title_lock(self, title: str) -> threading.Lock:
+        """
+        Retorna o lock do título (criado no primeiro uso).
+
+        Args:
+            title: Título do dashboard
+
+        Returns:
+            Lock compartilhado pelas importações com esse título
+        """
+        with self._title_locks_lock:
+            return self._title_locks.setdefault(title, threading.Lock())
+
     def import_dashboard_from_file(
         self, file_path: Path, update_if_exists: bool = True
     ) -> bool:
@@ -183,39 +394,52 @@ class ThingsBoardDashboardImporter:
             True se importado com sucesso
         """
         try:
-            # Ler arquivo JSON
-            with open(file_path, "r", encoding="utf-8") as f:
-                dashboard_json = json.load(f)
-
-            title = dashboard_json.get("title", file_path.stem)
-
-            # Verificar se dashboard já existe
-            existing_dashboard = self.get_dashboard_by_title(title)
+            dashboard_json = None
 
-            if existing_dashboard:
-                if update_if_exists:
-                    logger.info(f"Dashboard '{title}' já existe, atualizando...")
-                    result = self.update_dashboard(
-                        existing_dashboard["id"]["id"], dashboard_json
-                    )
+            if ijson is not None and not update_if_exists:
+                # Lê só o título; o JSON completo só é carregado se for criar
+                title = self._peek_title(file_path)
+            else:
+                dashboard_json = _load_json(file_path)
+                title = dashboard_json.get("title", file_path.stem)
+
+            # Busca e criação/atualização sob o lock do título: outro arquivo
+            # com o mesmo título espera e passa a encontrar o dashboard criado
+            with self._title_lock(title):
+                # Verificar se dashboard já existe
+                existing_dashboard = self.get_dashboard_by_title(title)
+
+                if dashboard_json is None and not existing_dashboard:
+                    dashboard_json = _load_json(file_path)
+
+                if existing_dashboard:
+                    if update_if_exists:
+                        logger.info(f"Dashboard '{title}' já existe, atualizando...")
+                        result = self.update_dashboard(
+                            existing_dashboard["id"]["id"], dashboard_json
+                        )
+                        if result:
+                            logger.info(
+                                f"✓ Dashboard '{title}' atualizado com sucesso"
+                            )
+                            return True
+                        else:
+                            logger.error(f"✗ Falha ao atualizar dashboard '{title}'")
+                            return False
+                    else:
+                        logger.info(f"⊘ Dashboard '{title}' já existe, pulando")
+                        return True
+                else:
+                    logger.info(f"Criando novo dashboard '{title}'...")
+                    result = self.create_dashboard(dashboard_json)
                     if result:
-                        logger.info(f"✓ Dashboard '{title}' atualizado com sucesso")
+                        if self._title_index is not None:
+                            self._title_index[title] = result
+                        logger.info(f"✓ Dashboard '{title}' criado com sucesso")
                         return True
                     else:
-                        logger.error(f"✗ Falha ao atualizar dashboard '{title}'")
+                        logger.error(f"✗ Falha ao criar dashboard '{title}'")
                         return False
-                else:
-                    logger.info(f"⊘ Dashboard '{title}' já existe, pulando")
-                    return True
-            else:
-                logger.info(f"Criando novo dashboard '{title}'...")
-                result = self.create_dashboard(dashboard_json)
-                if result:
-                    logger.info(f"✓ Dashboard '{title}' criado com sucesso")
-                    return True
-                else:
-                    logger.error(f"✗ Falha ao criar dashboard '{title}'")
-                    return False
 
         except json.JSONDecodeError as e:
             logger.error(f"✗ Erro ao ler JSON do arquivo {file_path.name}: {e}")
@@ -225,14 +449,24 @@ class ThingsBoardDashboardImporter:
             return False
 
     def import_all_dashboards(
-        self, dashboards_dir: Path, update_if_exists: bool = True
+        self,
+        dashboards_dir: Path,
+        update_if_exists: bool = True,
+        max_workers: int = MAX_IMPORT_WORKERS,
+        on_result: Optional[Callable[[Path, bool], None]] = None,
     ) -> Dict[str, int]:
         """
         Importa todos os dashboards de um diretório.
 
+        Os arquivos são importados em paralelo (cada importação é dominada
+        pela latência do GET de busca + POST de criação/atualização).
+
         Args:
             dashboards_dir: Diretório com os arquivos JSON
             update_if_exists: Se True, atualiza dashboards que já existem
+            max_workers: Número máximo de importações simultâneas
+            on_result: Callback chamado com (arquivo, sucesso) assim que cada
+                importação termina, em vez de acumular os detalhes
 
         Returns:
             Dicionário com contadores de sucesso e falha
@@ -242,7 +476,6 @@ class ThingsBoardDashboardImporter:
             "sucesso": 0,
             "falhas": 0,
             "pulados": 0,
-            "dashboards": [],
         }
 
         # Buscar todos os arquivos JSON recursivamente
@@ -254,30 +487,25 @@ class ThingsBoardDashboardImporter:
 
         logger.info(f"Encontrados {len(json_files)} arquivos JSON")
 
-        for json_file in json_files:
-            resultado["total"] += 1
-            logger.info(f"\n{'='*60}")
+        # Uma listagem paginada no lugar de uma busca por arquivo
+        self.prime_index()
+
+        def importar(json_file: Path) -> bool:
             logger.info(f"Processando: {json_file.relative_to(dashboards_dir)}")
-            logger.info(f"{'='*60}")
-
-            if self.import_dashboard_from_file(json_file, update_if_exists):
-                resultado["sucesso"] += 1
-                resultado["dashboards"].append(
-                    {
-                        "arquivo": json_file.name,
-                        "pasta": json_file.parent.name,
-                        "status": "sucesso",
-                    }
-                )
-            else:
-                resultado["falhas"] += 1
-                resultado["dashboards"].append(
-                    {
-                        "arquivo": json_file.name,
-                        "pasta": json_file.parent.name,
-                        "status": "falha",
-                    }
-                )
+            return self.import_dashboard_from_file(json_file, update_if_exists)
+
+        # map preserva a ordem dos arquivos nos resultados
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for json_file, sucesso in zip(
+                json_files, executor.map(importar, json_files)
+            ):
+                resultado["total"] += 1
+                if sucesso:
+                    resultado["sucesso"] += 1
+                else:
+                    resultado["falhas"] += 1
+                if on_result is not None:
+                    on_result(json_file, sucesso)
 
         return resultado
 
@@ -324,8 +552,14 @@ def main():
     print("IMPORTANDO DASHBOARDS")
     print("=" * 60)
 
+    def mostrar_detalhe(json_file: Path, sucesso: bool) -> None:
+        status_icon = "✓" if sucesso else "✗"
+        print(f"  {status_icon} {json_file.parent.name}/{json_file.name}")
+
     resultado = importer.import_all_dashboards(
-        dashboards_dir=dashboards_dir, update_if_exists=True
+        dashboards_dir=dashboards_dir,
+        update_if_exists=True,
+        on_result=mostrar_detalhe,
     )
 
     # Resumo
@@ -340,13 +574,6 @@ def main():
         taxa = resultado["sucesso"] / resultado["total"] * 100
         print(f"Taxa de sucesso: {taxa:.2f}%")
 
-    # Detalhes
-    if resultado["dashboards"]:
-        print("\nDetalhes:")
-        for dash in resultado["dashboards"]:
-            status_icon = "✓" if dash["status"] == "sucesso" else "✗"
-            print(f"  {status_icon} {dash['pasta']}/{dash['arquivo']}")
-
     print("\n" + "=" * 60)
     print("IMPORTAÇÃO CONCLUÍDA")
     print("=" * 60)
@@ -0,0 +1,29 @@
+"""
+Utilitários de autenticação compartilhados pelos serviços HTTP.
+"""
+
+import logging
+from functools import wraps
+from typing import Any
+
+
+def require_auth(default: Any = None):
+    """
+    Decorator para métodos que exigem authenticate() prévio.
+
+    Sem autenticação, registra o erro e retorna default sem executar o método.
+
+    Args:
+        default: Valor retornado quando não autenticado
+    """
+    def decorator(method):
+        method_logger = logging.getLogger(method.__module__)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self._authenticated:
+                method_logger.error("Não autenticado. Execute authenticate() primeiro")
+                return default
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
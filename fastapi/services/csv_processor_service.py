@@ -176,20 +176,22 @@ class CSVProcessorService:
         if colunas_telemetria is None:
             colunas_telemetria = [col for col in df.columns if col not in colunas_ignorar]
         
-        for _, row in df.iterrows():
-            # Converter timestamp para milissegundos
-            ts = int(row['timestamp'].timestamp() * 1000)
-            
+        # Converter timestamps para milissegundos de uma vez
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[ms]').astype('int64').tolist()
+        
+        # itertuples evita montar uma Series por linha (como iterrows)
+        colunas = [col for col in colunas_telemetria if col in df.columns]
+        linhas = df[colunas].itertuples(index=False, name=None)
+        
+        for ts, linha in zip(timestamps, linhas):
             # Extrair valores
             values = {}
-            for col in colunas_telemetria:
-                if col in row.index:
-                    valor = row[col]
-                    # Converter NaN para None
-                    if pd.isna(valor):
-                        values[col] = None
-                    else:
-                        values[col] = float(valor) if isinstance(valor, (int, float)) else str(valor)
+            for col, valor in zip(colunas, linha):
+                # Converter NaN/None para None (valor != valor só é True para NaN)
+                if valor is None or valor != valor:
+                    values[col] = None
+                else:
+                    values[col] = float(valor) if isinstance(valor, (int, float)) else str(valor)
             
             telemetria.append({
                 "ts": ts,
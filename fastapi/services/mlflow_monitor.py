@@ -13,6 +13,7 @@ Uso CLI:
 Options:
     --experiments, -e   : Lista de experimentos para monitorar (separados por vírgula)
     --interval, -i      : Intervalo de verificação em segundos (default: 60)
+    --max-interval      : Intervalo máximo após ciclos sem runs novos (default: 900)
     --daemon, -d        : Rodar em modo daemon (loop contínuo)
     --tb-url            : URL do ThingsBoard (default: http://thingsboard:9090)
     --tb-user           : Usuário do ThingsBoard
@@ -29,27 +30,405 @@ import time
 import sys
 import os
 import argparse
+import asyncio
+import io
+import json
+import math
+import re
+import threading
 import boto3
 import requests
-from io import StringIO
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from queue import Queue, Empty
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from botocore.exceptions import ClientError
+from mlflow.entities import ViewType
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Set, Any
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:
+    # Sem flock (ex.: Windows): não há exclusão entre processos
+    fcntl = None
+
+try:
+    import uvloop
+except ImportError:  # ex.: Windows; usa o event loop padrão do asyncio
+    uvloop = None
 
 # Para compatibilidade de importação
 if __name__ == "__main__":
     # Quando rodado como script
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from services.mlflow_service import mlflow_service
-    from services.thingsboard_service import thingsboard_service
+    from services.thingsboard_service import _dumps, thingsboard_service
 else:
     # Quando importado como módulo
     from .mlflow_service import mlflow_service
-    from .thingsboard_service import thingsboard_service
+    from .thingsboard_service import _dumps, thingsboard_service
 
 logger = logging.getLogger(__name__)
 
+# Formatos de data/hora aceitos nos CSVs de dados imputados
+CSV_DATETIME_FORMATS = (
+    "%Y-%m-%d %H%M UTC",  # padrão INMET (ex: "2020-01-01 0000 UTC")
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+)
+
+# Colunas do CSV enviadas como telemetria
+TELEMETRY_COLUMNS = ("temperatura", "umidade", "velocidade_vento")
+
+# Colunas do CSV efetivamente usadas para telemetria (demais não são parseadas);
+# data/hora lidas como texto para não perder zeros à esquerda (ex.: "0000 UTC")
+CSV_TELEMETRY_USECOLS = frozenset(("data", "hora") + TELEMETRY_COLUMNS)
+CSV_TELEMETRY_DTYPES = {"data": str, "hora": str}
+
+# Download paralelo por byte-range para CSVs grandes no S3
+S3_RANGE_THRESHOLD = 16 * 1024 * 1024
+S3_RANGE_PART_SIZE = 8 * 1024 * 1024
+S3_RANGE_WORKERS = 8
+
+# Linhas lidas do CSV por chunk no pipeline de streaming S3 → ThingsBoard
+# (~1 MB por chunk: linhas de id, data, hora e 3 medições têm ~50 bytes)
+CSV_CHUNK_SIZE = 20_000
+
+# Registros por requisição de telemetria e tempo máximo de espera para
+# completar um lote antes de enviá-lo
+TELEMETRY_BATCH_SIZE = 1000
+TELEMETRY_FLUSH_INTERVAL = 0.05
+
+# Requisições simultâneas ao ThingsBoard e novas tentativas em 429/503
+TB_MAX_CONCURRENCY = int(os.getenv("TB_MAX_CONCURRENCY", "16"))
+TB_MAX_RETRIES = 3
+
+# Devices distintos enviados em paralelo pelo dispatcher
+TELEMETRY_FLUSH_WORKERS = 4
+
+# Espera máxima (s) pelos envios do dispatcher de um CSV, após a leitura
+TELEMETRY_RESULT_TIMEOUT = float(os.getenv("TELEMETRY_RESULT_TIMEOUT", "300"))
+
+# Máximo de runs processados em paralelo por experimento
+MAX_PARALLEL_RUNS = 8
+
+# Tentativas por run com falha transitória (S3/ThingsBoard) antes de desistir
+MAX_RUN_ATTEMPTS = 3
+
+# Máximo de devices mantidos em cache (LRU) pelo monitor em modo daemon
+DEVICE_CACHE_MAX_SIZE = 10_000
+
+# Validade (segundos) das chaves de CSV encontradas no S3 por (estação, modelo)
+S3_KEY_CACHE_TTL = 300
+
+# Falhas incluídas nas respostas da API quando verbose=False
+RESULTS_FAILURE_SAMPLE = 20
+
+# Marcador de fim de fila entre as etapas do pipeline
+_QUEUE_DONE = object()
+
+# Cabeçalho dos POSTs de telemetria (corpo serializado com _dumps)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Nome do run no formato "processed_data_ESTACAO[_YYYYMMDD_HHMMSS]"
+_PROCESSED_RUN_RE = re.compile(r"processed_data_(?P<station>.+?)(?:_[^_]*_\d+)?$")
+
+# Nome do run no formato "imputacao_ESTACAO_..." ou similar
+_KEYWORD_RUN_RE = re.compile(
+    r"(?:^|_)[^_]*(?:imputacao|imputation|estacao|station)[^_]*_(?P<station>[^_]+)",
+    re.IGNORECASE,
+)
+
+# Prefixos dos arquivos .pkl gerados pelos notebooks
+_PKL_PREFIX_RE = re.compile(r"dados_(?:imputados|tratados|processados)_")
+
+
+class DeviceCache(OrderedDict):
+    """Cache LRU de devices por nome, limitado a `maxsize` entradas."""
+
+    def __init__(self, maxsize: int = DEVICE_CACHE_MAX_SIZE):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize: Número máximo de devices mantidos
+        """
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+@lru_cache(maxsize=4096)
+def device_name_for_station(station_name: str) -> str:
+    """
+    Nome do device no ThingsBoard para uma estação (ex.: "A307 PETROLINA - Processado").
+
+    Args:
+        station_name: Nome da estação (com underscores, como no S3)
+
+    Returns:
+        Nome do device
+    """
+    return f"{station_name.replace('_', ' ')} - Processado"
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> tuple:
+    """
+    Conta runs processados com sucesso e com falha.
+
+    Args:
+        results: Resultados retornados por process_run
+
+    Returns:
+        Tupla (sucesso, falhas)
+    """
+    success_count = sum(bool(r.get("success")) for r in results)
+    return success_count, len(results) - success_count
+
+
+def compact_results(
+    results: List[Dict[str, Any]], verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Reduz a lista de resultados devolvida pela API.
+
+    Args:
+        results: Resultados retornados por process_run
+        verbose: Se True, devolve todos os resultados
+
+    Returns:
+        Todos os resultados (verbose) ou uma amostra das falhas
+    """
+    if verbose:
+        return results
+    return [r for r in results if not r.get("success")][:RESULTS_FAILURE_SAMPLE]
+
+
+class TelemetryBatchDispatcher:
+    """
+    Agrupa telemetria por device e envia em lotes a partir de uma thread própria.
+
+    Itens recebidos via submit() (de qualquer thread) são acumulados por token
+    até somar `batch_size` registros ou até `flush_interval` segundos após o
+    primeiro item pendente; então são enviados em uma única requisição. Assim,
+    pedaços pequenos de vários runs do mesmo device viram poucos POSTs cheios.
+    Lotes de devices diferentes são enviados em paralelo; os de um mesmo
+    device seguem em ordem.
+    """
+
+    def __init__(
+        self,
+        post_batch,
+        batch_size: int = TELEMETRY_BATCH_SIZE,
+        flush_interval: float = TELEMETRY_FLUSH_INTERVAL,
+        flush_workers: int = TELEMETRY_FLUSH_WORKERS,
+    ):
+        """
+        Inicializa o dispatcher.
+
+        Args:
+            post_batch: Função (token, lista de telemetria) -> bool que envia um lote
+            batch_size: Máximo de registros por requisição
+            flush_interval: Espera máxima (s) para completar um lote
+            flush_workers: Máximo de devices enviados em paralelo
+        """
+        self._post_batch = post_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Queue = Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=flush_workers, thread_name_prefix="telemetry-flush"
+        )
+
+    def submit(self, device_token: str, telemetry: List[Dict[str, Any]]) -> Future:
+        """
+        Enfileira telemetria para envio.
+
+        Args:
+            device_token: Token de acesso do device
+            telemetry: Lista de dados de telemetria
+
+        Returns:
+            Future com as estatísticas do envio desses registros
+        """
+        future: Future = Future()
+        if not telemetry:
+            future.set_result({"success": 0, "failed": 0, "total": 0})
+            return future
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="telemetry-dispatcher", daemon=True
+                )
+                self._thread.start()
+
+        self._queue.put((device_token, telemetry, future))
+        return future
+
+    def _run(self):
+        """Loop da thread: acumula itens e envia os lotes prontos."""
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            self._loop(pending)
+        except BaseException as e:
+            logger.error(f"Dispatcher de telemetria interrompido: {e}")
+            self._fail_pending(pending, e)
+            raise
+
+    def _fail_pending(
+        self, pending: Dict[str, List[Dict[str, Any]]], error: BaseException
+    ):
+        """
+        Falha os futures de itens pendentes e dos que ainda estão na fila.
+
+        Evita que quem aguarda um envio fique bloqueado quando a thread morre;
+        um próximo submit() inicia uma thread nova.
+
+        Args:
+            pending: Itens acumulados por device
+            error: Exceção que interrompeu a thread
+        """
+        futures = [entry["future"] for entries in pending.values() for entry in entries]
+        while True:
+            try:
+                futures.append(self._queue.get_nowait()[2])
+            except Empty:
+                break
+
+        for future in futures:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError(f"Dispatcher de telemetria interrompido: {error}")
+                )
+
+    def _loop(self, pending: Dict[str, List[Dict[str, Any]]]):
+        """
+        Acumula itens da fila e envia os lotes prontos (não retorna).
+
+        Args:
+            pending: Itens acumulados por device (preenchido in-place)
+        """
+        deadlines: Dict[str, float] = {}
+
+        while True:
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+
+            try:
+                device_token, telemetry, future = self._queue.get(timeout=timeout)
+                pending.setdefault(device_token, []).append(
+                    {
+                        "telemetry": telemetry,
+                        "offset": 0,
+                        "success": 0,
+                        "failed": 0,
+                        "future": future,
+                    }
+                )
+                deadlines.setdefault(
+                    device_token, time.monotonic() + self.flush_interval
+                )
+            except Empty:
+                pass
+
+            now = time.monotonic()
+            expired = {token: deadlines[token] <= now for token in pending}
+            ready = [
+                token
+                for token, entries in pending.items()
+                if expired[token] or self._buffered(entries) >= self.batch_size
+            ]
+
+            # Cada device é enviado por uma única thread, preservando a ordem
+            if len(ready) > 1:
+                list(
+                    self._executor.map(
+                        lambda token: self._flush(
+                            token, pending[token], force=expired[token]
+                        ),
+                        ready,
+                    )
+                )
+            elif ready:
+                self._flush(ready[0], pending[ready[0]], force=expired[ready[0]])
+
+            for device_token in list(pending):
+                if not pending[device_token]:
+                    del pending[device_token]
+                    del deadlines[device_token]
+                elif expired[device_token]:
+                    deadlines[device_token] = now + self.flush_interval
+
+    @staticmethod
+    def _buffered(entries: List[Dict[str, Any]]) -> int:
+        """Número de registros ainda não enviados nos itens pendentes."""
+        return sum(len(e["telemetry"]) - e["offset"] for e in entries)
+
+    def _flush(self, device_token: str, entries: List[Dict[str, Any]], force: bool):
+        """
+        Envia os lotes completos de um device (e o resto, se `force`).
+
+        Args:
+            device_token: Token de acesso do device
+            entries: Itens pendentes do device (consumidos in-place)
+            force: Se True, envia também um lote incompleto
+        """
+        while entries:
+            if self._buffered(entries) < self.batch_size and not force:
+                return
+
+            # Montar um lote com fatias dos itens pendentes, na ordem de chegada
+            batch: List[Dict[str, Any]] = []
+            parts = []
+            for entry in entries:
+                take = min(
+                    self.batch_size - len(batch),
+                    len(entry["telemetry"]) - entry["offset"],
+                )
+                start = entry["offset"]
+                batch.extend(entry["telemetry"][start : start + take])
+                entry["offset"] += take
+                parts.append((entry, take))
+                if len(batch) >= self.batch_size:
+                    break
+
+            try:
+                sent = self._post_batch(device_token, batch)
+            except Exception as e:
+                logger.error(f"Erro ao enviar lote de telemetria: {e}")
+                sent = False
+            for entry, count in parts:
+                entry["success" if sent else "failed"] += count
+
+            # Resolver os itens totalmente enviados
+            while entries and entries[0]["offset"] >= len(entries[0]["telemetry"]):
+                entry = entries.pop(0)
+                entry["future"].set_result(
+                    {
+                        "success": entry["success"],
+                        "failed": entry["failed"],
+                        "total": len(entry["telemetry"]),
+                    }
+                )
+
 
 class MLflowMonitor:
     """Monitor de eventos do MLflow para sincronização com ThingsBoard."""
@@ -58,6 +437,7 @@ class MLflowMonitor:
         self,
         mlflow_tracking_uri: str = "http://mlflow:5000",
         check_interval: int = 60,
+        max_check_interval: int = 900,
         tb_username: Optional[str] = None,
         tb_password: Optional[str] = None,
         s3_bucket_name: Optional[str] = None,
@@ -69,6 +449,8 @@ class MLflowMonitor:
         Args:
             mlflow_tracking_uri: URI do MLflow
             check_interval: Intervalo de verificação em segundos
+            max_check_interval: Limite do intervalo, dobrado a cada ciclo sem
+                runs novos e restaurado para check_interval quando há runs
             tb_username: Usuário do ThingsBoard
             tb_password: Senha do ThingsBoard
             s3_bucket_name: Nome do bucket S3
@@ -76,6 +458,7 @@ class MLflowMonitor:
         """
         self.mlflow_tracking_uri = mlflow_tracking_uri
         self.check_interval = check_interval
+        self.max_check_interval = max_check_interval
         self.tb_username = tb_username or os.getenv(
             "THINGSBOARD_USERNAME", "tenant@thingsboard.org"
         )
@@ -100,15 +483,67 @@ class MLflowMonitor:
             except Exception as e:
                 logger.error(f"Erro ao configurar S3 client: {e}")
 
-        # Último timestamp verificado por experimento
+        # Último timestamp verificado por experimento (persistido em disco)
         self.last_check_timestamps: Dict[str, int] = {}
+        # Runs após o último timestamp já concluídos (sucesso ou desistência)
+        # e tentativas dos que falharam de forma transitória (persistidos)
+        self._done_runs: Dict[str, Set[str]] = {}
+        self._run_attempts: Dict[str, int] = {}
+        self._state_path = Path(
+            os.getenv("MLFLOW_MONITOR_STATE", "/tmp/mlflow_monitor/state.json")
+        )
+        self._state_lock = threading.Lock()
+        self._leader_file = None
+
+        # Cache de devices criados; _device_lock protege só o cache (LRU) e o
+        # dicionário de locks por nome, nunca uma requisição ao ThingsBoard
+        self.device_cache: DeviceCache = DeviceCache()
+        self._device_lock = threading.Lock()
+        # Um lock por device: runs da mesma estação não criam o device duas
+        # vezes, e estações diferentes buscam/criam em paralelo
+        self._device_name_locks: Dict[str, threading.Lock] = {}
+
+        # Chaves de CSV no S3 por (estação, modelo): (expira_em, s3_key)
+        self._s3_key_cache: Dict[tuple, tuple] = {}
+        self._s3_key_lock = threading.Lock()
+
+        # Envios de CSV em andamento por (s3_key, token), para coalescer runs
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Devices do tenant indexados por nome (pré-carregados no initialize)
+        self._device_index: Dict[str, Dict[str, Any]] = {}
+
+        # Buscas por nome de devices fora do índice (por instância)
+        self._device_lookups: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        # Session HTTP reutilizável (keep-alive) para chamadas ao ThingsBoard;
+        # max_retries cobre apenas falhas de conexão, antes do envio
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=3)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+        # Limita requisições simultâneas ao ThingsBoard (todas as threads)
+        self._tb_semaphore = threading.BoundedSemaphore(TB_MAX_CONCURRENCY)
+
+        # Envio de telemetria agrupado por device (compartilhado entre runs)
+        self._dispatcher = TelemetryBatchDispatcher(self._post_telemetry_batch)
+
+        # Cliente MLflow reutilizado entre runs (criado sob demanda)
+        self._mlflow_client: Optional[mlflow.tracking.MlflowClient] = None
 
-        # Cache de devices criados
-        self.device_cache: Dict[str, Dict[str, Any]] = {}
+        # IDs de experimentos por nome (evita um get_experiment_by_name por ciclo)
+        self._experiment_ids: Dict[str, str] = {}
 
         self._running = False
         self._authenticated_tb = False
 
+        # Controle do loop de monitoramento assíncrono
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
     def initialize(self) -> bool:
         """
         Inicializa conexão com MLflow e ThingsBoard.
@@ -119,12 +554,19 @@ class MLflowMonitor:
         try:
             # Inicializar MLflow
             mlflow.set_tracking_uri(self.mlflow_tracking_uri)
+            # O client guarda a URI no momento da criação
+            self._mlflow_client = None
+            self._experiment_ids.clear()
             logger.info(f"MLflow conectado: {self.mlflow_tracking_uri}")
 
+            # Retomar do último ponto verificado antes de um restart
+            self._load_state()
+
             # Autenticar no ThingsBoard
             if thingsboard_service.authenticate(self.tb_username, self.tb_password):
                 self._authenticated_tb = True
                 logger.info("ThingsBoard autenticado com sucesso")
+                self._preload_devices()
                 return True
             else:
                 logger.error("Falha ao autenticar no ThingsBoard")
@@ -134,6 +576,286 @@ class MLflowMonitor:
             logger.error(f"Erro ao inicializar monitor: {e}")
             return False
 
+    def _load_state(self):
+        """Carrega os timestamps da última verificação salvos em disco."""
+        if not self._state_path.exists():
+            return
+
+        try:
+            state = json.loads(self._state_path.read_text())
+            if "last_check" not in state:
+                # Formato antigo: apenas {experiment_id: timestamp}
+                state = {"last_check": state}
+            self.last_check_timestamps.update(
+                {exp_id: int(ts) for exp_id, ts in state["last_check"].items()}
+            )
+            self._done_runs.update(
+                {
+                    exp_id: set(run_ids)
+                    for exp_id, run_ids in state.get("done_runs", {}).items()
+                }
+            )
+            self._run_attempts.update(state.get("run_attempts", {}))
+            logger.info(f"Estado do monitor carregado de {self._state_path}")
+        except Exception as e:
+            logger.warning(f"Erro ao carregar estado do monitor: {e}")
+
+    def _save_state(self):
+        """Salva timestamps, runs concluídos e tentativas (escrita atômica)."""
+        try:
+            with self._state_lock:
+                state = {
+                    "last_check": self.last_check_timestamps,
+                    "done_runs": {
+                        exp_id: sorted(run_ids)
+                        for exp_id, run_ids in self._done_runs.items()
+                        if run_ids
+                    },
+                    "run_attempts": self._run_attempts,
+                }
+                self._state_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self._state_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(state))
+                os.replace(temp_path, self._state_path)
+        except Exception as e:
+            logger.warning(f"Erro ao salvar estado do monitor: {e}")
+
+    def _record_outcome(
+        self, experiment_id: str, run: mlflow.entities.Run, result: Dict[str, Any]
+    ):
+        """
+        Registra o resultado de um run: concluído ou nova tentativa no próximo ciclo.
+
+        Falhas permanentes (sem estação, CSV ausente ou vazio) e falhas
+        transitórias que esgotaram MAX_RUN_ATTEMPTS contam como concluídas,
+        para não travar o último timestamp do experimento.
+
+        Args:
+            experiment_id: ID do experimento
+            run: Run processado
+            result: Resultado de process_run
+        """
+        run_id = run.info.run_id
+
+        with self._state_lock:
+            done = self._done_runs.setdefault(experiment_id, set())
+
+            if result["success"]:
+                done.add(run_id)
+                self._run_attempts.pop(run_id, None)
+                return
+
+            if not result.get("retryable"):
+                done.add(run_id)
+                self._run_attempts.pop(run_id, None)
+                logger.warning(
+                    f"Run {run_id[:8]}... ignorado (falha permanente): {result['error']}"
+                )
+                return
+
+            attempts = self._run_attempts.get(run_id, 0) + 1
+            if attempts >= MAX_RUN_ATTEMPTS:
+                done.add(run_id)
+                self._run_attempts.pop(run_id, None)
+                logger.error(
+                    f"Run {run_id[:8]}... ignorado após {attempts} tentativas: "
+                    f"{result['error']}"
+                )
+            else:
+                self._run_attempts[run_id] = attempts
+                logger.warning(
+                    f"Run {run_id[:8]}... falhou (tentativa {attempts}/"
+                    f"{MAX_RUN_ATTEMPTS}), será reprocessado: {result['error']}"
+                )
+
+    def _advance_last_check(
+        self, experiment_id: str, runs: List[mlflow.entities.Run]
+    ):
+        """
+        Avança e persiste o último timestamp verificado de um experimento.
+
+        O timestamp para antes do primeiro run ainda pendente (inclusive de
+        runs com o mesmo start_time dele); os concluídos cobertos pelo novo
+        timestamp saem do conjunto de runs concluídos.
+
+        Args:
+            experiment_id: ID do experimento
+            runs: Runs novos do ciclo, em ordem crescente de start_time
+        """
+        with self._state_lock:
+            done = self._done_runs.setdefault(experiment_id, set())
+            first_pending = next(
+                (
+                    int(run.info.start_time)
+                    for run in runs
+                    if run.info.run_id not in done
+                ),
+                None,
+            )
+
+            last_check = self.last_check_timestamps.get(experiment_id, 0)
+            for run in runs:
+                start_time = int(run.info.start_time)
+                if first_pending is not None and start_time >= first_pending:
+                    break
+                last_check = max(last_check, start_time)
+
+            self.last_check_timestamps[experiment_id] = last_check
+            done.difference_update(
+                run.info.run_id
+                for run in runs
+                if int(run.info.start_time) <= last_check
+            )
+
+        self._save_state()
+
+    def _acquire_leader_lock(self) -> bool:
+        """
+        Garante que apenas um processo faça o polling com o mesmo estado.
+
+        Usa flock no arquivo `<state>.lock`; vários workers do uvicorn ou um
+        daemon CLI ao lado da API compartilham o mesmo diretório de estado.
+
+        Returns:
+            True se este processo é o responsável pelo polling
+        """
+        if fcntl is None or self._leader_file is not None:
+            return True
+
+        lock_path = self._state_path.with_suffix(".lock")
+        try:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(lock_path, "w")
+        except OSError as e:
+            logger.warning(f"Não foi possível criar lock do monitor: {e}")
+            return True
+
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._leader_file = lock_file
+        return True
+
+    def _release_leader_lock(self):
+        """Libera o lock de polling, se adquirido."""
+        if self._leader_file is not None:
+            fcntl.flock(self._leader_file, fcntl.LOCK_UN)
+            self._leader_file.close()
+            self._leader_file = None
+
+    def _preload_devices(self, page_size: int = 500):
+        """
+        Carrega todos os devices do tenant em uma busca paginada.
+
+        Evita uma consulta por nome a cada run; o token de cada device
+        continua sendo obtido sob demanda no primeiro uso.
+
+        Args:
+            page_size: Número de devices por página
+        """
+        url = f"{thingsboard_service.tb_url}/api/tenant/devices"
+        headers = {"Authorization": f"Bearer {thingsboard_service.jwt_token}"}
+        device_index: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            page = 0
+            while True:
+                response = self._http.get(
+                    url,
+                    params={"pageSize": page_size, "page": page},
+                    headers=headers,
+                    timeout=30,
+                )
+                response.raise_for_status()
+                content = response.json()
+
+                for device in content.get("data", []):
+                    device_index[device.get("name")] = device
+
+                if not content.get("hasNext"):
+                    break
+                page += 1
+
+            self._device_index = device_index
+            logger.info(f"{len(device_index)} devices carregados do ThingsBoard")
+
+        except Exception as e:
+            logger.warning(f"Erro ao pré-carregar devices do ThingsBoard: {e}")
+
+    @property
+    def mlflow_client(self) -> mlflow.tracking.MlflowClient:
+        """Retorna o MlflowClient compartilhado (cria se necessário)."""
+        if self._mlflow_client is None:
+            self._mlflow_client = mlflow.tracking.MlflowClient()
+        return self._mlflow_client
+
+    def _lookup_device_by_name(self, device_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um device no ThingsBoard pelo nome (resultado em cache).
+
+        Args:
+            device_name: Nome do device
+
+        Returns:
+            Informações do device ou None se não existir
+        """
+        if device_name in self._device_lookups:
+            return self._device_lookups[device_name]
+
+        url = f"{thingsboard_service.tb_url}/api/tenant/devices"
+        headers = {"Authorization": f"Bearer {thingsboard_service.jwt_token}"}
+
+        response = self._http.get(
+            url, params={"deviceName": device_name}, headers=headers, timeout=10
+        )
+        response.raise_for_status()
+        device_info = response.json() or None
+        self._device_lookups[device_name] = device_info
+        return device_info
+
+    def _find_device(self, device_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca device existente no ThingsBoard e obtém seu token.
+
+        Args:
+            device_name: Nome do device
+
+        Returns:
+            Informações do device (id, token) ou None
+        """
+        try:
+            device_info = self._device_index.get(
+                device_name
+            ) or self._lookup_device_by_name(device_name)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.debug(f"Device não existe no ThingsBoard: {device_name}")
+            else:
+                logger.error(f"Erro ao buscar device: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Erro ao buscar device: {e}")
+            return None
+
+        device_id = (device_info or {}).get("id", {}).get("id")
+        token = (
+            thingsboard_service.get_device_credentials(device_id) if device_id else None
+        )
+        if not token:
+            # Não manter em cache uma consulta que não resultou em device válido
+            self._device_lookups.pop(device_name, None)
+            return None
+
+        return {
+            "id": device_id,
+            "name": device_name,
+            "token": token,
+            "info": device_info,
+        }
+
     def get_new_runs(self, experiment_name: str) -> List[mlflow.entities.Run]:
         """
         Busca novos runs desde a última verificação.
@@ -145,49 +867,41 @@ class MLflowMonitor:
             Lista de runs novos
         """
         try:
-            experiment = mlflow.get_experiment_by_name(experiment_name)
-            if not experiment:
-                return []
-
-            experiment_id = experiment.experiment_id
+            experiment_id = self._experiment_ids.get(experiment_name)
+            if experiment_id is None:
+                experiment = self.mlflow_client.get_experiment_by_name(experiment_name)
+                if not experiment:
+                    return []
+                experiment_id = experiment.experiment_id
+                self._experiment_ids[experiment_name] = experiment_id
 
             # Timestamp da última verificação
             last_check = self.last_check_timestamps.get(experiment_id, 0)
 
-            # Buscar runs do experimento
-            runs = mlflow.search_runs(
+            # Buscar apenas runs novos (filtro no servidor, sem get_run extra).
+            # Ordem crescente: se houver mais de max_results, os mais antigos
+            # vêm primeiro e o restante entra no próximo ciclo
+            runs = self.mlflow_client.search_runs(
                 experiment_ids=[experiment_id],
-                order_by=["start_time DESC"],
+                filter_string=f"attributes.start_time > {last_check}",
+                run_view_type=ViewType.ACTIVE_ONLY,
                 max_results=100,
+                order_by=["start_time ASC"],
             )
 
-            if runs.empty:
-                return []
-
             # Filtrar runs novos
             new_runs = []
-            for idx, run_row in runs.iterrows():
-                run_id = run_row["run_id"]
-                start_time = run_row["start_time"]
-                run_name = run_row.get("tags.mlflow.runName", "unknown")
-
-                # Converter start_time para timestamp
-                if isinstance(start_time, pd.Timestamp):
-                    start_timestamp = int(start_time.timestamp() * 1000)
-                else:
-                    start_timestamp = int(start_time)
-
-                if start_timestamp > last_check:
-                    run = mlflow.get_run(run_id)
+            for run in runs:
+                if run.info.start_time > last_check:
                     new_runs.append(run)
+                    run_name = run.info.run_name or "unknown"
                     logger.info(
-                        f"Nova run detectada: {run_name[:50]} ({run_id[:8]}...)"
+                        f"Nova run detectada: {run_name[:50]} ({run.info.run_id[:8]}...)"
                     )
 
-            # Atualizar último timestamp verificado
+            # O último timestamp só avança depois do processamento
+            # (_check_experiment), para não perder runs que falharem
             if new_runs:
-                latest_timestamp = max(int(run.info.start_time) for run in new_runs)
-                self.last_check_timestamps[experiment_id] = latest_timestamp
                 logger.info(f"Detectadas {len(new_runs)} nova(s) run(s)")
 
             return new_runs
@@ -228,23 +942,11 @@ class MLflowMonitor:
         # Tentar extrair do nome do run
         run_name = run.info.run_name
         if run_name:
-            # Formato: "processed_data_ESTACAO_timestamp"
-            if "processed_data_" in run_name:
-                parts = run_name.split("_")
-                if len(parts) >= 3:
-                    # Extrai entre "data" e timestamp
-                    station_parts = parts[2:-2] if parts[-1].isdigit() else parts[2:]
-                    return "_".join(station_parts)
-
-            # Formato: "imputacao_ESTACAO_timestamp" ou similar
-            for keyword in ["imputacao", "imputation", "estacao", "station"]:
-                if keyword in run_name.lower():
-                    parts = run_name.split("_")
-                    idx = next(
-                        (i for i, p in enumerate(parts) if keyword in p.lower()), -1
-                    )
-                    if idx >= 0 and idx + 1 < len(parts):
-                        return parts[idx + 1]
+            match = _PROCESSED_RUN_RE.search(run_name) or _KEYWORD_RUN_RE.search(
+                run_name
+            )
+            if match:
+                return match.group("station")
 
         return None
 
@@ -263,7 +965,7 @@ class MLflowMonitor:
             artifact_uri = run.info.artifact_uri
 
             # Listar artifacts
-            client = mlflow.tracking.MlflowClient()
+            client = self.mlflow_client
             artifacts = client.list_artifacts(run_id)
 
             pkl_files = []
@@ -301,11 +1003,10 @@ class MLflowMonitor:
             filename = pkl_path.stem
 
             # Padrões comuns: dados_imputados_ESTACAO, dados_tratados_ESTACAO
-            for prefix in ["dados_imputados_", "dados_tratados_", "dados_processados_"]:
-                if prefix in filename:
-                    station = filename.replace(prefix, "").strip()
-                    if station:
-                        return station
+            if _PKL_PREFIX_RE.search(filename):
+                station = _PKL_PREFIX_RE.sub("", filename).strip()
+                if station:
+                    return station
 
             # Tentar carregar e extrair metadata
             try:
@@ -377,14 +1078,36 @@ class MLflowMonitor:
         Returns:
             Informações do device (id, token) ou None
         """
+        device_name = device_name_for_station(station_name)
+        with self._device_lock:
+            name_lock = self._device_name_locks.setdefault(
+                device_name, threading.Lock()
+            )
+
+        with name_lock:
+            return self._get_or_create_device(station_name)
+
+    def _cache_device(self, device_name: str, device_data: Dict[str, Any]):
+        """Guarda um device no cache LRU (thread-safe)."""
+        with self._device_lock:
+            self.device_cache[device_name] = device_data
+
+    def _get_or_create_device(self, station_name: str) -> Optional[Dict[str, Any]]:
+        """Implementação de get_or_create_device (chamar com o lock do device)."""
         try:
             # Formatar nome do device
-            device_name = f"{station_name.replace('_', ' ')} - Processado"
+            device_name = device_name_for_station(station_name)
 
             # Verificar cache
-            if device_name in self.device_cache:
+            with self._device_lock:
+                cached = (
+                    self.device_cache[device_name]
+                    if device_name in self.device_cache
+                    else None
+                )
+            if cached:
                 logger.info(f"Device encontrado no cache: {device_name}")
-                return self.device_cache[device_name]
+                return cached
 
             # Verificar se device já existe no ThingsBoard
             if not self._authenticated_tb:
@@ -392,37 +1115,11 @@ class MLflowMonitor:
                 return None
 
             # Buscar device existente
-            try:
-                url = f"{thingsboard_service.tb_url}/api/tenant/devices?deviceName={device_name}"
-                headers = {"Authorization": f"Bearer {thingsboard_service.jwt_token}"}
-
-                import requests
-
-                response = requests.get(url, headers=headers, timeout=10)
-
-                if response.status_code == 200:
-                    device_info = response.json()
-                    if device_info:
-                        device_id = device_info.get("id", {}).get("id")
-                        if device_id:
-                            # Obter token
-                            token = thingsboard_service.get_device_credentials(
-                                device_id
-                            )
-                            if token:
-                                device_data = {
-                                    "id": device_id,
-                                    "name": device_name,
-                                    "token": token,
-                                    "info": device_info,
-                                }
-                                self.device_cache[device_name] = device_data
-                                logger.info(
-                                    f"Device existente encontrado: {device_name}"
-                                )
-                                return device_data
-            except:
-                pass
+            device_data = self._find_device(device_name)
+            if device_data:
+                self._cache_device(device_name, device_data)
+                logger.info(f"Device existente encontrado: {device_name}")
+                return device_data
 
             # Criar novo device
             logger.info(f"Criando novo device: {device_name}")
@@ -454,7 +1151,7 @@ class MLflowMonitor:
                 "info": device_info,
             }
 
-            self.device_cache[device_name] = device_data
+            self._cache_device(device_name, device_data)
             logger.info(f"Device criado com sucesso: {device_name}")
 
             return device_data
@@ -469,6 +1166,37 @@ class MLflowMonitor:
         """
         Encontra arquivo CSV no S3 para a estação e modelo.
 
+        Chaves encontradas ficam em cache por S3_KEY_CACHE_TTL segundos;
+        buscas sem resultado não são cacheadas, para que um CSV recém
+        enviado seja encontrado no próximo ciclo.
+
+        Args:
+            station_name: Nome da estação (pode ter espaços ou underscores)
+            model_type: Tipo do modelo (opcional)
+
+        Returns:
+            Chave do arquivo no S3 ou None
+        """
+        cache_key = (station_name, model_type)
+        now = time.monotonic()
+
+        with self._s3_key_lock:
+            cached = self._s3_key_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        s3_key = self._find_csv_in_s3(station_name, model_type)
+        if s3_key:
+            with self._s3_key_lock:
+                self._s3_key_cache[cache_key] = (now + S3_KEY_CACHE_TTL, s3_key)
+        return s3_key
+
+    def _find_csv_in_s3(
+        self, station_name: str, model_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Busca arquivo CSV no S3 para a estação e modelo (sem cache).
+
         Args:
             station_name: Nome da estação (pode ter espaços ou underscores)
             model_type: Tipo do modelo (opcional)
@@ -537,12 +1265,16 @@ class MLflowMonitor:
             logger.error(f"Erro ao buscar CSV no S3: {e}")
             return None
 
-    def download_csv_from_s3(self, s3_key: str) -> Optional[pd.DataFrame]:
+    def download_csv_from_s3(
+        self, s3_key: str, max_records: Optional[int] = None
+    ) -> Optional[pd.DataFrame]:
         """
         Baixa e lê CSV do S3.
 
         Args:
             s3_key: Chave do arquivo no S3
+            max_records: Se informado, mantém apenas as últimas N linhas
+                (lidas em chunks, sem carregar o arquivo inteiro em memória)
 
         Returns:
             DataFrame com os dados ou None
@@ -552,9 +1284,16 @@ class MLflowMonitor:
             return None
 
         try:
-            obj = self.s3_client.get_object(Bucket=self.s3_bucket_name, Key=s3_key)
-            csv_data = obj["Body"].read().decode("utf-8")
-            df = pd.read_csv(StringIO(csv_data))
+            if max_records is None:
+                df = pd.read_csv(io.BytesIO(self._fetch_s3_object(s3_key)))
+            else:
+                df = None
+                for chunk in self.iter_csv_chunks_from_s3(s3_key):
+                    df = chunk if df is None else pd.concat([df, chunk])
+                    df = df.iloc[-max_records:]
+                if df is None:
+                    df = pd.DataFrame()
+
             logger.info(f"CSV baixado do S3: {len(df)} registros")
             return df
 
@@ -562,6 +1301,207 @@ class MLflowMonitor:
             logger.error(f"Erro ao baixar CSV do S3: {e}")
             return None
 
+    def _fetch_s3_object(self, s3_key: str) -> bytes:
+        """
+        Baixa o conteúdo de um objeto do S3.
+
+        Arquivos acima de S3_RANGE_THRESHOLD são divididos em partes de
+        S3_RANGE_PART_SIZE baixadas em paralelo (GET com Range), já que um
+        único GET fica limitado à banda de uma conexão TCP.
+
+        Args:
+            s3_key: Chave do arquivo no S3
+
+        Returns:
+            Bytes do objeto
+        """
+        head = self.s3_client.head_object(Bucket=self.s3_bucket_name, Key=s3_key)
+        size = head["ContentLength"]
+
+        if size <= S3_RANGE_THRESHOLD:
+            obj = self.s3_client.get_object(Bucket=self.s3_bucket_name, Key=s3_key)
+            return obj["Body"].read()
+
+        ranges = [
+            (start, min(size, start + S3_RANGE_PART_SIZE) - 1)
+            for start in range(0, size, S3_RANGE_PART_SIZE)
+        ]
+
+        def fetch_range(byte_range) -> bytes:
+            obj = self.s3_client.get_object(
+                Bucket=self.s3_bucket_name,
+                Key=s3_key,
+                Range=f"bytes={byte_range[0]}-{byte_range[1]}",
+                IfMatch=head["ETag"],
+            )
+            return obj["Body"].read()
+
+        logger.info(
+            f"Baixando {s3_key} ({size / 1024 / 1024:.1f} MB) em {len(ranges)} partes"
+        )
+        with ThreadPoolExecutor(max_workers=S3_RANGE_WORKERS) as executor:
+            return b"".join(executor.map(fetch_range, ranges))
+
+    def iter_csv_chunks_from_s3(
+        self,
+        s3_key: str,
+        chunksize: int = CSV_CHUNK_SIZE,
+        usecols=None,
+        dtype: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Lê CSV do S3 em chunks, sem baixar o arquivo inteiro antes.
+
+        Args:
+            s3_key: Chave do arquivo no S3
+            chunksize: Número de linhas por chunk
+            usecols: Colunas a parsear (como em pd.read_csv; None = todas)
+            dtype: Tipos por coluna (como em pd.read_csv)
+
+        Yields:
+            DataFrames com até `chunksize` linhas
+        """
+        obj = self.s3_client.get_object(Bucket=self.s3_bucket_name, Key=s3_key)
+        with pd.read_csv(
+            obj["Body"], chunksize=chunksize, usecols=usecols, dtype=dtype
+        ) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def stream_csv_to_thingsboard(
+        self,
+        s3_key: str,
+        device_token: str,
+        chunksize: int = CSV_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Envia um CSV do S3 para o ThingsBoard em pipeline.
+
+        Download, conversão para telemetria e envio rodam em paralelo
+        (threads ligadas por filas limitadas), de forma que a rede e a CPU
+        não fiquem ociosas esperando a etapa anterior terminar.
+
+        Args:
+            s3_key: Chave do arquivo no S3
+            device_token: Token do device
+            chunksize: Número de linhas lidas do CSV por vez
+
+        Returns:
+            Estatísticas do envio (inclui `rows_read`)
+        """
+        result = {"success": 0, "failed": 0, "total": 0, "rows_read": 0}
+        errors: List[str] = []
+
+        chunk_queue: Queue = Queue(maxsize=4)
+        telemetry_queue: Queue = Queue(maxsize=4)
+
+        def download():
+            try:
+                chunks = self.iter_csv_chunks_from_s3(
+                    s3_key,
+                    chunksize,
+                    usecols=CSV_TELEMETRY_USECOLS.__contains__,
+                    dtype=CSV_TELEMETRY_DTYPES,
+                )
+                for chunk in chunks:
+                    result["rows_read"] += len(chunk)
+                    chunk_queue.put(chunk)
+            except Exception as e:
+                errors.append(f"Erro ao baixar CSV do S3: {e}")
+                logger.error(errors[-1])
+            finally:
+                chunk_queue.put(_QUEUE_DONE)
+
+        def transform():
+            try:
+                while True:
+                    chunk = chunk_queue.get()
+                    if chunk is _QUEUE_DONE:
+                        return
+                    telemetry = self.prepare_telemetry_from_csv(chunk)
+                    if telemetry:
+                        telemetry_queue.put(telemetry)
+            except Exception as e:
+                errors.append(f"Erro ao preparar telemetria: {e}")
+                logger.error(errors[-1])
+                # Consumir o restante para não travar o download
+                while chunk_queue.get() is not _QUEUE_DONE:
+                    pass
+            finally:
+                telemetry_queue.put(_QUEUE_DONE)
+
+        workers = [
+            threading.Thread(target=download, daemon=True),
+            threading.Thread(target=transform, daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Envio pelo dispatcher, que agrupa lotes de todos os runs por device
+        futures = []
+        while True:
+            telemetry = telemetry_queue.get()
+            if telemetry is _QUEUE_DONE:
+                break
+            futures.append(
+                (self._dispatcher.submit(device_token, telemetry), len(telemetry))
+            )
+
+        for worker in workers:
+            worker.join()
+
+        deadline = time.monotonic() + TELEMETRY_RESULT_TIMEOUT
+        for future, size in futures:
+            try:
+                send_result = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except FutureTimeoutError:
+                errors.append("Tempo esgotado aguardando envio de telemetria")
+                send_result = {"success": 0, "failed": size, "total": size}
+            except Exception as e:
+                errors.append(f"Erro ao enviar telemetria: {e}")
+                send_result = {"success": 0, "failed": size, "total": size}
+            result["success"] += send_result["success"]
+            result["failed"] += send_result["failed"]
+            result["total"] += send_result["total"]
+
+        if errors:
+            result["error"] = "; ".join(errors)
+
+        return result
+
+    @staticmethod
+    def _parse_csv_timestamps(dates: pd.Series, hours: pd.Series) -> pd.Series:
+        """
+        Converte as colunas data/hora do CSV em timestamps (ms) de uma só vez.
+
+        Args:
+            dates: Coluna com as datas
+            hours: Coluna com as horas
+
+        Returns:
+            Série com timestamps em milissegundos (NaN para linhas inválidas)
+        """
+        datetime_str = dates.astype(str) + " " + hours.astype(str)
+
+        parsed = None
+        for fmt in CSV_DATETIME_FORMATS:
+            parsed = pd.to_datetime(datetime_str, format=fmt, errors="coerce", cache=True)
+            if parsed.notna().all():
+                break
+        else:
+            # Formato desconhecido: deixar o pandas inferir
+            parsed = pd.to_datetime(datetime_str, errors="coerce", cache=True)
+
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+
+        valid = parsed.notna()
+        timestamps = pd.Series(float("nan"), index=dates.index)
+        timestamps.loc[valid] = parsed[valid].astype("int64") // 1_000_000
+        return timestamps
+
     def prepare_telemetry_from_csv(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
         Prepara dados de telemetria a partir do DataFrame CSV.
@@ -572,41 +1512,39 @@ class MLflowMonitor:
         Returns:
             Lista de telemetria formatada para ThingsBoard
         """
-        telemetry_list = []
-
         try:
             # Colunas esperadas: id, data, hora, temperatura, umidade, velocidade_vento
-            for _, row in df.iterrows():
-                try:
-                    # Combinar data e hora para timestamp
-                    if "data" in df.columns and "hora" in df.columns:
-                        date_str = str(row["data"])
-                        time_str = str(row["hora"])
-                        datetime_str = f"{date_str} {time_str}"
-                        timestamp = pd.to_datetime(datetime_str).timestamp() * 1000
-                    else:
-                        timestamp = int(time.time() * 1000)
-
-                    # Preparar valores de telemetria
-                    values = {}
-
-                    if "temperatura" in df.columns and pd.notna(row["temperatura"]):
-                        values["temperatura"] = float(row["temperatura"])
-
-                    if "umidade" in df.columns and pd.notna(row["umidade"]):
-                        values["umidade"] = float(row["umidade"])
-
-                    if "velocidade_vento" in df.columns and pd.notna(
-                        row["velocidade_vento"]
-                    ):
-                        values["velocidade_vento"] = float(row["velocidade_vento"])
-
-                    if values:
-                        telemetry_list.append({"ts": int(timestamp), "values": values})
-
-                except Exception as e:
-                    logger.debug(f"Erro ao processar linha: {e}")
-                    continue
+            value_columns = [col for col in TELEMETRY_COLUMNS if col in df.columns]
+            if not value_columns:
+                logger.info("Preparados 0 registros de telemetria")
+                return []
+
+            # Timestamps convertidos de uma vez para a coluna inteira
+            if "data" in df.columns and "hora" in df.columns:
+                timestamps = self._parse_csv_timestamps(df["data"], df["hora"])
+            else:
+                timestamps = pd.Series(int(time.time() * 1000), index=df.index)
+
+            values_df = df[value_columns].apply(pd.to_numeric, errors="coerce")
+
+            # Descartar linhas sem timestamp válido ou sem nenhum valor
+            valid = timestamps.notna() & values_df.notna().any(axis=1)
+            values_df = values_df[valid]
+            records = values_df.to_dict(orient="records")
+
+            # Só linhas com algum NaN precisam filtrar chaves em Python
+            complete = values_df.notna().all(axis=1).tolist()
+            ts_list = timestamps[valid].astype("int64").tolist()
+
+            telemetry_list = [
+                {
+                    "ts": ts,
+                    "values": record
+                    if full
+                    else {k: v for k, v in record.items() if not math.isnan(v)},
+                }
+                for ts, record, full in zip(ts_list, records, complete)
+            ]
 
             logger.info(f"Preparados {len(telemetry_list)} registros de telemetria")
             return telemetry_list
@@ -615,6 +1553,74 @@ class MLflowMonitor:
             logger.error(f"Erro ao preparar telemetria: {e}")
             return []
 
+    def _post_telemetry_batch(
+        self, device_token: str, batch: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Envia um único lote de telemetria para o ThingsBoard.
+
+        No máximo TB_MAX_CONCURRENCY envios ficam em andamento ao mesmo tempo.
+        Respostas 429/503 são repetidas até TB_MAX_RETRIES vezes, respeitando
+        o cabeçalho Retry-After quando presente.
+
+        Args:
+            device_token: Token de acesso do device
+            batch: Lista de dados de telemetria
+
+        Returns:
+            True se enviado com sucesso
+        """
+        url = f"{thingsboard_service.tb_url}/api/v1/{device_token}/telemetry"
+
+        try:
+            body = _dumps(batch)
+
+            for attempt in range(TB_MAX_RETRIES + 1):
+                with self._tb_semaphore:
+                    response = self._http.post(
+                        url, data=body, headers=_JSON_HEADERS, timeout=30
+                    )
+
+                if response.status_code == 200:
+                    logger.debug(f"Lote enviado: {len(batch)} registros")
+                    return True
+
+                if response.status_code in (429, 503) and attempt < TB_MAX_RETRIES:
+                    delay = self._retry_delay(response, attempt)
+                    logger.warning(
+                        f"ThingsBoard sobrecarregado ({response.status_code}), "
+                        f"nova tentativa em {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                    continue
+
+                logger.error(
+                    f"Erro ao enviar lote: {response.status_code} - {response.text}"
+                )
+                return False
+
+        except Exception as e:
+            logger.error(f"Erro ao enviar lote: {e}")
+            return False
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> float:
+        """
+        Calcula a espera antes de repetir um envio rejeitado.
+
+        Args:
+            response: Resposta 429/503 do ThingsBoard
+            attempt: Número da tentativa (0 = primeira)
+
+        Returns:
+            Segundos de espera (Retry-After ou backoff exponencial, até 30s)
+        """
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 2.0**attempt
+        return min(max(delay, 0.0), 30.0)
+
     def send_telemetry_to_thingsboard(
         self,
         device_token: str,
@@ -635,29 +1641,14 @@ class MLflowMonitor:
         result = {"success": 0, "failed": 0, "total": len(telemetry_data)}
 
         try:
-            # URL do ThingsBoard
-            tb_url = thingsboard_service.tb_url
-            url = f"{tb_url}/api/v1/{device_token}/telemetry"
-
             # Enviar em lotes
             for i in range(0, len(telemetry_data), batch_size):
                 batch = telemetry_data[i : i + batch_size]
 
-                try:
-                    response = requests.post(url, json=batch, timeout=30)
-
-                    if response.status_code == 200:
-                        result["success"] += len(batch)
-                        logger.debug(f"Lote enviado: {len(batch)} registros")
-                    else:
-                        result["failed"] += len(batch)
-                        logger.error(
-                            f"Erro ao enviar lote: {response.status_code} - {response.text}"
-                        )
-
-                except Exception as e:
+                if self._post_telemetry_batch(device_token, batch):
+                    result["success"] += len(batch)
+                else:
                     result["failed"] += len(batch)
-                    logger.error(f"Erro ao enviar lote: {e}")
 
                 # Delay entre lotes
                 if i + batch_size < len(telemetry_data):
@@ -701,7 +1692,7 @@ class MLflowMonitor:
                 logger.warning(
                     f"Dataset muito grande ({len(df)}), enviando apenas {max_records} registros"
                 )
-                df = df.tail(max_records)
+                df = df.iloc[-max_records:]
 
             result = thingsboard_service.send_dataframe(
                 device_token=device_token,
@@ -742,6 +1733,8 @@ class MLflowMonitor:
             "data_sent": False,
             "records_sent": 0,
             "error": None,
+            # Falha transitória (S3/ThingsBoard): vale tentar de novo
+            "retryable": False,
         }
 
         try:
@@ -770,56 +1763,17 @@ class MLflowMonitor:
             station_for_s3 = station_name.replace("_TESTE", "").strip()
 
             # Formato do device: "{CIDADE} - Processado" (substituir _ por espaços)
-            device_name = f"{station_for_s3.replace('_', ' ')} - Processado"
+            device_name = device_name_for_station(station_for_s3)
 
             logger.info(f"Buscando device: {device_name}, CSV no S3: {station_for_s3}")
 
-            # 3. Buscar device existente no ThingsBoard
-            device = None
-
-            # Primeiro verificar cache
-            if device_name in self.device_cache:
-                device = self.device_cache[device_name]
-                logger.info(f"Device encontrado no cache: {device_name}")
-            else:
-                # Buscar no ThingsBoard
-                try:
-                    url = f"{thingsboard_service.tb_url}/api/tenant/devices?deviceName={device_name}"
-                    headers = {
-                        "Authorization": f"Bearer {thingsboard_service.jwt_token}"
-                    }
-
-                    response = requests.get(url, headers=headers, timeout=10)
-
-                    if response.status_code == 200:
-                        device_info = response.json()
-                        if device_info:
-                            device_id = device_info.get("id", {}).get("id")
-                            if device_id:
-                                # Obter token
-                                token = thingsboard_service.get_device_credentials(
-                                    device_id
-                                )
-                                if token:
-                                    device = {
-                                        "id": device_id,
-                                        "name": device_name,
-                                        "token": token,
-                                    }
-                                    self.device_cache[device_name] = device
-                                    logger.info(
-                                        f"Device encontrado no ThingsBoard: {device_name}"
-                                    )
-                except Exception as e:
-                    logger.error(f"Erro ao buscar device: {e}")
-
-            # Se device não encontrado, criar automaticamente
-            if not device:
-                logger.info(f"Device não encontrado, criando: {device_name}")
-                device = self.get_or_create_device(station_for_s3)
+            # 3. Buscar device (cache, ThingsBoard) ou criar automaticamente
+            # (lock por device evita criar o mesmo device em runs paralelos)
+            device = self.get_or_create_device(station_for_s3)
 
             if not device:
                 result["error"] = f"Falha ao criar/encontrar device '{device_name}'"
+                result["retryable"] = True
                 logger.error(result["error"])
                 return result
 
@@ -844,31 +1798,38 @@ class MLflowMonitor:
             result["csv_found"] = True
             result["csv_key"] = s3_key
 
-            # 5. Baixar e processar CSV
-            df_csv = self.download_csv_from_s3(s3_key)
-            if df_csv is None or df_csv.empty:
-                result["error"] = "CSV vazio ou erro ao processar"
+            # 5-7. Baixar CSV, preparar e enviar telemetria (em pipeline)
+            send_result = self._sync_csv(s3_key, device["token"])
+
+            # Erro no download/envio é transitório; CSV vazio, não
+            result["retryable"] = "error" in send_result
+
+            if send_result["rows_read"] == 0:
+                result["error"] = send_result.get(
+                    "error", "CSV vazio ou erro ao processar"
+                )
                 logger.error(result["error"])
                 return result
 
-            # 6. Preparar telemetria
-            telemetry_data = self.prepare_telemetry_from_csv(df_csv)
-            if not telemetry_data:
-                result["error"] = "Nenhum dado de telemetria preparado"
+            if send_result["total"] == 0:
+                result["error"] = send_result.get(
+                    "error", "Nenhum dado de telemetria preparado"
+                )
                 logger.warning(result["error"])
                 return result
 
-            # 7. Enviar telemetria para ThingsBoard
-            send_result = self.send_telemetry_to_thingsboard(
-                device_token=device["token"],
-                telemetry_data=telemetry_data,
-                batch_size=1000,
-            )
-
             result["data_sent"] = send_result["success"] > 0
             result["records_sent"] = send_result["success"]
             result["success"] = result["data_sent"]
 
+            if not result["success"]:
+                result["error"] = send_result.get(
+                    "error", "Nenhum registro aceito pelo ThingsBoard"
+                )
+                result["retryable"] = True
+                logger.error(result["error"])
+                return result
+
             logger.info(
                 f"Run processado com sucesso: {station_name} - "
                 f"{result['records_sent']} registros enviados para {device_name}"
@@ -876,69 +1837,175 @@ class MLflowMonitor:
 
         except Exception as e:
             result["error"] = str(e)
+            result["retryable"] = True
             logger.error(f"Erro ao processar run {run.info.run_id}: {e}", exc_info=True)
 
         return result
 
-    def check_for_updates(self, experiment_names: List[str]) -> List[Dict[str, Any]]:
+    def _sync_csv(self, s3_key: str, device_token: str) -> Dict[str, Any]:
         """
-        Verifica atualizações em experimentos do MLflow.
+        Envia um CSV do S3 ao device, coalescendo envios simultâneos.
+
+        Se outro run do mesmo ciclo já está enviando o mesmo CSV ao mesmo
+        device, aguarda e reutiliza o resultado dele em vez de baixar,
+        processar e reenviar os mesmos dados.
 
         Args:
-            experiment_names: Lista de nomes de experimentos para monitorar
+            s3_key: Chave do arquivo no S3
+            device_token: Token de acesso do device
+
+        Returns:
+            Resultado de stream_csv_to_thingsboard
+        """
+        key = (s3_key, device_token)
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            logger.info(f"CSV {s3_key} já está sendo enviado, aguardando resultado")
+            return future.result()
+
+        try:
+            future.set_result(
+                self.stream_csv_to_thingsboard(s3_key=s3_key, device_token=device_token)
+            )
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+        return future.result()
+
+    def _check_experiment(self, experiment_name: str) -> List[Dict[str, Any]]:
+        """
+        Verifica e processa os runs novos de um experimento.
+
+        Args:
+            experiment_name: Nome do experimento
 
         Returns:
             Lista de resultados de processamento
         """
-        results = []
+        try:
+            logger.info(f"Verificando experimento: {experiment_name}")
 
-        for experiment_name in experiment_names:
-            try:
-                logger.info(f"Verificando experimento: {experiment_name}")
+            new_runs = self.get_new_runs(experiment_name)
 
-                new_runs = self.get_new_runs(experiment_name)
+            if not new_runs:
+                logger.debug(f"Nenhum run novo em {experiment_name}")
+                return []
 
-                if not new_runs:
-                    logger.debug(f"Nenhum run novo em {experiment_name}")
-                    continue
+            logger.info(f"Encontrados {len(new_runs)} novos runs em {experiment_name}")
 
-                logger.info(
-                    f"Encontrados {len(new_runs)} novos runs em {experiment_name}"
-                )
+            # Runs já concluídos em ciclos anteriores (após o último timestamp,
+            # que pode estar parado em um run com nova tentativa) não são
+            # reenviados
+            experiment_id = new_runs[0].info.experiment_id
+            with self._state_lock:
+                done = set(self._done_runs.get(experiment_id, ()))
+            pending = [run for run in new_runs if run.info.run_id not in done]
 
-                for run in new_runs:
-                    result = self.process_run(run)
-                    results.append(result)
+            # Runs são independentes e limitados por I/O (S3, ThingsBoard)
+            results = []
+            if pending:
+                max_workers = min(MAX_PARALLEL_RUNS, len(pending))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(self.process_run, pending))
 
-                    # Delay entre processamentos
-                    time.sleep(2)
+                for run, result in zip(pending, results):
+                    self._record_outcome(experiment_id, run, result)
 
-            except Exception as e:
-                logger.error(f"Erro ao verificar experimento {experiment_name}: {e}")
+            self._advance_last_check(experiment_id, new_runs)
+            return results
 
-        return results
+        except Exception as e:
+            logger.error(f"Erro ao verificar experimento {experiment_name}: {e}")
+            return []
+
+    async def check_for_updates_async(
+        self, experiment_names: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Verifica atualizações em todos os experimentos em paralelo.
+
+        Cada experimento roda em uma thread própria (clientes MLflow/S3 são
+        síncronos), sem bloquear o event loop de quem chama.
+
+        Args:
+            experiment_names: Lista de nomes de experimentos para monitorar
+
+        Returns:
+            Lista de resultados de processamento
+        """
+        per_experiment = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._check_experiment, experiment_name)
+                for experiment_name in experiment_names
+            )
+        )
+        return [result for results in per_experiment for result in results]
+
+    def check_for_updates(self, experiment_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Verifica atualizações em experimentos do MLflow.
+
+        Versão síncrona de check_for_updates_async; não deve ser chamada de
+        dentro de um event loop em execução.
 
-    def start_monitoring(self, experiment_names: List[str], daemon: bool = False):
+        Args:
+            experiment_names: Lista de nomes de experimentos para monitorar
+
+        Returns:
+            Lista de resultados de processamento
+        """
+        return asyncio.run(self.check_for_updates_async(experiment_names))
+
+    async def start_monitoring(
+        self, experiment_names: List[str], daemon: bool = False
+    ):
         """
         Inicia monitoramento contínuo do MLflow.
 
+        Corrotina: deve rodar no event loop (ex: asyncio.create_task). A espera
+        entre ciclos é interrompida imediatamente por stop_monitoring().
+
         Args:
             experiment_names: Lista de experimentos para monitorar
             daemon: Se True, roda em modo daemon (loop infinito)
         """
-        if not self.initialize():
-            logger.error("Falha ao inicializar monitor")
-            return
-
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
         self._running = True
-        logger.info(f"Monitor iniciado. Verificando a cada {self.check_interval}s")
 
         try:
-            while self._running:
-                results = self.check_for_updates(experiment_names)
+            if daemon and not self._acquire_leader_lock():
+                logger.info(
+                    "Outro processo já monitora o MLflow com este estado; "
+                    "monitor não iniciado"
+                )
+                return
+
+            if not await asyncio.to_thread(self.initialize):
+                logger.error("Falha ao inicializar monitor")
+                return
+
+            logger.info(
+                f"Monitor iniciado. Verificando a cada {self.check_interval}s "
+                f"(até {self.max_check_interval}s sem runs novos)"
+            )
+
+            interval = self.check_interval
+            while not self._stop_event.is_set():
+                results = await self.check_for_updates_async(experiment_names)
 
                 if results:
-                    success_count = sum(1 for r in results if r["success"])
+                    success_count, _ = summarize_results(results)
                     logger.info(
                         f"Ciclo de verificação completo: "
                         f"{success_count}/{len(results)} runs processados com sucesso"
@@ -947,17 +2014,40 @@ class MLflowMonitor:
                 if not daemon:
                     break
 
-                time.sleep(self.check_interval)
+                # Backoff exponencial em ciclos vazios; volta ao mínimo com runs novos
+                if results:
+                    interval = self.check_interval
+                else:
+                    interval = min(
+                        interval * 2,
+                        max(self.max_check_interval, self.check_interval),
+                    )
+                    logger.debug(f"Nenhum run novo, próxima verificação em {interval}s")
 
-        except KeyboardInterrupt:
-            logger.info("Monitor interrompido pelo usuário")
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        except asyncio.CancelledError:
+            logger.info("Monitor cancelado")
+            raise
         finally:
+            self._release_leader_lock()
             self._running = False
+            self._loop = None
             logger.info("Monitor finalizado")
 
     def stop_monitoring(self):
-        """Para o monitoramento."""
+        """Para o monitoramento (pode ser chamado de qualquer thread)."""
         self._running = False
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                # Event loop já encerrado
+                pass
 
 
 # Instância global do monitor
@@ -993,6 +2083,13 @@ def parse_args():
         help="Intervalo de verificação em segundos",
     )
 
+    parser.add_argument(
+        "--max-interval",
+        type=int,
+        default=900,
+        help="Intervalo máximo (segundos) após ciclos sem runs novos",
+    )
+
     parser.add_argument(
         "--daemon",
         "-d",
@@ -1053,6 +2150,10 @@ def main():
 
     args = parse_args()
 
+    # Event loop baseado em libuv (instalado com uvicorn[standard]) quando disponível
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Configurar nível de log
     logging.getLogger().setLevel(getattr(logging, args.log_level))
 
@@ -1072,6 +2173,7 @@ def main():
     # Configurar monitor
     mlflow_monitor.mlflow_tracking_uri = args.mlflow_uri
     mlflow_monitor.check_interval = args.interval
+    mlflow_monitor.max_check_interval = args.max_interval
     mlflow_monitor.tb_username = args.tb_user
     mlflow_monitor.tb_password = args.tb_password
 
@@ -1080,8 +2182,10 @@ def main():
 
     try:
         # Iniciar monitoramento
-        mlflow_monitor.start_monitoring(
-            experiment_names=experiment_names, daemon=args.daemon
+        asyncio.run(
+            mlflow_monitor.start_monitoring(
+                experiment_names=experiment_names, daemon=args.daemon
+            )
         )
 
         if not args.daemon:
@@ -1104,7 +2208,7 @@ if __name__ == "__main__":
 # ============================================================================
 
 try:
-    from fastapi import APIRouter, HTTPException, BackgroundTasks
+    from fastapi import APIRouter, HTTPException
     from pydantic import BaseModel, Field
 
     router = APIRouter(prefix="/mlflow-sync", tags=["MLflow Sync"])
@@ -1122,9 +2226,19 @@ try:
             le=3600,
             description="Intervalo de verificação em segundos",
         )
+        max_check_interval: int = Field(
+            default=900,
+            ge=10,
+            le=3600,
+            description="Intervalo máximo após ciclos sem runs novos (backoff)",
+        )
         daemon: bool = Field(
             default=False, description="Rodar em modo daemon (background)"
         )
+        verbose: bool = Field(
+            default=False,
+            description="Retornar todos os resultados (padrão: só amostra de falhas)",
+        )
 
     class MonitorStatusResponse(BaseModel):
         """Response do status do monitor."""
@@ -1145,9 +2259,7 @@ try:
         failed_syncs: int
 
     @router.post("/start", response_model=Dict[str, Any])
-    async def start_monitoring(
-        request: StartMonitorRequest, background_tasks: BackgroundTasks
-    ):
+    async def start_monitoring(request: StartMonitorRequest):
         """
         Inicia o monitoramento do MLflow.
 
@@ -1155,7 +2267,8 @@ try:
         especificados e enviará os dados processados para o ThingsBoard.
         """
         try:
-            if mlflow_monitor._running:
+            task = mlflow_monitor._task
+            if mlflow_monitor._running or (task is not None and not task.done()):
                 return {
                     "success": False,
                     "message": "Monitor já está em execução",
@@ -1164,13 +2277,15 @@ try:
 
             # Atualizar configurações
             mlflow_monitor.check_interval = request.check_interval
+            mlflow_monitor.max_check_interval = request.max_check_interval
 
             if request.daemon:
-                # Rodar em background
-                background_tasks.add_task(
-                    mlflow_monitor.start_monitoring,
-                    experiment_names=request.experiment_names,
-                    daemon=True,
+                # Rodar em background no event loop da aplicação
+                mlflow_monitor._task = asyncio.create_task(
+                    mlflow_monitor.start_monitoring(
+                        experiment_names=request.experiment_names,
+                        daemon=True,
+                    )
                 )
 
                 return {
@@ -1179,27 +2294,30 @@ try:
                     "running": True,
                     "experiment_names": request.experiment_names,
                     "check_interval": request.check_interval,
+                    "max_check_interval": request.max_check_interval,
                     "mode": "daemon",
                 }
             else:
                 # Executar uma verificação única
-                if not mlflow_monitor.initialize():
+                if not await asyncio.to_thread(mlflow_monitor.initialize):
                     raise HTTPException(
                         status_code=500, detail="Falha ao inicializar monitor"
                     )
 
-                results = mlflow_monitor.check_for_updates(request.experiment_names)
+                results = await mlflow_monitor.check_for_updates_async(
+                    request.experiment_names
+                )
 
-                success_count = sum(1 for r in results if r.get("success", False))
+                success_count, failed_count = summarize_results(results)
 
                 return {
                     "success": True,
                     "message": f"Verificação única completa: {success_count}/{len(results)} runs processados",
                     "running": False,
-                    "results": results,
+                    "results": compact_results(results, request.verbose),
                     "total_runs": len(results),
                     "successful": success_count,
-                    "failed": len(results) - success_count,
+                    "failed": failed_count,
                 }
 
         except Exception as e:
@@ -1249,33 +2367,34 @@ try:
 
     @router.post("/sync-now", response_model=SyncResultResponse)
     async def sync_now(
-        experiment_names: List[str] = ["data-pipeline", "Imputacao por Estacao"]
+        experiment_names: List[str] = ["data-pipeline", "Imputacao por Estacao"],
+        verbose: bool = False,
     ):
         """
         Executa sincronização imediata (não inicia daemon).
 
         Verifica por novos runs nos experimentos especificados e
-        envia dados para o ThingsBoard.
+        envia dados para o ThingsBoard. Por padrão `results` traz apenas
+        uma amostra das falhas; use `verbose=true` para todos os runs.
         """
         try:
             # Inicializar se necessário
             if not mlflow_monitor._authenticated_tb:
-                if not mlflow_monitor.initialize():
+                if not await asyncio.to_thread(mlflow_monitor.initialize):
                     raise HTTPException(
                         status_code=500,
                         detail="Falha ao inicializar conexões (MLflow/ThingsBoard)",
                     )
 
             # Executar verificação
-            results = mlflow_monitor.check_for_updates(experiment_names)
+            results = await mlflow_monitor.check_for_updates_async(experiment_names)
 
-            success_count = sum(1 for r in results if r.get("success", False))
-            failed_count = len(results) - success_count
+            success_count, failed_count = summarize_results(results)
 
             return SyncResultResponse(
                 success=True,
                 message=f"Sincronização completa: {success_count} sucesso, {failed_count} falhas",
-                results=results,
+                results=compact_results(results, verbose),
                 total_runs_processed=len(results),
                 successful_syncs=success_count,
                 failed_syncs=failed_count,
@@ -1319,7 +2438,12 @@ try:
         """
         try:
             mlflow_monitor.device_cache.clear()
+            mlflow_monitor._device_lookups.clear()
+            mlflow_monitor._s3_key_cache.clear()
             mlflow_monitor.last_check_timestamps.clear()
+            mlflow_monitor._done_runs.clear()
+            mlflow_monitor._run_attempts.clear()
+            mlflow_monitor._save_state()
 
             return {"success": True, "message": "Cache limpo com sucesso"}
 
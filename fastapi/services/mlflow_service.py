@@ -4,7 +4,10 @@ Fornece funções para tracking de experimentos, logging de métricas e parâmet
 """
 
 import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
 import os
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -27,6 +30,7 @@ class MLflowService:
             "data-pipeline"
         )
         self._initialized = False
+        self._client: Optional[MlflowClient] = None
         
     def initialize(self):
         """Inicializa conexão com MLflow."""
@@ -45,6 +49,7 @@ class MLflowService:
                 logger.warning(f"Não foi possível criar experimento: {e}")
             
             mlflow.set_experiment(self.experiment_name)
+            self._client = MlflowClient(tracking_uri=self.tracking_uri)
             self._initialized = True
             logger.info(f"MLflow inicializado: {self.tracking_uri}")
             
@@ -82,8 +87,8 @@ class MLflowService:
             if tags:
                 default_tags.update(tags)
             
-            for key, value in default_tags.items():
-                mlflow.set_tag(key, value)
+            # Uma única chamada (log_batch) em vez de uma por tag
+            mlflow.set_tags(default_tags)
             
             return run
             
@@ -166,6 +171,49 @@ class MLflowService:
         except Exception as e:
             logger.error(f"Erro ao registrar dicionário: {e}")
     
+    def log_text(self, text: str, artifact_file: str):
+        """
+        Registra um texto (ex.: CSV em memória) como artifact.
+        
+        Args:
+            text: Conteúdo do artifact
+            artifact_file: Caminho relativo do arquivo no MLflow
+        """
+        if not self._initialized:
+            return
+        
+        try:
+            mlflow.log_text(text, artifact_file)
+        except Exception as e:
+            logger.error(f"Erro ao registrar texto: {e}")
+    
+    def _log_batch(
+        self,
+        run_id: str,
+        metrics: Optional[Dict[str, float]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        tags: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Registra métricas, parâmetros e tags de uma run em uma única chamada.
+        
+        Args:
+            run_id: ID da run
+            metrics: Dicionário de métricas
+            params: Dicionário de parâmetros
+            tags: Dicionário de tags
+        """
+        timestamp = int(time.time() * 1000)
+        self._client.log_batch(
+            run_id=run_id,
+            metrics=[
+                Metric(key, float(value), timestamp, 0)
+                for key, value in (metrics or {}).items()
+            ],
+            params=[Param(key, str(value)) for key, value in (params or {}).items()],
+            tags=[RunTag(key, str(value)) for key, value in (tags or {}).items()]
+        )
+    
     def log_upload_operation(
         self,
         operation_type: str,
@@ -194,10 +242,12 @@ class MLflowService:
             self.initialize()
         
         try:
-            with mlflow.start_run(run_name=f"{operation_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
+            with mlflow.start_run(run_name=f"{operation_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}") as run:
                 # Tags
-                mlflow.set_tag("operation_type", operation_type)
-                mlflow.set_tag("timestamp", datetime.now().isoformat())
+                tags = {
+                    "operation_type": operation_type,
+                    "timestamp": datetime.now().isoformat()
+                }
                 
                 # Parâmetros
                 params = {
@@ -211,8 +261,6 @@ class MLflowService:
                 if additional_params:
                     params.update(additional_params)
                 
-                mlflow.log_params(params)
-                
                 # Métricas
                 metrics = {
                     "success_count": success_count,
@@ -223,7 +271,8 @@ class MLflowService:
                     "throughput_mb_per_sec": total_size_mb / duration_seconds if duration_seconds > 0 else 0
                 }
                 
-                mlflow.log_metrics(metrics)
+                # Tags, parâmetros e métricas em uma única requisição
+                self._log_batch(run.info.run_id, metrics=metrics, params=params, tags=tags)
                 
                 logger.info(f"Operação registrada no MLflow: {operation_type}")
                 
@@ -252,19 +301,20 @@ class MLflowService:
         try:
             run_name = f"imputation_{station_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             
-            with mlflow.start_run(run_name=run_name):
-                # Tags
-                mlflow.set_tag("pipeline", "data_imputation")
-                mlflow.set_tag("station", station_name)
-                mlflow.set_tag("station_name", station_name)
-                mlflow.set_tag("timestamp", datetime.now().isoformat())
-                mlflow.set_tag("type", "imputation")
-                
-                # Parâmetros
-                mlflow.log_params(params)
-                
-                # Métricas
-                mlflow.log_metrics(metrics)
+            with mlflow.start_run(run_name=run_name) as run:
+                # Tags, parâmetros e métricas em uma única requisição
+                self._log_batch(
+                    run.info.run_id,
+                    metrics=metrics,
+                    params=params,
+                    tags={
+                        "pipeline": "data_imputation",
+                        "station": station_name,
+                        "station_name": station_name,
+                        "timestamp": datetime.now().isoformat(),
+                        "type": "imputation"
+                    }
+                )
                 
                 # Artifacts
                 if artifacts:
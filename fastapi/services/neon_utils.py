@@ -5,16 +5,142 @@ Este módulo fornece funções auxiliares para conectar e manipular dados
 no banco PostgreSQL Neon a partir de notebooks ou scripts.
 """
 
+import io
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 import pandas as pd
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import (
+    Column, DateTime, Float, Index, Integer, MetaData, String, Table,
+    UniqueConstraint, create_engine, func, inspect, text
+)
 from sqlalchemy.engine import Engine
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
 
+@lru_cache(maxsize=None)
+def _load_neon_config(env_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Lê o .env (uma vez por caminho) e monta a configuração de conexão.
+    
+    Args:
+        env_path: Caminho para arquivo .env (padrão: ../.env)
+        
+    Returns:
+        Dict com user, password, host, database e port
+        
+    Raises:
+        ValueError: Se alguma variável obrigatória estiver faltando
+    """
+    path = Path(env_path) if env_path is not None else Path(__file__).parent.parent / '.env'
+    if path.exists():
+        load_dotenv(path)
+    
+    config = {
+        'user': os.getenv('NEON_USER'),
+        'password': os.getenv('NEON_PASSWORD'),
+        'host': os.getenv('NEON_HOST'),
+        'database': os.getenv('NEON_DB'),
+        'port': os.getenv('NEON_PORT', '5432')
+    }
+    
+    missing = [k for k, v in config.items() if not v]
+    if missing:
+        raise ValueError(f"Variáveis de ambiente faltando: {', '.join(missing)}")
+    
+    return config
+
+
+def _weather_table(table_name: str, metadata: MetaData) -> Table:
+    """
+    Define a tabela de dados meteorológicos.
+    
+    Args:
+        table_name: Nome da tabela
+        metadata: MetaData onde a tabela é registrada
+        
+    Returns:
+        Tabela SQLAlchemy
+    """
+    # Nomes de índice são globais no schema: só a tabela padrão usa os nomes curtos
+    prefix = 'idx' if table_name == 'weather_data' else f'idx_{table_name}'
+    
+    return Table(
+        table_name,
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('timestamp', DateTime, nullable=False),
+        Column('estacao', String(50), nullable=False),
+        Column('temperatura', Float),
+        Column('umidade', Float),
+        Column('vento_velocidade', Float),
+        Column('radiacao', Float),
+        Column('precipitacao', Float),
+        Column('temp_media_3h', Float),
+        Column('temp_diff', Float),
+        Column('hora_dia', Integer),
+        Column('radiacao_log', Float),
+        Column('data_processamento', DateTime, server_default=func.current_timestamp()),
+        UniqueConstraint('timestamp', 'estacao'),
+        Index(f'{prefix}_timestamp', 'timestamp'),
+        Index(f'{prefix}_estacao', 'estacao'),
+    )
+
+
+def _predictions_table(table_name: str, metadata: MetaData) -> Table:
+    """
+    Define a tabela de predições do modelo.
+    
+    Args:
+        table_name: Nome da tabela
+        metadata: MetaData onde a tabela é registrada
+        
+    Returns:
+        Tabela SQLAlchemy
+    """
+    prefix = 'idx_pred' if table_name == 'weather_predictions' else f'idx_{table_name}'
+    
+    return Table(
+        table_name,
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('timestamp', DateTime, nullable=False),
+        Column('estacao', String(50), nullable=False),
+        Column('temperatura_real', Float),
+        Column('temperatura_prevista', Float),
+        Column('erro_predicao', Float),
+        Column('erro_absoluto', Float),
+        Column('rmse_test', Float),
+        Column('data_processamento', DateTime, server_default=func.current_timestamp()),
+        UniqueConstraint('timestamp', 'estacao'),
+        Index(f'{prefix}_timestamp', 'timestamp'),
+        Index(f'{prefix}_estacao', 'estacao'),
+    )
+
+
+def _create_schema(engine: Engine, metadata: MetaData) -> None:
+    """
+    Cria as tabelas e índices registrados no MetaData, se não existirem.
+    
+    create_all(checkfirst=True) pula a tabela inteira quando ela já existe,
+    inclusive os índices; por isso cada índice também é criado com checkfirst,
+    o que cobre tabelas antigas criadas antes dos índices.
+    
+    Args:
+        engine: Engine SQLAlchemy
+        metadata: MetaData com as tabelas
+    """
+    with engine.begin() as conn:
+        metadata.create_all(conn, checkfirst=True)
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
 class NeonConnection:
     """Gerenciador de conexão com Neon PostgreSQL."""
     
@@ -25,30 +151,13 @@ class NeonConnection:
         Args:
             env_path: Caminho para arquivo .env (padrão: ../.env)
         """
-        # Carrega variáveis de ambiente
-        if env_path is None:
-            env_path = Path(__file__).parent.parent / '.env'
-        else:
-            env_path = Path(env_path)
-            
-        if env_path.exists():
-            load_dotenv(env_path)
-        
-        # Configurações
-        self.config = {
-            'user': os.getenv('NEON_USER'),
-            'password': os.getenv('NEON_PASSWORD'),
-            'host': os.getenv('NEON_HOST'),
-            'database': os.getenv('NEON_DB'),
-            'port': os.getenv('NEON_PORT', '5432')
-        }
-        
-        # Valida configurações
-        missing = [k for k, v in self.config.items() if not v]
-        if missing:
-            raise ValueError(f"Variáveis de ambiente faltando: {', '.join(missing)}")
+        # Configurações (.env lido e validado uma vez por caminho)
+        self.config = dict(_load_neon_config(str(env_path) if env_path else None))
         
         self._engine: Optional[Engine] = None
+        
+        # Tabelas por schema: (instante da consulta, nomes)
+        self._tables_cache: Dict[str, tuple] = {}
     
     @property
     def engine(self) -> Engine:
@@ -65,13 +174,23 @@ class NeonConnection:
             f"?sslmode=require"
         )
         
+        # Sem pool_pre_ping: o SELECT 1 a cada checkout custa um round-trip
+        # até o Neon. Conexões são recicladas antes do pooler do Neon
+        # derrubá-las e sockets mortos são detectados via TCP keepalive.
         return create_engine(
             database_url,
             echo=False,
-            pool_pre_ping=True,
+            pool_pre_ping=False,
+            pool_size=int(os.getenv('NEON_POOL_SIZE', '10')),
+            max_overflow=int(os.getenv('NEON_MAX_OVERFLOW', '5')),
+            pool_recycle=int(os.getenv('NEON_POOL_RECYCLE', '60')),
+            pool_timeout=30,
             connect_args={
                 'connect_timeout': 10,
-                'sslmode': 'require'
+                'sslmode': 'require',
+                'keepalives': 1,
+                'keepalives_idle': 30,
+                'keepalives_interval': 10
             }
         )
     
@@ -115,19 +234,51 @@ class NeonConnection:
         Returns:
             True se tabela existe
         """
-        return table_name in self.get_tables(schema)
+        return table_name in self._get_tables_cached(schema)
+    
+    def _get_tables_cached(self, schema: str = 'public', ttl: float = 30.0) -> set:
+        """
+        Retorna as tabelas do schema, consultando o catálogo no máximo a cada `ttl` segundos.
+        
+        Args:
+            schema: Schema do banco
+            ttl: Validade do cache em segundos
+            
+        Returns:
+            Conjunto com nomes de tabelas
+        """
+        cached = self._tables_cache.get(schema)
+        if cached is None or time.monotonic() - cached[0] > ttl:
+            cached = (time.monotonic(), set(self.get_tables(schema)))
+            self._tables_cache[schema] = cached
+        return cached[1]
     
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def execute_query(self, query: str, chunksize: Optional[int] = None) -> pd.DataFrame:
         """
         Executa query SQL e retorna DataFrame.
         
+        Opcionalmente, com `chunksize`, usa cursor no servidor (stream_results):
+        as linhas chegam em blocos e viram DataFrames parciais, em vez de o
+        driver manter o resultado inteiro como tuplas Python.
+        
         Args:
             query: Query SQL
+            chunksize: Linhas por bloco (padrão None = buscar tudo de uma vez)
             
         Returns:
             DataFrame com resultados
         """
-        return pd.read_sql(query, self.engine)
+        if not chunksize:
+            return pd.read_sql(query, self.engine)
+        
+        with self.engine.connect().execution_options(stream_results=True) as conn:
+            chunks = list(pd.read_sql(query, conn, chunksize=chunksize))
+        
+        if not chunks:
+            return pd.DataFrame()
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True, copy=False)
     
     def save_dataframe(
         self,
@@ -135,7 +286,8 @@ class NeonConnection:
         table_name: str,
         if_exists: str = 'append',
         index: bool = False,
-        chunksize: int = 1000
+        chunksize: int = 1000,
+        method: str = 'copy'
     ) -> int:
         """
         Salva DataFrame no banco.
@@ -145,19 +297,193 @@ class NeonConnection:
             table_name: Nome da tabela
             if_exists: 'fail', 'replace', ou 'append'
             index: Se True, salva índice como coluna
-            chunksize: Tamanho do lote para inserção
+            chunksize: Tamanho do lote para inserção (método 'multi')
+            method: 'copy' (COPY FROM STDIN, padrão) ou 'multi' (INSERTs em lote)
+            
+        Returns:
+            Número de linhas salvas
+        """
+        # to_sql pode criar ou substituir a tabela
+        self._tables_cache.clear()
+        
+        if self.engine.dialect.name == 'postgresql':
+            if method == 'copy':
+                return self._copy_dataframe(df, table_name, if_exists=if_exists, index=index)
+            return self._insert_values(
+                df, table_name, if_exists=if_exists, index=index, chunksize=chunksize
+            )
+        
+        # Fatias enviadas uma a uma (to_sql com chunksize copia o DataFrame
+        # inteiro antes de fatiar), todas na mesma transação
+        with self.engine.begin() as conn:
+            for start in range(0, max(len(df), 1), chunksize):
+                df.iloc[start:start + chunksize].to_sql(
+                    table_name,
+                    conn,
+                    if_exists=if_exists if start == 0 else 'append',
+                    index=index,
+                    method='multi'
+                )
+        return len(df)
+    
+    def _load_in_transaction(
+        self,
+        frame: pd.DataFrame,
+        table_name: str,
+        if_exists: str,
+        load: Callable[[Any], None]
+    ) -> int:
+        """
+        Cria/substitui a tabela e carrega os dados em uma única transação.
+        
+        O DDL (schema do to_sql) e a carga rodam na mesma conexão: se a carga
+        falhar, o rollback desfaz também o DROP/CREATE de um 'replace'.
+        
+        Args:
+            frame: DataFrame a salvar (índice já convertido em coluna)
+            table_name: Nome da tabela
+            if_exists: 'fail', 'replace', ou 'append'
+            load: Função que recebe o cursor psycopg2 e envia as linhas
             
         Returns:
             Número de linhas salvas
         """
-        df.to_sql(
-            table_name,
-            self.engine,
-            if_exists=if_exists,
-            index=index,
-            method='multi',
-            chunksize=chunksize
+        with self.engine.begin() as conn:
+            frame.head(0).to_sql(table_name, conn, if_exists=if_exists, index=False)
+            cursor = conn.connection.cursor()
+            try:
+                load(cursor)
+            finally:
+                cursor.close()
+        
+        return len(frame)
+    
+    def _copy_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        if_exists: str = 'append',
+        index: bool = False,
+        chunk_rows: int = 50_000
+    ) -> int:
+        """
+        Salva DataFrame via COPY FROM STDIN (uma transação, sem INSERTs).
+        
+        Args:
+            df: DataFrame para salvar
+            table_name: Nome da tabela
+            if_exists: 'fail', 'replace', ou 'append'
+            index: Se True, salva índice como coluna
+            chunk_rows: Linhas serializadas em CSV por vez
+            
+        Returns:
+            Número de linhas salvas
+        """
+        frame = df.reset_index() if index else df
+        
+        columns = ', '.join(f'"{col}"' for col in frame.columns)
+        copy_sql = f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT CSV)'
+        
+        def copy_rows(cursor) -> None:
+            for start in range(0, len(frame), chunk_rows):
+                buffer = io.StringIO()
+                frame.iloc[start:start + chunk_rows].to_csv(
+                    buffer, index=False, header=False
+                )
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+        
+        return self._load_in_transaction(frame, table_name, if_exists, copy_rows)
+    
+    def _insert_values(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        if_exists: str = 'append',
+        index: bool = False,
+        chunksize: int = 1000
+    ) -> int:
+        """
+        Salva DataFrame com INSERTs multi-linha via psycopg2 execute_values.
+        
+        Args:
+            df: DataFrame para salvar
+            table_name: Nome da tabela
+            if_exists: 'fail', 'replace', ou 'append'
+            index: Se True, salva índice como coluna
+            chunksize: Linhas por comando INSERT
+            
+        Returns:
+            Número de linhas salvas
+        """
+        frame = df.reset_index() if index else df
+        
+        columns = ', '.join(f'"{col}"' for col in frame.columns)
+        insert_sql = f'INSERT INTO "{table_name}" ({columns}) VALUES %s'
+        
+        # NaN → NULL
+        rows = frame.astype(object).where(frame.notna(), None).itertuples(
+            index=False, name=None
+        )
+        
+        def insert_rows(cursor) -> None:
+            execute_values(cursor, insert_sql, rows, page_size=chunksize)
+        
+        return self._load_in_transaction(frame, table_name, if_exists, insert_rows)
+    
+    def upsert_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        conflict_columns: List[str],
+        chunksize: int = 5000
+    ) -> int:
+        """
+        Insere ou atualiza linhas (INSERT ... ON CONFLICT DO UPDATE) em lote.
+        
+        Útil para tabelas com chave única, como weather_data (timestamp, estacao),
+        onde um append com to_sql falharia em linhas já existentes.
+        
+        Args:
+            df: DataFrame para salvar (colunas com os mesmos nomes da tabela)
+            table_name: Nome da tabela
+            conflict_columns: Colunas da restrição UNIQUE/PRIMARY KEY
+            chunksize: Linhas por comando INSERT (page_size do execute_values)
+            
+        Returns:
+            Número de linhas enviadas
+        """
+        columns = list(df.columns)
+        update_columns = [col for col in columns if col not in conflict_columns]
+        
+        if update_columns:
+            on_conflict = "DO UPDATE SET " + ", ".join(
+                f'"{col}" = EXCLUDED."{col}"' for col in update_columns
+            )
+        else:
+            on_conflict = "DO NOTHING"
+        
+        column_list = ", ".join(f'"{col}"' for col in columns)
+        conflict_list = ", ".join(f'"{col}"' for col in conflict_columns)
+        upsert_sql = (
+            f'INSERT INTO "{table_name}" ({column_list}) VALUES %s '
+            f'ON CONFLICT ({conflict_list}) {on_conflict}'
         )
+        
+        # NaN → NULL
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cursor:
+                execute_values(cursor, upsert_sql, rows, page_size=chunksize)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        
         return len(df)
     
     def get_table_info(self, table_name: str, schema: str = 'public') -> Dict[str, Any]:
@@ -197,32 +523,11 @@ class NeonConnection:
         Args:
             table_name: Nome da tabela
         """
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id SERIAL PRIMARY KEY,
-            timestamp TIMESTAMP NOT NULL,
-            estacao VARCHAR(50) NOT NULL,
-            temperatura FLOAT,
-            umidade FLOAT,
-            vento_velocidade FLOAT,
-            radiacao FLOAT,
-            precipitacao FLOAT,
-            temp_media_3h FLOAT,
-            temp_diff FLOAT,
-            hora_dia INTEGER,
-            radiacao_log FLOAT,
-            data_processamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(timestamp, estacao)
-        );
-        
-        CREATE INDEX IF NOT EXISTS idx_timestamp ON {table_name}(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_estacao ON {table_name}(estacao);
-        """
-        
-        with self.engine.connect() as conn:
-            conn.execute(text(create_table_sql))
-            conn.commit()
+        metadata = MetaData()
+        _weather_table(table_name, metadata)
+        _create_schema(self.engine, metadata)
         
+        self._tables_cache.clear()
         print(f"✅ Tabela '{table_name}' criada com sucesso")
     
     def create_predictions_table(self, table_name: str = 'weather_predictions') -> None:
@@ -232,29 +537,34 @@ class NeonConnection:
         Args:
             table_name: Nome da tabela
         """
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id SERIAL PRIMARY KEY,
-            timestamp TIMESTAMP NOT NULL,
-            estacao VARCHAR(50) NOT NULL,
-            temperatura_real FLOAT,
-            temperatura_prevista FLOAT,
-            erro_predicao FLOAT,
-            erro_absoluto FLOAT,
-            rmse_test FLOAT,
-            data_processamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(timestamp, estacao)
-        );
-        
-        CREATE INDEX IF NOT EXISTS idx_pred_timestamp ON {table_name}(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_pred_estacao ON {table_name}(estacao);
+        metadata = MetaData()
+        _predictions_table(table_name, metadata)
+        _create_schema(self.engine, metadata)
+        
+        self._tables_cache.clear()
+        print(f"✅ Tabela '{table_name}' criada com sucesso")
+    
+    def create_all_tables(
+        self,
+        weather_table: str = 'weather_data',
+        predictions_table: str = 'weather_predictions'
+    ) -> None:
         """
+        Cria as tabelas de dados meteorológicos e de predições de uma vez.
         
-        with self.engine.connect() as conn:
-            conn.execute(text(create_table_sql))
-            conn.commit()
+        Uma única conexão e transação para as duas tabelas e seus índices.
         
-        print(f"✅ Tabela '{table_name}' criada com sucesso")
+        Args:
+            weather_table: Nome da tabela de dados meteorológicos
+            predictions_table: Nome da tabela de predições
+        """
+        metadata = MetaData()
+        _weather_table(weather_table, metadata)
+        _predictions_table(predictions_table, metadata)
+        _create_schema(self.engine, metadata)
+        
+        self._tables_cache.clear()
+        print(f"✅ Tabelas '{weather_table}' e '{predictions_table}' criadas com sucesso")
     
     def close(self) -> None:
         """Fecha conexão."""
@@ -265,6 +575,23 @@ class NeonConnection:
 
 # Funções auxiliares para uso direto em notebooks
 
+@lru_cache(maxsize=4)
+def _get_connection(env_path: Optional[str] = None) -> NeonConnection:
+    """
+    Retorna NeonConnection compartilhada por env_path.
+    
+    Reaproveita engine e pool de conexões entre chamadas das funções
+    auxiliares, evitando um novo handshake TCP/TLS com o Neon a cada uso.
+    
+    Args:
+        env_path: Caminho para arquivo .env
+        
+    Returns:
+        NeonConnection em cache
+    """
+    return NeonConnection(env_path)
+
+
 def get_neon_engine(env_path: Optional[str] = None) -> Engine:
     """
     Cria e retorna engine SQLAlchemy para Neon.
@@ -279,8 +606,7 @@ def get_neon_engine(env_path: Optional[str] = None) -> Engine:
         >>> engine = get_neon_engine()
         >>> df = pd.read_sql("SELECT * FROM tabela", engine)
     """
-    conn = NeonConnection(env_path)
-    return conn.engine
+    return _get_connection(env_path).engine
 
 
 def quick_query(query: str, env_path: Optional[str] = None) -> pd.DataFrame:
@@ -297,8 +623,7 @@ def quick_query(query: str, env_path: Optional[str] = None) -> pd.DataFrame:
     Example:
         >>> df = quick_query("SELECT * FROM weather_data LIMIT 10")
     """
-    conn = NeonConnection(env_path)
-    return conn.execute_query(query)
+    return _get_connection(env_path).execute_query(query)
 
 
 def save_to_neon(
@@ -323,8 +648,7 @@ def save_to_neon(
         >>> rows = save_to_neon(df, 'weather_data', if_exists='append')
         >>> print(f"Salvo {rows} linhas")
     """
-    conn = NeonConnection(env_path)
-    return conn.save_dataframe(df, table_name, if_exists=if_exists)
+    return _get_connection(env_path).save_dataframe(df, table_name, if_exists=if_exists)
 
 
 if __name__ == '__main__':
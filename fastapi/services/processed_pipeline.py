@@ -7,11 +7,9 @@ import pandas as pd
 import numpy as np
 import pickle
 import logging
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import tempfile
-import os
 
 from .s3_service import S3Service
 from .mlflow_service import MLflowService
@@ -88,40 +86,42 @@ class ProcessedDataPipeline:
                 X_test, y_test, y_pred_test
             )
             
-            # 3. Salvar em CSV temporário
-            temp_dir = tempfile.mkdtemp()
-            csv_path = Path(temp_dir) / f"{station_name}_processed_data.csv"
-            df_processed.to_csv(csv_path, index=True)
+            # 3. Serializar CSV uma única vez, em memória (sem arquivo temporário)
+            csv_name = f"{station_name}_processed_data.csv"
+            csv_text = df_processed.to_csv(index=True)
             
-            # 4. Upload para S3 (pasta de dados tratados)
-            logger.info("Enviando dados processados para S3...")
-            s3_result = self._upload_to_s3_processed(
-                csv_path, station_name
-            )
-            
-            # 5. Registrar no MLflow
-            logger.info("Registrando experimento no MLflow...")
-            mlflow_result = self._log_to_mlflow(
-                results, df_processed, station_name, csv_path
-            )
-            
-            # 6. Enviar para ThingsBoard (opcional)
-            tb_result = None
-            if export_to_tb and self.tb_service and device_token:
-                logger.info("Enviando dados para ThingsBoard...")
-                tb_result = self._send_to_thingsboard(
-                    df_processed, device_token
+            # 4-7. Destinos independentes (S3, MLflow, ThingsBoard, Trendz) em paralelo
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                logger.info("Enviando dados processados para S3...")
+                s3_future = executor.submit(
+                    self._upload_to_s3_processed,
+                    csv_text.encode("utf-8"), station_name
                 )
+                
+                logger.info("Registrando experimento no MLflow...")
+                mlflow_future = executor.submit(
+                    self._log_to_mlflow,
+                    results, df_processed, station_name, csv_text, csv_name
+                )
+                
+                # ThingsBoard (opcional)
+                tb_future = None
+                if export_to_tb and self.tb_service and device_token:
+                    logger.info("Enviando dados para ThingsBoard...")
+                    tb_future = executor.submit(
+                        self._send_to_thingsboard, df_processed, device_token
+                    )
+                
+                # Trendz (opcional)
+                trendz_future = None
+                if export_to_trendz and self.trendz_service:
+                    logger.info("Sincronizando com Trendz Analytics...")
+                    trendz_future = executor.submit(self._sync_to_trendz, station_name)
             
-            # 7. Sincronizar com Trendz (opcional)
-            trendz_result = None
-            if export_to_trendz and self.trendz_service:
-                logger.info("Sincronizando com Trendz Analytics...")
-                trendz_result = self._sync_to_trendz(station_name)
-            
-            # Limpar arquivos temporários
-            os.remove(csv_path)
-            os.rmdir(temp_dir)
+            s3_result = s3_future.result()
+            mlflow_result = mlflow_future.result()
+            tb_result = tb_future.result() if tb_future else None
+            trendz_result = trendz_future.result() if trendz_future else None
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -156,11 +156,20 @@ class ProcessedDataPipeline:
         y_pred_test: np.ndarray
     ) -> pd.DataFrame:
         """Cria DataFrame com dados processados e predições."""
-        df = X_test.copy()
-        df['temperatura_real'] = y_test.values
-        df['temperatura_prevista'] = y_pred_test
-        df['erro_predicao'] = y_test.values - y_pred_test
-        df['erro_absoluto'] = np.abs(df['erro_predicao'])
+        # Colunas derivadas montadas de uma vez e unidas com um único concat
+        # (sem copiar X_test nem inserir coluna a coluna)
+        temperatura_real = y_test.to_numpy()
+        erro = temperatura_real - y_pred_test
+        extras = pd.DataFrame(
+            {
+                'temperatura_real': temperatura_real,
+                'temperatura_prevista': y_pred_test,
+                'erro_predicao': erro,
+                'erro_absoluto': np.abs(erro)
+            },
+            index=X_test.index
+        )
+        df = pd.concat([X_test, extras], axis=1, copy=False)
         
         # Adicionar timestamp se não existir
         if not isinstance(df.index, pd.DatetimeIndex):
@@ -174,7 +183,7 @@ class ProcessedDataPipeline:
     
     def _upload_to_s3_processed(
         self,
-        csv_path: Path,
+        csv_data: bytes,
         station_name: str
     ) -> Dict[str, Any]:
         """Upload de dados processados para pasta específica no S3."""
@@ -186,8 +195,8 @@ class ProcessedDataPipeline:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             s3_key = f"{station_name}/{timestamp}_processed.csv"
             
-            result = self.s3_service.upload_file(
-                str(csv_path),
+            result = self.s3_service.upload_bytes(
+                csv_data,
                 s3_key=s3_key
             )
             
@@ -208,7 +217,8 @@ class ProcessedDataPipeline:
         results: Dict[str, Any],
         df_processed: pd.DataFrame,
         station_name: str,
-        csv_path: Path
+        csv_text: str,
+        csv_name: str
     ) -> Dict[str, Any]:
         """Registra experimento no MLflow."""
         try:
@@ -216,6 +226,7 @@ class ProcessedDataPipeline:
                 self.mlflow_service.initialize()
             
             run_name = f"processed_data_{station_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            erro_absoluto = df_processed['erro_absoluto'].to_numpy()
             
             with self.mlflow_service.start_run(
                 run_name=run_name,
@@ -238,16 +249,18 @@ class ProcessedDataPipeline:
                     "rmse_train": float(results['rmse_train']),
                     "rmse_test": float(results['rmse_test']),
                     "predictions_count": len(results['y_pred_test']),
-                    "mean_abs_error": float(df_processed['erro_absoluto'].mean()),
-                    "max_abs_error": float(df_processed['erro_absoluto'].max()),
-                    "min_abs_error": float(df_processed['erro_absoluto'].min())
+                    "mean_abs_error": float(np.nanmean(erro_absoluto)),
+                    "max_abs_error": float(np.nanmax(erro_absoluto)),
+                    "min_abs_error": float(np.nanmin(erro_absoluto))
                 })
                 
                 # Log artifact (CSV processado)
-                self.mlflow_service.log_artifact(str(csv_path), "processed_data")
+                self.mlflow_service.log_text(csv_text, f"processed_data/{csv_name}")
                 
-                # Log estatísticas descritivas
-                stats_dict = df_processed.describe().to_dict()
+                # Log estatísticas descritivas (sem quartis, que exigem ordenar cada coluna)
+                stats_dict = df_processed.select_dtypes('number').agg(
+                    ['count', 'min', 'max', 'mean', 'std']
+                ).to_dict()
                 self.mlflow_service.log_dict(stats_dict, "statistics.json")
                 
                 run_info = {
@@ -282,13 +295,17 @@ class ProcessedDataPipeline:
                 'temperatura_prevista', 'erro_predicao'
             ]
             
-            df_telemetry = df[[col for col in telemetry_columns if col in df.columns]]
+            df_telemetry = df.reindex(
+                columns=[col for col in telemetry_columns if col in df.columns],
+                copy=False
+            )
             
+            # Um POST com array JSON por lote de 1000 registros
             result = self.tb_service.send_dataframe(
                 device_token=device_token,
                 df=df_telemetry,
                 timestamp_column=None,  # Usar índice
-                batch_size=100
+                batch_size=1000
             )
             
             return result
@@ -2,15 +2,120 @@
 Service for uploading files to AWS S3.
 Mantém a estrutura original dos arquivos CSV do INMET.
 """
+import gzip
+import hashlib
+import io
 import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict, List
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
+from urllib3.poolmanager import PoolKey
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Content-Type por extensão (demais: application/octet-stream)
+CONTENT_TYPES = {
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".parquet": "application/octet-stream",
+}
+
+# Multipart só acima de 64 MB, em partes de 50 MB e até 16 conexões paralelas
+# (partes maiores rendem mais por requisição; CSVs menores vão em um único PUT)
+MULTIPART_THRESHOLD = 64 * 1024 * 1024
+MULTIPART_CHUNK_SIZE = 50 * 1024 * 1024
+MAX_TRANSFER_CONCURRENCY = 16
+
+# Arquivos abaixo de 8 MB sobem em um único PUT na própria thread
+# (sem o pool de threads do transfer manager a cada chamada)
+SMALL_FILE_THRESHOLD = 8 * 1024 * 1024
+
+# Com compress=True, arquivos acima de 1 MB sobem comprimidos (gzip nível 1)
+GZIP_MIN_SIZE = 1024 * 1024
+
+# Buffer de envio das conexões HTTP dos clientes S3 (padrão do http.client: 8 KB)
+HTTP_BLOCKSIZE = 1024 * 1024
+
+
+def _set_http_blocksize(client, blocksize: int = HTTP_BLOCKSIZE) -> None:
+    """
+    Set the send block size of the HTTP connections of one S3 client.
+    
+    PUT bodies are sent in 8 KB blocks, releasing and re-acquiring the GIL
+    per block, which limits throughput with many upload threads. botocore's
+    Config has no option for it, so the block size goes into the connection
+    kwargs of this client's own urllib3 PoolManager, leaving every other
+    HTTP connection in the process untouched. Only urllib3 2.x accepts
+    blocksize in the pool key; on older versions the client is left as is.
+    
+    Args:
+        client: boto3 S3 client (before any connection is opened)
+        blocksize: Block size in bytes
+    """
+    if "key_blocksize" not in PoolKey._fields:
+        return
+    
+    try:
+        manager = client._endpoint.http_session._manager
+    except AttributeError:
+        logger.debug("No urllib3 PoolManager on the S3 client; keeping default blocksize")
+        return
+    manager.connection_pool_kw["blocksize"] = blocksize
+
+
+# Clientes S3 compartilhados entre instâncias com as mesmas credenciais/região
+# (clientes boto3 são thread-safe; a criação via Session não é).
+# Pool grande o bastante para os uploads paralelos, keep-alive TCP, timeout
+# curto de conexão (endpoint inacessível falha rápido e entra no retry) e retries
+# adaptativos (recuam sob 503 SlowDown quando há muita concorrência)
+_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+)
+_clients: Dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_s3_client(
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    aws_region: str,
+):
+    """
+    Return a shared S3 client for the given credentials and region.
+    
+    Args:
+        aws_access_key_id: AWS access key ID
+        aws_secret_access_key: AWS secret access key
+        aws_region: AWS region
+        
+    Returns:
+        boto3 S3 client
+    """
+    key = (aws_access_key_id, aws_secret_access_key, aws_region)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            session = boto3.session.Session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                region_name=aws_region,
+            )
+            client = session.client("s3", config=_CLIENT_CONFIG)
+            _set_http_blocksize(client)
+            _clients[key] = client
+        return client
+
 
 class S3Service:
     """Service to upload files to AWS S3."""
@@ -22,6 +127,8 @@ class S3Service:
         aws_secret_access_key: str,
         aws_region: str = "us-east-1",
         s3_prefix: Optional[str] = None,
+        max_workers: int = 16,
+        hash_prefix: bool = False,
     ):
         """
         Initialize S3Service.
@@ -32,16 +139,30 @@ class S3Service:
             aws_secret_access_key: AWS secret access key
             aws_region: AWS region
             s3_prefix: Optional prefix for organizing files in S3
+            max_workers: Maximum number of files uploaded concurrently
+            hash_prefix: If True, station CSV keys start with a 2-char hash
+                ('<hash>/<ano>/<arquivo>') to spread PUTs across S3 partitions
         """
         self.bucket_name = bucket_name
         self.s3_prefix = s3_prefix or ""
+        self.max_workers = max_workers
+        self.hash_prefix = hash_prefix
+        self._credentials = (aws_access_key_id, aws_secret_access_key, aws_region)
+        
+        # S3 client (shared with other instances using the same credentials)
+        self.s3_client = _get_s3_client(
+            aws_access_key_id, aws_secret_access_key, aws_region
+        )
         
-        # Initialize S3 client
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=aws_region,
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=MAX_TRANSFER_CONCURRENCY,
+            use_threads=True,
+        )
+        self._small_transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            use_threads=False,
         )
     
     def upload_file(
@@ -49,6 +170,7 @@ class S3Service:
         local_file_path: str,
         s3_key: Optional[str] = None,
         preserve_structure: bool = True,
+        compress: bool = False,
     ) -> Dict[str, str]:
         """
         Upload a single file to S3.
@@ -57,6 +179,8 @@ class S3Service:
             local_file_path: Path to the local file
             s3_key: Optional S3 key (object name). If not provided, uses relative path
             preserve_structure: If True, preserves directory structure in S3 key
+            compress: If True, files above GZIP_MIN_SIZE are gzipped and
+                stored as '<key>.gz' with ContentEncoding gzip
             
         Returns:
             Dictionary with upload result:
@@ -67,33 +191,47 @@ class S3Service:
             }
         """
         file_path = Path(local_file_path)
+        s3_key = self._resolve_key(file_path, s3_key, preserve_structure)
         
-        if not file_path.exists():
-            return {
-                "success": False,
-                "s3_key": None,
-                "message": f"File not found: {local_file_path}",
-            }
-        
-        # Determine S3 key
-        if s3_key is None:
-            if preserve_structure:
-                # Use relative path as S3 key
-                s3_key = str(file_path.name)
-            else:
-                s3_key = file_path.name
-        
-        # Add prefix if specified
-        if self.s3_prefix:
-            s3_key = f"{self.s3_prefix}/{s3_key}".strip("/")
+        extra_args = {
+            "ContentType": CONTENT_TYPES.get(
+                file_path.suffix.lower(), "application/octet-stream"
+            )
+        }
+        upload_path = os.fspath(local_file_path)
+        gzip_path = None
         
         try:
-            # Upload file
+            # stat() raises FileNotFoundError for missing files, handled below
+            size = file_path.stat().st_size
+            
+            if compress and size > GZIP_MIN_SIZE:
+                # Fast compression (level 1) rarely bottlenecks the network
+                with tempfile.NamedTemporaryFile(suffix=".gz", delete=False) as tmp:
+                    gzip_path = tmp.name
+                    with open(file_path, "rb") as src, gzip.GzipFile(
+                        fileobj=tmp, mode="wb", compresslevel=1
+                    ) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                    # Tamanho comprimido sem novo stat()
+                    size = tmp.tell()
+                upload_path = gzip_path
+                s3_key = f"{s3_key}.gz"
+                extra_args["ContentEncoding"] = "gzip"
+            
+            # Small files skip the transfer thread pool
+            if size < SMALL_FILE_THRESHOLD:
+                transfer_config = self._small_transfer_config
+            else:
+                transfer_config = self._transfer_config
+            
+            # Upload file (streamed from disk by boto3)
             self.s3_client.upload_file(
-                str(file_path),
+                upload_path,
                 self.bucket_name,
                 s3_key,
-                ExtraArgs={"ContentType": "text/csv"},  # CSV files
+                ExtraArgs=extra_args,
+                Config=transfer_config,
             )
             
             logger.info(f"Successfully uploaded {local_file_path} to s3://{self.bucket_name}/{s3_key}")
@@ -104,6 +242,13 @@ class S3Service:
                 "message": f"File uploaded successfully to s3://{self.bucket_name}/{s3_key}",
             }
         
+        except FileNotFoundError:
+            return {
+                "success": False,
+                "s3_key": None,
+                "message": f"File not found: {local_file_path}",
+            }
+        
         except ClientError as e:
             error_msg = f"AWS ClientError uploading {local_file_path}: {str(e)}"
             logger.error(error_msg)
@@ -130,6 +275,77 @@ class S3Service:
                 "s3_key": s3_key,
                 "message": error_msg,
             }
+        
+        finally:
+            if gzip_path:
+                os.unlink(gzip_path)
+    
+    def _resolve_key(
+        self,
+        file_path: Path,
+        s3_key: Optional[str],
+        preserve_structure: bool,
+    ) -> str:
+        """Return the final S3 key upload_file uses for a file."""
+        # Determine S3 key
+        if s3_key is None:
+            if preserve_structure:
+                # Use relative path as S3 key
+                s3_key = str(file_path.name)
+            else:
+                s3_key = file_path.name
+        
+        # Add prefix if specified
+        if self.s3_prefix:
+            s3_key = f"{self.s3_prefix}/{s3_key}".strip("/")
+        
+        return s3_key
+    
+    def upload_bytes(
+        self,
+        data: bytes,
+        s3_key: str,
+        content_type: str = "text/csv",
+    ) -> Dict[str, str]:
+        """
+        Upload in-memory content to S3 (no temporary file).
+        
+        Args:
+            data: Content to upload
+            s3_key: S3 key (object name), prefixed with s3_prefix if set
+            content_type: Content-Type of the object
+            
+        Returns:
+            Dictionary with upload result (same format as upload_file)
+        """
+        if self.s3_prefix:
+            s3_key = f"{self.s3_prefix}/{s3_key}".strip("/")
+        
+        try:
+            self.s3_client.upload_fileobj(
+                io.BytesIO(data),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={"ContentType": content_type},
+                Config=self._transfer_config,
+            )
+            
+            logger.info(f"Successfully uploaded {len(data)} bytes to s3://{self.bucket_name}/{s3_key}")
+            
+            return {
+                "success": True,
+                "s3_key": s3_key,
+                "message": f"File uploaded successfully to s3://{self.bucket_name}/{s3_key}",
+            }
+        
+        except (ClientError, BotoCoreError) as e:
+            error_msg = f"AWS error uploading to {s3_key}: {str(e)}"
+            logger.error(error_msg)
+            return {
+                "success": False,
+                "s3_key": s3_key,
+                "message": error_msg,
+            }
     
     def upload_file_with_structure(
         self,
@@ -146,6 +362,14 @@ class S3Service:
         Returns:
             Dictionary with upload result
         """
+        return self.upload_file(
+            local_file_path,
+            s3_key=self._structure_key(relative_path),
+            preserve_structure=False
+        )
+    
+    def _structure_key(self, relative_path: str) -> str:
+        """Return the key upload_file_with_structure passes to upload_file."""
         # Use relative_path as S3 key to preserve structure
         s3_key = relative_path
         
@@ -153,7 +377,7 @@ class S3Service:
         if self.s3_prefix:
             s3_key = f"{self.s3_prefix}/{s3_key}".strip("/")
         
-        return self.upload_file(local_file_path, s3_key=s3_key, preserve_structure=False)
+        return s3_key
     
     def check_bucket_exists(self) -> bool:
         """
@@ -184,16 +408,188 @@ class S3Service:
         Returns:
             Dicionário com resultado do upload
         """
+        relative_path = self._csv_relative_path(arquivo_path, ano)
+        return self.upload_file_with_structure(str(arquivo_path), relative_path)
+    
+    def _csv_relative_path(self, arquivo_path: Path, ano: str) -> str:
+        """Caminho relativo (ano/arquivo.CSV) usado no upload de um CSV de estação."""
         # Construir chave S3 mantendo a estrutura: data/ano/arquivo.CSV
         relative_path = f"{ano}/{arquivo_path.name}"
         
-        return self.upload_file_with_structure(str(arquivo_path), relative_path)
+        # Opcional: data/<hash>/ano/arquivo.CSV, evitando concentrar os PUTs
+        # de cargas grandes em um único prefixo (limite de ~3500 PUT/s)
+        if self.hash_prefix:
+            digest = hashlib.md5(arquivo_path.name.encode()).hexdigest()[:2]
+            relative_path = f"{digest}/{relative_path}"
+        
+        return relative_path
+    
+    def _csv_s3_key(self, arquivo_path: Path, ano: str) -> str:
+        """Chave final no S3 de um CSV enviado por upload_csv_estacao."""
+        return self._resolve_key(
+            arquivo_path,
+            self._structure_key(self._csv_relative_path(arquivo_path, ano)),
+            preserve_structure=False
+        )
+    
+    def _listar_tamanhos(self, prefix: Optional[str] = None) -> Dict[str, int]:
+        """
+        Lista chaves e tamanhos do bucket em uma única varredura paginada.
+        
+        Args:
+            prefix: Prefixo para filtrar arquivos (None = usar s3_prefix padrão)
+            
+        Returns:
+            Dicionário {chave: tamanho em bytes}
+        """
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            pages = paginator.paginate(
+                Bucket=self.bucket_name,
+                Prefix=prefix if prefix else self.s3_prefix,
+                PaginationConfig={"PageSize": 1000}
+            )
+            return {
+                obj['Key']: obj['Size']
+                for page in pages for obj in page.get('Contents', [])
+            }
+            
+        except ClientError as e:
+            logger.error(f"Erro ao listar arquivos do bucket: {str(e)}")
+            return {}
+    
+    def _index_data_directory(
+        self,
+        data_directory: Path,
+        anos: Optional[List[str]] = None
+    ) -> Dict[str, List[Path]]:
+        """
+        Lista os arquivos CSV de cada pasta de ano uma única vez.
+        
+        Args:
+            data_directory: Diretório raiz com as pastas de anos
+            anos: Lista de anos específicos (None = todos os anos disponíveis)
+            
+        Returns:
+            Dicionário {ano: [arquivos .CSV]} apenas com os anos existentes
+        """
+        if anos is None:
+            anos_dirs = [d for d in data_directory.iterdir() if d.is_dir() and d.name.isdigit()]
+            anos = sorted([d.name for d in anos_dirs])
+        
+        indice = {}
+        for ano in anos:
+            ano_dir = data_directory / ano
+            
+            if not ano_dir.exists():
+                logger.warning(f"Diretório do ano {ano} não encontrado")
+                continue
+            
+            with os.scandir(ano_dir) as entries:
+                indice[ano] = sorted(
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith(".CSV") and not entry.name.startswith(".")
+                )
+        
+        return indice
+    
+    def _arquivos_estacao(
+        self,
+        indice: Dict[str, List[Path]],
+        estacao_nome: str
+    ) -> List[tuple]:
+        """
+        Filtra no índice os arquivos CSV de uma estação (sem novo glob).
+        
+        Args:
+            indice: Índice de _index_data_directory
+            estacao_nome: Nome da estação (ex: PETROLINA ou ARCO_VERDE)
+            
+        Returns:
+            Lista de tuplas (arquivo, ano)
+        """
+        # Converter nome com underscore para espaço (como nos arquivos)
+        nome_arquivo = estacao_nome.replace("_", " ")
+        
+        uploads = []
+        for ano, arquivos_ano in indice.items():
+            arquivos = [arquivo for arquivo in arquivos_ano if nome_arquivo in arquivo.name]
+            
+            logger.info(f"Encontrados {len(arquivos)} arquivos para {estacao_nome} em {ano}")
+            uploads.extend((arquivo, ano) for arquivo in arquivos)
+        
+        return uploads
+    
+    def _pendentes_estacao(
+        self,
+        indice: Dict[str, List[Path]],
+        estacao_nome: str,
+        skip_existing: bool,
+        remotos: Optional[Dict[str, int]]
+    ) -> tuple:
+        """
+        Lista os arquivos de uma estação que precisam ser enviados.
+        
+        Args:
+            indice: Índice de _index_data_directory
+            estacao_nome: Nome da estação
+            skip_existing: Pular arquivos já no bucket com o mesmo tamanho
+            remotos: Listagem de _listar_tamanhos (None = listar o bucket)
+            
+        Returns:
+            Tupla (lista de (arquivo, ano) pendentes, quantidade ignorada)
+        """
+        uploads = self._arquivos_estacao(indice, estacao_nome)
+        
+        # Reexecuções: não reenviar arquivos que já estão no bucket
+        if not skip_existing:
+            return uploads, 0
+        
+        if remotos is None:
+            remotos = self._listar_tamanhos()
+        pendentes = [
+            (arquivo, ano) for arquivo, ano in uploads
+            if remotos.get(self._csv_s3_key(arquivo, ano)) != arquivo.stat().st_size
+        ]
+        ignorados = len(uploads) - len(pendentes)
+        logger.info(f"{ignorados} arquivos de {estacao_nome} já estão no bucket")
+        return pendentes, ignorados
+    
+    @staticmethod
+    def _registrar_upload(
+        resultado: Dict[str, any],
+        arquivo: Path,
+        ano: str,
+        upload_result: Dict[str, str]
+    ):
+        """Acumula o resultado do upload de um arquivo no resumo da estação."""
+        resultado['total'] += 1
+        
+        if upload_result['success']:
+            resultado['sucesso'] += 1
+            resultado['arquivos'].append({
+                'arquivo': arquivo.name,
+                'ano': ano,
+                's3_key': upload_result['s3_key'],
+                'status': 'sucesso'
+            })
+        else:
+            resultado['falhas'] += 1
+            resultado['arquivos'].append({
+                'arquivo': arquivo.name,
+                'ano': ano,
+                'status': 'falha',
+                'erro': upload_result['message']
+            })
     
     def upload_todos_csv_estacao(
         self,
         data_directory: Path,
         estacao_nome: str,
-        anos: Optional[List[str]] = None
+        anos: Optional[List[str]] = None,
+        indice: Optional[Dict[str, List[Path]]] = None,
+        skip_existing: bool = False,
+        remotos: Optional[Dict[str, int]] = None
     ) -> Dict[str, any]:
         """
         Faz upload de todos os arquivos CSV de uma estação para S3.
@@ -202,6 +598,9 @@ class S3Service:
             data_directory: Diretório raiz com as pastas de anos
             estacao_nome: Nome da estação (ex: PETROLINA ou ARCO_VERDE)
             anos: Lista de anos específicos (None = todos os anos disponíveis)
+            indice: Índice de _index_data_directory (None = listar os diretórios)
+            skip_existing: Pular arquivos já no bucket com o mesmo tamanho
+            remotos: Listagem de _listar_tamanhos (None = listar o bucket)
             
         Returns:
             Dicionário com contadores de sucesso e falha
@@ -211,55 +610,28 @@ class S3Service:
             'total': 0,
             'sucesso': 0,
             'falhas': 0,
+            'ignorados': 0,
             'arquivos': []
         }
         
-        # Converter nome com underscore para espaço (como nos arquivos)
-        nome_arquivo = estacao_nome.replace("_", " ")
+        if indice is None:
+            indice = self._index_data_directory(data_directory, anos)
         
-        # Se não especificado, buscar todos os anos
-        if anos is None:
-            anos_dirs = [d for d in data_directory.iterdir() if d.is_dir() and d.name.isdigit()]
-            anos = sorted([d.name for d in anos_dirs])
+        logger.info(f"Iniciando upload para estação {estacao_nome} nos anos: {list(indice)}")
         
-        logger.info(f"Iniciando upload para estação {estacao_nome} nos anos: {anos}")
+        uploads, resultado['ignorados'] = self._pendentes_estacao(
+            indice, estacao_nome, skip_existing, remotos
+        )
         
-        # Processar cada ano
-        for ano in anos:
-            ano_dir = data_directory / ano
-            
-            if not ano_dir.exists():
-                logger.warning(f"Diretório do ano {ano} não encontrado")
-                continue
-            
-            # Buscar arquivos CSV da estação
-            pattern = f"*{nome_arquivo}*.CSV"
-            arquivos = list(ano_dir.glob(pattern))
-            
-            logger.info(f"Encontrados {len(arquivos)} arquivos para {estacao_nome} em {ano}")
+        # Upload concorrente de todos os arquivos (cliente boto3 é thread-safe);
+        # map preserva a ordem dos resultados
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            upload_results = executor.map(
+                lambda item: self.upload_csv_estacao(*item), uploads
+            )
             
-            # Upload de cada arquivo
-            for arquivo in arquivos:
-                resultado['total'] += 1
-                
-                upload_result = self.upload_csv_estacao(arquivo, ano)
-                
-                if upload_result['success']:
-                    resultado['sucesso'] += 1
-                    resultado['arquivos'].append({
-                        'arquivo': arquivo.name,
-                        'ano': ano,
-                        's3_key': upload_result['s3_key'],
-                        'status': 'sucesso'
-                    })
-                else:
-                    resultado['falhas'] += 1
-                    resultado['arquivos'].append({
-                        'arquivo': arquivo.name,
-                        'ano': ano,
-                        'status': 'falha',
-                        'erro': upload_result['message']
-                    })
+            for (arquivo, ano), upload_result in zip(uploads, upload_results):
+                self._registrar_upload(resultado, arquivo, ano, upload_result)
         
         logger.info(
             f"Upload concluído para {estacao_nome}: "
@@ -272,7 +644,8 @@ class S3Service:
         self,
         data_directory: Path,
         estacoes: List[Dict[str, str]],
-        anos: Optional[List[str]] = None
+        anos: Optional[List[str]] = None,
+        skip_existing: bool = False
     ) -> Dict[str, any]:
         """
         Faz upload de todos os arquivos CSV de todas as estações para S3.
@@ -281,6 +654,7 @@ class S3Service:
             data_directory: Diretório raiz com as pastas de anos
             estacoes: Lista de dicionários com informações das estações
             anos: Lista de anos específicos (None = todos os anos disponíveis)
+            skip_existing: Pular arquivos já no bucket com o mesmo tamanho
             
         Returns:
             Dicionário com resumo geral e resultados por estação
@@ -296,12 +670,42 @@ class S3Service:
         
         logger.info(f"Iniciando upload de {len(estacoes)} estações para S3")
         
+        # Diretórios de ano (e o bucket, se necessário) listados uma vez
+        # para todas as estações
+        indice = self._index_data_directory(data_directory, anos)
+        remotos = self._listar_tamanhos() if skip_existing else None
+        
+        # Resumo por estação, no mesmo formato de upload_todos_csv_estacao
+        resultados = {}
+        tarefas = []
         for estacao in estacoes:
             nome = estacao['nome']
             logger.info(f"Processando estação: {nome}")
+            pendentes, ignorados = self._pendentes_estacao(
+                indice, nome, skip_existing, remotos
+            )
+            resultados[nome] = {
+                'estacao': nome,
+                'total': 0,
+                'sucesso': 0,
+                'falhas': 0,
+                'ignorados': ignorados,
+                'arquivos': []
+            }
+            tarefas.extend((nome, arquivo, ano) for arquivo, ano in pendentes)
+        
+        # Um único pool para os arquivos de todas as estações: nenhuma estação
+        # com poucos arquivos deixa threads ociosas; map preserva a ordem e a
+        # agregação fica na thread chamadora
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            upload_results = executor.map(
+                lambda tarefa: self.upload_csv_estacao(tarefa[1], tarefa[2]), tarefas
+            )
             
-            resultado = self.upload_todos_csv_estacao(data_directory, nome, anos)
-            
+            for (nome, arquivo, ano), upload_result in zip(tarefas, upload_results):
+                self._registrar_upload(resultados[nome], arquivo, ano, upload_result)
+        
+        for nome, resultado in resultados.items():
             resultado_geral['total_arquivos'] += resultado['total']
             resultado_geral['total_sucesso'] += resultado['sucesso']
             resultado_geral['total_falhas'] += resultado['falhas']
@@ -315,6 +719,88 @@ class S3Service:
         
         return resultado_geral
     
+    def upload_todas_estacoes_mp(
+        self,
+        data_directory: Path,
+        estacoes: List[Dict[str, str]],
+        anos: Optional[List[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Variante de upload_todas_estacoes com um processo por núcleo.
+        
+        Para volumes grandes o custo de CPU do envio (TLS, leitura dos
+        arquivos) fica preso ao GIL; processos separados escapam dele.
+        Cada processo cria o próprio cliente S3 no initializer.
+        
+        Args:
+            data_directory: Diretório raiz com as pastas de anos
+            estacoes: Lista de dicionários com informações das estações
+            anos: Lista de anos específicos (None = todos os anos disponíveis)
+            max_workers: Número de processos (None = os.cpu_count())
+            
+        Returns:
+            Dicionário com resumo geral e resultados por estação
+        """
+        resultado_geral = {
+            'total_estacoes': len(estacoes),
+            'total_arquivos': 0,
+            'total_sucesso': 0,
+            'total_falhas': 0,
+            'estacoes_processadas': [],
+            'detalhes': {}
+        }
+        
+        logger.info(f"Iniciando upload de {len(estacoes)} estações para S3 (multiprocesso)")
+        
+        indice = self._index_data_directory(data_directory, anos)
+        uploads = {
+            estacao['nome']: self._arquivos_estacao(indice, estacao['nome'])
+            for estacao in estacoes
+        }
+        tarefas = [
+            (str(arquivo), ano)
+            for arquivos in uploads.values()
+            for arquivo, ano in arquivos
+        ]
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_upload_process,
+            initargs=(
+                self.bucket_name, *self._credentials, self.s3_prefix, self.hash_prefix
+            )
+        ) as executor:
+            # map preserva a ordem: os resultados seguem a ordem das tarefas
+            upload_results = iter(executor.map(_upload_csv_in_process, tarefas, chunksize=4))
+            
+            for estacao in estacoes:
+                nome = estacao['nome']
+                resultado = {
+                    'estacao': nome,
+                    'total': 0,
+                    'sucesso': 0,
+                    'falhas': 0,
+                    'ignorados': 0,
+                    'arquivos': []
+                }
+                
+                for arquivo, ano in uploads[nome]:
+                    self._registrar_upload(resultado, arquivo, ano, next(upload_results))
+                
+                resultado_geral['total_arquivos'] += resultado['total']
+                resultado_geral['total_sucesso'] += resultado['sucesso']
+                resultado_geral['total_falhas'] += resultado['falhas']
+                resultado_geral['estacoes_processadas'].append(nome)
+                resultado_geral['detalhes'][nome] = resultado
+        
+        logger.info(
+            f"Upload geral concluído: {resultado_geral['total_sucesso']}/"
+            f"{resultado_geral['total_arquivos']} arquivos enviados para S3"
+        )
+        
+        return resultado_geral
+    
     def listar_arquivos_bucket(self, prefix: Optional[str] = None) -> List[str]:
         """
         Lista arquivos no bucket S3.
@@ -328,16 +814,22 @@ class S3Service:
         try:
             prefix_busca = prefix if prefix else self.s3_prefix
             
-            response = self.s3_client.list_objects_v2(
+            # Paginação: list_objects_v2 retorna no máximo 1000 chaves por chamada
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            pages = paginator.paginate(
                 Bucket=self.bucket_name,
-                Prefix=prefix_busca
+                Prefix=prefix_busca,
+                PaginationConfig={"PageSize": 1000}
             )
             
-            if 'Contents' not in response:
+            arquivos = [
+                obj['Key'] for page in pages for obj in page.get('Contents', [])
+            ]
+            
+            if not arquivos:
                 logger.info(f"Nenhum arquivo encontrado com prefixo: {prefix_busca}")
                 return []
             
-            arquivos = [obj['Key'] for obj in response['Contents']]
             logger.info(f"Encontrados {len(arquivos)} arquivos no bucket")
             
             return arquivos
@@ -347,6 +839,40 @@ class S3Service:
             return []
 
 
+# Serviço do processo filho em upload_todas_estacoes_mp
+_process_service: Optional[S3Service] = None
+
+
+def _init_upload_process(
+    bucket_name: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    aws_region: str,
+    s3_prefix: str,
+    hash_prefix: bool,
+):
+    """Create this worker process's own S3Service (clients are not fork-safe)."""
+    global _clients, _clients_lock, _process_service
+    
+    # Descartar clientes herdados do processo pai via fork
+    _clients = {}
+    _clients_lock = threading.Lock()
+    _process_service = S3Service(
+        bucket_name=bucket_name,
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_region=aws_region,
+        s3_prefix=s3_prefix,
+        hash_prefix=hash_prefix,
+    )
+
+
+def _upload_csv_in_process(tarefa: tuple) -> Dict[str, str]:
+    """Upload one (path, year) task in a worker process."""
+    arquivo, ano = tarefa
+    return _process_service.upload_csv_estacao(Path(arquivo), ano)
+
+
 def create_s3_service(
     bucket_name: str,
     aws_access_key_id: str,
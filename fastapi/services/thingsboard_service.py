@@ -3,14 +3,127 @@ Serviço para integração com ThingsBoard.
 Envia telemetria de dados meteorológicos tratados.
 """
 
+import gzip
+import json
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+from collections import deque
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
+from .auth_utils import require_auth
+
+try:
+    import orjson
+except ImportError:  # fallback para o json da biblioteca padrão
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # fallback para a conversão via pandas
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# Lotes a partir deste tamanho são comprimidos com gzip (quando use_gzip=True)
+GZIP_MIN_RECORDS = 50
+
+# Linhas convertidas em dicts por vez em _iter_telemetry_batches (memória
+# proporcional a este bloco, não ao DataFrame inteiro)
+RECORDS_CHUNK_ROWS = 10_000
+
+# Intervalo mínimo (s) entre logs de progresso em send_dataframe
+PROGRESS_LOG_INTERVAL = 2.0
+
+# Lotes em voo por envio concorrente (= pool_maxsize da session)
+MAX_CONCURRENT_BATCHES = 32
+
+
+def _dumps(payload: Any) -> bytes:
+    """
+    Serializa um payload em JSON compacto (orjson quando disponível).
+    
+    Args:
+        payload: Objeto a serializar
+        
+    Returns:
+        JSON codificado em UTF-8
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        )
+    return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+
+
+class RateLimiter:
+    """
+    Limitador de requisições por segundo ajustado pelos cabeçalhos do servidor.
+    
+    Sem cabeçalhos de limite não restringe nada. Com X-RateLimit-Remaining/
+    X-RateLimit-Reset passa a espaçar as requisições a 95% da taxa anunciada
+    (evitando rajada seguida de bloqueio); Retry-After pausa todas as threads.
+    """
+    
+    def __init__(self, safety_factor: float = 0.95):
+        """
+        Inicializa o limitador.
+        
+        Args:
+            safety_factor: Fração da taxa anunciada efetivamente usada
+        """
+        self.safety_factor = safety_factor
+        self._interval = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Aguarda até a próxima requisição ser permitida."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def update(self, response: requests.Response):
+        """
+        Ajusta a taxa a partir dos cabeçalhos de uma resposta.
+        
+        Args:
+            response: Resposta HTTP recebida
+        """
+        headers = response.headers
+        now = time.monotonic()
+        
+        try:
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                with self._lock:
+                    self._next_slot = max(self._next_slot, now + min(float(retry_after), 30.0))
+            
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None and reset is not None:
+                reset_seconds = float(reset)
+                # Alguns servidores enviam epoch em vez de segundos restantes
+                if reset_seconds > 1e9:
+                    reset_seconds -= time.time()
+                
+                rate = float(remaining) / max(reset_seconds, 1.0)
+                with self._lock:
+                    self._interval = 1.0 / (rate * self.safety_factor) if rate > 0 else reset_seconds
+        except ValueError:
+            # Cabeçalho em formato inesperado (ex.: Retry-After como data HTTP)
+            pass
+
 
 class ThingsBoardService:
     """Serviço para enviar dados ao ThingsBoard."""
@@ -18,7 +131,8 @@ class ThingsBoardService:
     def __init__(
         self,
         tb_url: str = "http://thingsboard:9090",
-        access_token: Optional[str] = None
+        access_token: Optional[str] = None,
+        use_gzip: bool = False
     ):
         """
         Inicializa o serviço ThingsBoard.
@@ -26,18 +140,85 @@ class ThingsBoardService:
         Args:
             tb_url: URL do ThingsBoard
             access_token: Token de acesso do dispositivo
+            use_gzip: Comprimir lotes grandes de telemetria (Content-Encoding: gzip);
+                exige que o servidor descomprima o corpo das requisições
         """
         self.tb_url = tb_url.rstrip('/')
         self.access_token = access_token
+        self.use_gzip = use_gzip
+        self._gzip_lock = threading.Lock()
+        self.rate_limiter = RateLimiter()
         self._authenticated = False
         self.jwt_token = None
         
-        # Session HTTP reutilizável para melhor performance
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Cache nome -> dispositivo (preenchido na primeira busca por nome)
+        self._device_cache: Dict[str, Dict[str, Any]] = {}
+        self._device_cache_loaded = False
+        
+        # URLs de telemetria por token de dispositivo
+        self._telemetry_urls: Dict[str, str] = {}
+        
+        # Session HTTP reutilizável (keep-alive) para melhor performance.
+        # Retries com backoff em 429/5xx só nos métodos idempotentes padrão:
+        # repetir um POST de criação (device, login) após um 5xx do gateway
+        # pode reenviar algo que o servidor já aplicou
+        self.session = self._build_session(
+            Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        
+        # Session só para os POSTs de telemetria, que podem ser repetidos:
+        # reenviar telemetria com o mesmo ts apenas sobrescreve o valor
+        self._telemetry_session = self._build_session(
+            Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False
+            )
+        )
+    
+    @staticmethod
+    def _build_session(retry: Retry) -> requests.Session:
+        """
+        Cria uma Session keep-alive com a política de retry informada.
+        
+        Args:
+            retry: Política de retry do urllib3
+            
+        Returns:
+            Session com JSON como Content-Type padrão
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32, pool_maxsize=MAX_CONCURRENT_BATCHES, max_retries=retry
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
             'Content-Type': 'application/json'
         })
+        return session
         
+    def close(self):
+        """Fecha as conexões HTTP das sessions."""
+        self.session.close()
+        self._telemetry_session.close()
+    
+    def _telemetry_url(self, device_token: str) -> str:
+        """URL de telemetria do dispositivo (montada uma vez por token)."""
+        url = self._telemetry_urls.get(device_token)
+        if url is None:
+            url = self._telemetry_urls[device_token] = (
+                f"{self.tb_url}/api/v1/{device_token}/telemetry"
+            )
+        return url
+    
     def authenticate(self, username: str, password: str) -> bool:
         """
         Autentica no ThingsBoard e obtém JWT token.
@@ -56,11 +237,15 @@ class ThingsBoardService:
                 "password": password
             }
             
-            response = self.session.post(url, json=payload, timeout=10)
+            response = self.session.post(url, data=_dumps(payload), timeout=10)
             response.raise_for_status()
             
             self.jwt_token = response.json().get("token")
             self._authenticated = True
+            self.invalidate_device_cache()
+            
+            # Token enviado em todas as requisições seguintes da session
+            self.session.headers["Authorization"] = f"Bearer {self.jwt_token}"
             
             logger.info("Autenticado no ThingsBoard com sucesso")
             return True
@@ -88,17 +273,21 @@ class ThingsBoardService:
             True se enviado com sucesso
         """
         try:
-            url = f"{self.tb_url}/api/v1/{device_token}/telemetry"
+            url = self._telemetry_url(device_token)
             
+            # Sem ts, o servidor usa a hora do recebimento: repetir o POST
+            # criaria um segundo ponto, então só com ts há retry em 5xx
             if timestamp:
                 payload = {
                     "ts": timestamp,
                     "values": telemetry_data
                 }
+                session = self._telemetry_session
             else:
                 payload = telemetry_data
+                session = self.session
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = session.post(url, data=_dumps(payload), timeout=10)
             response.raise_for_status()
             
             return True
@@ -118,7 +307,7 @@ class ThingsBoardService:
         
         Args:
             device_token: Token de acesso do dispositivo
-            telemetry_list: Lista de dicts com 'ts' e 'values'
+            telemetry_list: Lista de dicts no formato {'ts': ..., 'values': {...}}
             
         Returns:
             Dict com contadores de sucesso/falha
@@ -128,30 +317,59 @@ class ThingsBoardService:
         
         try:
             # ThingsBoard aceita array de telemetria em uma única chamada
-            url = f"{self.tb_url}/api/v1/{device_token}/telemetry"
+            url = self._telemetry_url(device_token)
             
             # Formatar payload para envio em lote
             # ThingsBoard aceita formato: [{"ts": ..., "values": {...}}, ...]
-            response = self.session.post(url, json=telemetry_list, timeout=30)
+            # JSON compacto: lotes grandes ficam menores que com json=
+            body = _dumps(telemetry_list)
+            
+            # Telemetria meteorológica comprime bem (chaves repetidas);
+            # nível 1 custa quase nada de CPU
+            if self.use_gzip and len(telemetry_list) > GZIP_MIN_RECORDS:
+                self.rate_limiter.acquire()
+                response = self._telemetry_session.post(
+                    url,
+                    data=gzip.compress(body, compresslevel=1),
+                    headers={"Content-Encoding": "gzip"},
+                    timeout=30
+                )
+                self.rate_limiter.update(response)
+                
+                if response.status_code != 415:
+                    response.raise_for_status()
+                    return {
+                        "success": len(telemetry_list),
+                        "failed": 0,
+                        "total": len(telemetry_list)
+                    }
+                
+                # 415: servidor não aceita Content-Encoding gzip. Desativar
+                # (uma vez, entre threads) e reenviar este lote sem compressão
+                with self._gzip_lock:
+                    if self.use_gzip:
+                        self.use_gzip = False
+                        logger.warning(
+                            "ThingsBoard recusou corpo gzip (415), "
+                            "enviando sem compressão"
+                        )
+            
+            self.rate_limiter.acquire()
+            response = self._telemetry_session.post(url, data=body, timeout=30)
+            self.rate_limiter.update(response)
             response.raise_for_status()
             
             success_count = len(telemetry_list)
             failed_count = 0
             
         except Exception as e:
-            logger.error(f"Erro ao enviar batch telemetry: {e}")
-            # Em caso de erro, tentar enviar individualmente
+            # Sem fallback registro a registro: N requisições individuais só
+            # multiplicariam a carga; o chamador decide se reenvia o lote
+            logger.error(
+                f"Erro ao enviar batch telemetry ({len(telemetry_list)} registros): {e}"
+            )
             success_count = 0
-            failed_count = 0
-            
-            for telemetry in telemetry_list:
-                timestamp = telemetry.get('ts')
-                values = telemetry.get('values', telemetry)
-                
-                if self.send_telemetry(device_token, values, timestamp):
-                    success_count += 1
-                else:
-                    failed_count += 1
+            failed_count = len(telemetry_list)
         
         return {
             "success": success_count,
@@ -159,21 +377,121 @@ class ThingsBoardService:
             "total": len(telemetry_list)
         }
     
+    def _iter_telemetry_batches(
+        self,
+        df: pd.DataFrame,
+        timestamp_column: Optional[str],
+        batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Gera lotes de telemetria sem materializar o DataFrame inteiro em dicts.
+        
+        Os registros são convertidos em blocos de RECORDS_CHUNK_ROWS linhas
+        (múltiplo de batch_size), mantendo a conversão vetorizada.
+        
+        Args:
+            df: DataFrame com os dados
+            timestamp_column: Nome da coluna com timestamps
+            batch_size: Tamanho de cada lote
+            
+        Yields:
+            Lote de dicts com 'ts' e 'values'
+        """
+        # Converter timestamps para milissegundos de uma vez (sem iterrows)
+        if timestamp_column and timestamp_column in df.columns:
+            ts_series = df[timestamp_column]
+            # Converter a coluna inteira só se ainda não for datetime64 (de
+            # qualquer unidade ou fuso; a conversão abaixo respeita ambos)
+            if ts_series.dtype.kind != "M":
+                ts_series = pd.to_datetime(ts_series)
+            ts_index = pd.DatetimeIndex(ts_series)
+            values_df = df.drop(columns=[timestamp_column])
+        elif isinstance(df.index, pd.DatetimeIndex):
+            ts_index = df.index
+            values_df = df
+        else:
+            ts_index = None
+            values_df = df
+        
+        if ts_index is not None:
+            # Com fuso: epoch é sempre UTC
+            if ts_index.tz is not None:
+                ts_index = ts_index.tz_convert("UTC").tz_localize(None)
+            
+            # NaT não tem timestamp válido: descartar a linha em vez de enviar lixo
+            valid = ts_index.notna()
+            if not valid.all():
+                logger.warning(
+                    f"{int((~valid).sum())} registros sem timestamp descartados"
+                )
+                ts_index = ts_index[valid]
+                values_df = values_df[valid]
+            # Conversão pela unidade real (pandas 2 mantém [s], [ms], [us])
+            timestamps = (
+                ts_index.to_numpy(dtype="datetime64[ms]").astype("int64").tolist()
+            )
+        else:
+            timestamps = [int(datetime.now().timestamp() * 1000)] * len(values_df)
+        
+        total_rows = len(values_df)
+        
+        chunk_rows = max(batch_size, RECORDS_CHUNK_ROWS // batch_size * batch_size)
+        
+        for start in range(0, total_rows, chunk_rows):
+            records = self._to_records(values_df.iloc[start:start + chunk_rows])
+            chunk_ts = timestamps[start:start + chunk_rows]
+            
+            for i in range(0, len(records), batch_size):
+                yield [
+                    {"ts": ts, "values": values}
+                    for ts, values in zip(
+                        chunk_ts[i:i + batch_size], records[i:i + batch_size]
+                    )
+                ]
+    
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Converte um DataFrame em lista de dicts, com NaN como None.
+        
+        Com pyarrow a conversão é feita em C (NaN vira null na conversão);
+        sem ele, ou se alguma coluna não for convertível, usa pandas.
+        
+        Args:
+            df: DataFrame com os valores
+            
+        Returns:
+            Lista de dicts, um por linha
+        """
+        if pa is not None:
+            try:
+                return pa.Table.from_pandas(df, preserve_index=False).to_pylist()
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                pass
+        
+        # Converter valores NaN para None
+        return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    
     def send_dataframe(
         self,
         device_token: str,
         df: pd.DataFrame,
         timestamp_column: Optional[str] = None,
-        batch_size: int = 100
+        batch_size: int = 100,
+        max_workers: int = 16
     ) -> Dict[str, int]:
         """
         Envia dados de um DataFrame para ThingsBoard.
         
+        Os lotes são enviados por um pool de threads (requests libera o GIL
+        durante o I/O), reaproveitando as conexões do pool da session.
+        
         Args:
             device_token: Token de acesso do dispositivo
             df: DataFrame com os dados
             timestamp_column: Nome da coluna com timestamps
             batch_size: Tamanho do lote para envio
+            max_workers: Lotes enviados simultaneamente (1 = sequencial)
             
         Returns:
             Dict com estatísticas do envio
@@ -184,39 +502,36 @@ class ThingsBoardService:
         
         logger.info(f"Enviando {total_rows} registros para ThingsBoard")
         
-        for i in range(0, total_rows, batch_size):
-            batch = df.iloc[i:i + batch_size]
-            telemetry_list = []
-            
-            for idx, row in batch.iterrows():
-                # Converter para timestamp em milissegundos
-                if timestamp_column and timestamp_column in df.columns:
-                    ts = int(pd.Timestamp(row[timestamp_column]).timestamp() * 1000)
-                elif isinstance(idx, pd.Timestamp):
-                    ts = int(idx.timestamp() * 1000)
-                else:
-                    ts = int(datetime.now().timestamp() * 1000)
-                
-                # Remover coluna de timestamp dos valores
-                values = row.to_dict()
-                if timestamp_column and timestamp_column in values:
-                    del values[timestamp_column]
-                
-                # Converter valores NaN para None
-                values = {k: (None if pd.isna(v) else v) for k, v in values.items()}
-                
-                telemetry_list.append({
-                    "ts": ts,
-                    "values": values
-                })
-            
-            # Enviar lote
-            result = self.send_batch_telemetry(device_token, telemetry_list)
+        # Lotes gerados sob demanda: no máximo 2 x max_workers em memória
+        batches = self._iter_telemetry_batches(df, timestamp_column, batch_size)
+        in_flight = deque()
+        processed = 0
+        last_log = time.monotonic()
+        
+        def collect(future) -> None:
+            nonlocal success_count, failed_count, processed, last_log
+            result = future.result()
             success_count += result["success"]
             failed_count += result["failed"]
+            processed += result["total"]
             
-            if (i + batch_size) % 1000 == 0:
-                logger.info(f"Progresso: {i + batch_size}/{total_rows} registros processados")
+            # Progresso limitado por tempo, não por contagem de lotes
+            now = time.monotonic()
+            if now - last_log >= PROGRESS_LOG_INTERVAL:
+                logger.info(f"Progresso: {processed}/{total_rows} registros processados")
+                last_log = now
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for telemetry_list in batches:
+                # Janela cheia: aguardar o lote mais antigo (resultados em ordem)
+                if len(in_flight) >= 2 * max_workers:
+                    collect(in_flight.popleft())
+                in_flight.append(
+                    executor.submit(self.send_batch_telemetry, device_token, telemetry_list)
+                )
+            
+            while in_flight:
+                collect(in_flight.popleft())
         
         logger.info(
             f"Envio concluído: {success_count} sucesso, "
@@ -230,6 +545,7 @@ class ThingsBoardService:
             "success_rate": (success_count / total_rows * 100) if total_rows > 0 else 0
         }
     
+    @require_auth()
     def create_device(
         self,
         device_name: str,
@@ -248,10 +564,6 @@ class ThingsBoardService:
         Returns:
             Dict com informações do dispositivo criado ou existente
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         # Verificar se device já existe
         existing_device = self.get_device_by_name(device_name)
         if existing_device:
@@ -260,10 +572,6 @@ class ThingsBoardService:
         
         try:
             url = f"{self.tb_url}/api/device"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
             
             payload = {
                 "name": device_name,
@@ -273,10 +581,11 @@ class ThingsBoardService:
             if device_label:
                 payload["label"] = device_label
             
-            response = self.session.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, data=_dumps(payload), timeout=10)
             response.raise_for_status()
             
             device_info = response.json()
+            self._device_cache[device_name] = device_info
             logger.info(f"Dispositivo '{device_name}' criado com sucesso")
             
             return device_info
@@ -285,6 +594,7 @@ class ThingsBoardService:
             if e.response.status_code == 400:
                 # Device pode ter sido criado entre a verificação e a criação
                 logger.warning(f"Device '{device_name}' pode já existir, tentando buscar...")
+                self.invalidate_device_cache()
                 existing_device = self.get_device_by_name(device_name)
                 if existing_device:
                     return existing_device
@@ -294,6 +604,52 @@ class ThingsBoardService:
             logger.error(f"Erro ao criar dispositivo: {e}")
             return None
     
+    def create_devices_bulk(
+        self,
+        device_names: List[str],
+        device_type: str = "sensor",
+        max_workers: int = 16
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Cria (ou reutiliza) vários dispositivos e obtém seus tokens em paralelo.
+        
+        Args:
+            device_names: Nomes dos dispositivos
+            device_type: Tipo dos dispositivos
+            max_workers: Requisições simultâneas
+            
+        Returns:
+            Dict nome -> {"device": info, "token": token} (None se falhar)
+        """
+        if not self._authenticated:
+            logger.error("Não autenticado. Execute authenticate() primeiro")
+            return {name: None for name in device_names}
+        
+        # Carregar o cache antes de paralelizar: cada create_device consulta
+        # os existentes por nome sem disparar uma listagem do tenant por thread
+        if device_names and not self._device_cache_loaded:
+            try:
+                self._load_device_cache()
+            except Exception as e:
+                logger.warning(f"Não foi possível carregar cache de dispositivos: {e}")
+        
+        def provision(device_name: str) -> Optional[Dict[str, Any]]:
+            device = self.create_device(device_name, device_type)
+            if not device:
+                return None
+            
+            token = self.get_device_credentials(device.get("id", {}).get("id"))
+            return {"device": device, "token": token}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(device_names, executor.map(provision, device_names)))
+        
+        created = sum(1 for result in results.values() if result)
+        logger.info(f"Provisionamento concluído: {created}/{len(device_names)} dispositivos")
+        
+        return results
+    
+    @require_auth()
     def get_device_credentials(self, device_id: str) -> Optional[str]:
         """
         Obtém o token de acesso de um dispositivo.
@@ -304,17 +660,10 @@ class ThingsBoardService:
         Returns:
             Token de acesso do dispositivo
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         try:
             url = f"{self.tb_url}/api/device/{device_id}/credentials"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}"
-            }
             
-            response = self.session.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             credentials = response.json()
@@ -327,6 +676,7 @@ class ThingsBoardService:
             logger.error(f"Erro ao obter credenciais do dispositivo: {e}")
             return None
     
+    @require_auth(default=False)
     def send_attributes(
         self,
         device_id: str,
@@ -344,18 +694,10 @@ class ThingsBoardService:
         Returns:
             True se enviado com sucesso
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return False
-        
         try:
             url = f"{self.tb_url}/api/plugins/telemetry/DEVICE/{device_id}/{scope}"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
             
-            response = requests.post(url, json=attributes, headers=headers, timeout=10)
+            response = self.session.post(url, data=_dumps(attributes), timeout=10)
             response.raise_for_status()
             
             logger.info(f"Atributos enviados para dispositivo {device_id}")
@@ -365,43 +707,61 @@ class ThingsBoardService:
             logger.error(f"Erro ao enviar atributos: {e}")
             return False
     
+    def invalidate_device_cache(self):
+        """Descarta o cache de dispositivos (recarregado na próxima busca)."""
+        self._device_cache = {}
+        self._device_cache_loaded = False
+    
+    def _load_device_cache(self):
+        """Carrega todos os dispositivos do tenant, paginando até hasNext=False."""
+        url = f"{self.tb_url}/api/tenant/devices"
+        
+        cache = {}
+        page = 0
+        while True:
+            params = {
+                "pageSize": 1000,
+                "page": page
+            }
+            
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json()
+            for device in data.get("data", []):
+                cache[device.get("name")] = device
+            
+            if not data.get("hasNext"):
+                break
+            page += 1
+        
+        self._device_cache = cache
+        self._device_cache_loaded = True
+        logger.info(f"Cache de dispositivos carregado: {len(cache)} dispositivos")
+    
+    @require_auth()
     def get_device_by_name(self, device_name: str) -> Optional[Dict[str, Any]]:
         """
         Busca um dispositivo pelo nome.
         
+        A lista de dispositivos do tenant é carregada uma vez e mantida em
+        cache; use invalidate_device_cache() para forçar nova leitura.
+        
         Args:
             device_name: Nome do dispositivo
             
         Returns:
             Dict com informações do dispositivo ou None
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         try:
-            # Buscar dispositivos do tenant
-            url = f"{self.tb_url}/api/tenant/devices"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}"
-            }
-            params = {
-                "pageSize": 1000,
-                "page": 0
-            }
+            if not self._device_cache_loaded:
+                self._load_device_cache()
             
-            response = self.session.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            devices = response.json().get("data", [])
+            device = self._device_cache.get(device_name)
+            if device is None:
+                logger.warning(f"Dispositivo '{device_name}' não encontrado")
             
-            # Procurar device pelo nome
-            for device in devices:
-                if device.get("name") == device_name:
-                    return device
-            
-            logger.warning(f"Dispositivo '{device_name}' não encontrado")
-            return None
+            return device
             
         except Exception as e:
             logger.error(f"Erro ao buscar dispositivo: {e}")
@@ -4,10 +4,14 @@ Configura dashboards e análises de dados meteorológicos.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from typing import Dict, List, Optional, Any
 import pandas as pd
 
+from .auth_utils import require_auth
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +35,21 @@ class TrendzService:
         self._authenticated = False
         self.jwt_token = None
         
+        # Session HTTP reutilizável (keep-alive); retries com backoff em 502/503/504
+        # (apenas métodos idempotentes: POSTs não são repetidos)
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json'
+        })
+        
+    def close(self):
+        """Fecha as conexões HTTP da session."""
+        self.session.close()
+    
     def authenticate(self, username: str, password: str) -> bool:
         """
         Autentica no Trendz Analytics.
@@ -50,12 +69,15 @@ class TrendzService:
                 "password": password
             }
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             response.raise_for_status()
             
             self.jwt_token = response.json().get("token")
             self._authenticated = True
             
+            # Token enviado em todas as requisições seguintes da session
+            self.session.headers["Authorization"] = f"Bearer {self.jwt_token}"
+            
             logger.info("Autenticado no Trendz com sucesso")
             return True
             
@@ -64,6 +86,7 @@ class TrendzService:
             self._authenticated = False
             return False
     
+    @require_auth(default=False)
     def sync_data_sources(self) -> bool:
         """
         Sincroniza fontes de dados do ThingsBoard para o Trendz.
@@ -71,18 +94,10 @@ class TrendzService:
         Returns:
             True se sincronizado com sucesso
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return False
-        
         try:
             url = f"{self.trendz_url}/api/datasource/sync"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
             
-            response = requests.post(url, headers=headers, timeout=30)
+            response = self.session.post(url, timeout=30)
             response.raise_for_status()
             
             logger.info("Fontes de dados sincronizadas com sucesso")
@@ -92,6 +107,7 @@ class TrendzService:
             logger.error(f"Erro ao sincronizar fontes de dados: {e}")
             return False
     
+    @require_auth()
     def create_view(
         self,
         view_name: str,
@@ -107,23 +123,15 @@ class TrendzService:
         Returns:
             Dict com informações da view criada
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         try:
             url = f"{self.trendz_url}/api/view"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
             
             payload = {
                 "name": view_name,
                 "config": view_config
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             response.raise_for_status()
             
             view_info = response.json()
@@ -135,44 +143,51 @@ class TrendzService:
             logger.error(f"Erro ao criar view: {e}")
             return None
     
+    @require_auth()
     def get_telemetry_stats(
         self,
         device_id: str,
         keys: List[str],
         start_ts: int,
-        end_ts: int
+        end_ts: int,
+        interval_ms: int = 3600000,
+        agg: str = "AVG,MIN,MAX,COUNT",
+        limit: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Obtém estatísticas de telemetria de um dispositivo.
         
+        A agregação é feita no servidor; para períodos longos prefira
+        intervalos maiores (diário, semanal) a buscar pontos brutos e
+        reagregar no cliente.
+        
         Args:
             device_id: ID do dispositivo
             keys: Lista de chaves de telemetria
             start_ts: Timestamp inicial (milissegundos)
             end_ts: Timestamp final (milissegundos)
+            interval_ms: Intervalo de agregação em milissegundos (padrão: 1 hora)
+            agg: Funções de agregação separadas por vírgula
+            limit: Número máximo de pontos retornados (None = padrão do servidor)
             
         Returns:
             Dict com estatísticas
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         try:
             url = f"{self.trendz_url}/api/plugins/telemetry/DEVICE/{device_id}/values/timeseries"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}"
-            }
             
             params = {
                 "keys": ",".join(keys),
                 "startTs": start_ts,
                 "endTs": end_ts,
-                "agg": "AVG,MIN,MAX,COUNT",
-                "interval": 3600000  # 1 hora em milissegundos
+                "agg": agg,
+                "interval": interval_ms
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            if limit is not None:
+                params["limit"] = limit
+            
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             
             stats = response.json()
@@ -184,6 +199,7 @@ class TrendzService:
             logger.error(f"Erro ao obter estatísticas: {e}")
             return None
     
+    @require_auth()
     def create_weather_dashboard(
         self,
         station_id: str,
@@ -199,10 +215,6 @@ class TrendzService:
         Returns:
             ID do dashboard criado
         """
-        if not self._authenticated:
-            logger.error("Não autenticado. Execute authenticate() primeiro")
-            return None
-        
         try:
             # Configuração básica de dashboard para dados meteorológicos
             dashboard_config = {
@@ -270,12 +282,8 @@ class TrendzService:
             
             # Criar dashboard no ThingsBoard (Trendz usa dashboards do TB)
             url = f"{self.tb_url}/api/dashboard"
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
             
-            response = requests.post(url, json=dashboard_config, headers=headers, timeout=10)
+            response = self.session.post(url, json=dashboard_config, timeout=10)
             response.raise_for_status()
             
             dashboard_info = response.json()
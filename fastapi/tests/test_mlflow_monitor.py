@@ -0,0 +1,105 @@
+"""
+Testes do avanço do último timestamp verificado no MLflowMonitor.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("mlflow")
+pytest.importorskip("boto3")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.mlflow_monitor import MAX_RUN_ATTEMPTS, MLflowMonitor  # noqa: E402
+
+
+def _run(run_id: str, start_time: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        info=SimpleNamespace(
+            run_id=run_id,
+            run_name=run_id,
+            start_time=start_time,
+            experiment_id="1",
+        )
+    )
+
+
+def _result(run, success: bool, retryable: bool = False) -> dict:
+    return {
+        "run_id": run.info.run_id,
+        "success": success,
+        "retryable": retryable,
+        "error": None if success else "falha",
+    }
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_MONITOR_STATE", str(tmp_path / "state.json"))
+    monkeypatch.delenv("S3_BUCKET_NAME", raising=False)
+    return MLflowMonitor()
+
+
+def _wire(monitor, runs, outcome):
+    """Simula o MLflow (filtro por start_time) e o processamento dos runs."""
+    processed = []
+
+    def get_new_runs(experiment_name):
+        last_check = monitor.last_check_timestamps.get("1", 0)
+        return [run for run in runs if run.info.start_time > last_check]
+
+    def process_run(run):
+        processed.append(run.info.run_id)
+        return outcome(run)
+
+    monitor.get_new_runs = get_new_runs
+    monitor.process_run = process_run
+    return processed
+
+
+def test_permanent_failure_does_not_block_later_runs(monitor):
+    runs = [_run(f"run{i}", 1000 + i) for i in range(1, 6)]
+    processed = _wire(
+        monitor, runs, lambda run: _result(run, success=run.info.run_id != "run1")
+    )
+
+    monitor._check_experiment("exp")
+
+    assert monitor.last_check_timestamps["1"] == 1005
+    assert sorted(processed) == [f"run{i}" for i in range(1, 6)]
+
+    # Próximo ciclo: nada é reenviado
+    processed.clear()
+    assert monitor._check_experiment("exp") == []
+    assert processed == []
+
+
+def test_transient_failure_is_retried_until_cap(monitor):
+    runs = [_run(f"run{i}", 1000 + i) for i in range(1, 4)]
+    processed = _wire(
+        monitor,
+        runs,
+        lambda run: _result(
+            run, success=run.info.run_id != "run1", retryable=True
+        ),
+    )
+
+    monitor._check_experiment("exp")
+
+    # run1 fica pendente; run2/run3 concluídos não são reenviados
+    assert monitor.last_check_timestamps.get("1", 0) < 1001
+    for _ in range(MAX_RUN_ATTEMPTS - 1):
+        processed.clear()
+        monitor._check_experiment("exp")
+        assert processed == ["run1"]
+
+    assert monitor.last_check_timestamps["1"] == 1003
+
+    # Estado persistido é recarregado por uma nova instância
+    reloaded = MLflowMonitor()
+    reloaded._load_state()
+    assert reloaded.last_check_timestamps["1"] == 1003
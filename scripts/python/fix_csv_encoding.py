@@ -1,35 +1,50 @@
 import os
 import sys
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 
+# Marcas combinantes (acentos, cedilha) que o NFD separa das letras latinas;
+# removidas por str.translate em C, sem chamar unicodedata.category por caractere
+_STRIP_COMBINING = dict.fromkeys(range(0x0300, 0x0370))
+
+
 def normalize_text(text):
+    # NFD decompõe Ç/ç em C + cedilha, então a cedilha sai junto com os acentos
     text = unicodedata.normalize('NFD', text)
     
-    text = ''.join(char for char in text if unicodedata.category(char) != 'Mn')
-    
-    text = text.upper()
-    
-    replacements = {
-        'Ç': 'C',
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    return text.translate(_STRIP_COMBINING).upper()
+
+
+def _is_normalized(file_path):
+    # Já está em UTF-8 e com o cabeçalho (linha 9) normalizado?
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
     
-    return text
+    lines = text.split('\n', 9)
+    return len(lines) <= 8 or normalize_text(lines[8]) == lines[8]
 
 
 def fix_csv_encoding(file_path, backup=True):
     try:
+        # Reexecuções não reescrevem (nem recodificam de novo) arquivos já corrigidos
+        if _is_normalized(file_path):
+            print(f"⊘ Já normalizado: {file_path}")
+            return True
+        
         with open(file_path, 'r', encoding='latin-1') as f:
             lines = f.readlines()
         
         if backup:
+            # O original vira o backup por rename (sem reescrever o conteúdo)
             backup_path = str(file_path) + '.bak'
-            with open(backup_path, 'w', encoding='latin-1') as f:
-                f.writelines(lines)
+            os.replace(file_path, backup_path)
             print(f"  Backup criado: {backup_path}")
         
         if len(lines) > 8:
@@ -55,7 +70,8 @@ def process_data_directory(data_dir, backup=True):
         print(f"Erro: Diretório não encontrado: {data_dir}")
         sys.exit(1)
     
-    csv_files = list(data_path.rglob("*.CSV")) + list(data_path.rglob("*.csv"))
+    # Uma única varredura, com extensão sem diferenciar maiúsculas
+    csv_files = [p for p in data_path.rglob("*") if p.suffix.lower() == ".csv"]
     
     if not csv_files:
         print("Nenhum arquivo CSV encontrado.")
@@ -63,14 +79,16 @@ def process_data_directory(data_dir, backup=True):
     
     print(f"Encontrados {len(csv_files)} arquivos CSV para processar.\n")
     
-    success_count = 0
-    error_count = 0
+    # Arquivos independentes: corrigidos em paralelo, um processo por núcleo
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(
+            partial(fix_csv_encoding, backup=backup),
+            sorted(csv_files),
+            chunksize=4
+        ))
     
-    for csv_file in sorted(csv_files):
-        if fix_csv_encoding(csv_file, backup=backup):
-            success_count += 1
-        else:
-            error_count += 1
+    success_count = sum(results)
+    error_count = len(results) - success_count
     
     print(f"\n{'='*60}")
     print(f"Resumo:")
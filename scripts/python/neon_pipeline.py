@@ -1,23 +1,32 @@
 import boto3
+from botocore.config import Config
 import psycopg2
-from psycopg2.extras import execute_values
-import csv
+from psycopg2.pool import ThreadedConnectionPool
+import pandas as pd
+import gzip
 from io import StringIO
 from dotenv import load_dotenv
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import hashlib
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv(override=True)
 
-# Configurações do AWS S3
+# Arquivos processados em paralelo (download do S3 e carga no Neon são I/O)
+MAX_PIPELINE_WORKERS = int(os.getenv("NEON_PIPELINE_WORKERS", "4"))
+
+# Configurações do AWS S3 (cliente compartilhado entre as threads; pool com folga
+# para que nenhum worker espere por conexão)
 s3_client = boto3.client(
     's3',
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    region_name=os.getenv("AWS_REGION")
+    region_name=os.getenv("AWS_REGION"),
+    config=Config(max_pool_connections=max(32, MAX_PIPELINE_WORKERS * 2))
 )
 
 # Função para obter conexão com o banco
@@ -30,132 +39,101 @@ def get_db_connection():
         port=os.getenv("NEON_PORT")
     )
 
+# Pool de conexões do pipeline: cada thread worker fica com uma conexão própria
+# (chave = id da thread), sem compartilhar transações entre workers
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                1,
+                MAX_PIPELINE_WORKERS + 1,
+                dbname=os.getenv("NEON_DB"),
+                user=os.getenv("NEON_USER"),
+                password=os.getenv("NEON_PASSWORD"),
+                host=os.getenv("NEON_HOST"),
+                port=os.getenv("NEON_PORT")
+            )
+        return _pool
+
+def get_worker_connection():
+    """Retorna a conexão da thread atual, obtida do pool na primeira chamada"""
+    pool = _get_pool()
+    key = threading.get_ident()
+    conn = pool.getconn(key)
+    if conn.closed:
+        # Conexão perdida: descarta e pede outra ao pool
+        pool.putconn(conn, key, close=True)
+        conn = pool.getconn(key)
+    return conn
+
+def close_worker_connections():
+    """Fecha todas as conexões do pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+# DDL idempotente do pipeline (tabelas, colunas adicionadas depois, constraint e índices)
+INITIALIZE_DATABASE_SQL = """
+    CREATE TABLE IF NOT EXISTS dados_meteorologicos (
+        id SERIAL PRIMARY KEY,
+        estacao VARCHAR(50),
+        data DATE,
+        hora VARCHAR(10),
+        temperatura FLOAT,
+        umidade FLOAT,
+        velocidade_vento FLOAT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT dados_meteorologicos_estacao_data_hora_key UNIQUE(estacao, data, hora)
+    );
+
+    -- Tabelas criadas por versões anteriores do pipeline
+    ALTER TABLE dados_meteorologicos ADD COLUMN IF NOT EXISTS hora VARCHAR(10);
+    ALTER TABLE dados_meteorologicos
+        ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conname = 'dados_meteorologicos_estacao_data_hora_key'
+        ) THEN
+            ALTER TABLE dados_meteorologicos
+                ADD CONSTRAINT dados_meteorologicos_estacao_data_hora_key
+                UNIQUE(estacao, data, hora);
+        END IF;
+    END $$;
+
+    CREATE TABLE IF NOT EXISTS arquivos_processados (
+        id SERIAL PRIMARY KEY,
+        arquivo_s3 VARCHAR(500) UNIQUE,
+        data_processamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        registros_inseridos INTEGER DEFAULT 0,
+        registros_atualizados INTEGER DEFAULT 0,
+        status VARCHAR(20)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_estacao_data 
+    ON dados_meteorologicos(estacao, data);
+
+    CREATE INDEX IF NOT EXISTS idx_arquivo 
+    ON arquivos_processados(arquivo_s3);
+"""
+
 # Função para inicializar o banco de dados
 def initialize_database():
     """Cria as tabelas se não existirem"""
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        # Verificar se a tabela dados_meteorologicos existe
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name = 'dados_meteorologicos'
-            );
-        """)
-        tabela_existe = cursor.fetchone()[0]
-        
-        if not tabela_existe:
-            print(" Criando tabela dados_meteorologicos...")
-            cursor.execute("""
-                CREATE TABLE dados_meteorologicos (
-                    id SERIAL PRIMARY KEY,
-                    estacao VARCHAR(50),
-                    data DATE,
-                    hora VARCHAR(10),
-                    temperatura FLOAT,
-                    umidade FLOAT,
-                    velocidade_vento FLOAT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(estacao, data, hora)
-                );
-            """)
-            print("✓ Tabela dados_meteorologicos criada!")
-        else:
-            print("✓ Tabela dados_meteorologicos já existe")
-            
-            # Verificar e adicionar coluna hora se não existir
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.columns 
-                    WHERE table_name = 'dados_meteorologicos' 
-                    AND column_name = 'hora'
-                );
-            """)
-            coluna_hora_existe = cursor.fetchone()[0]
-            
-            if not coluna_hora_existe:
-                print(" Adicionando coluna hora...")
-                cursor.execute("""
-                    ALTER TABLE dados_meteorologicos ADD COLUMN hora VARCHAR(10);
-                """)
-                print("✓ Coluna hora adicionada!")
-            
-            # Verificar e adicionar coluna updated_at se não existir
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.columns 
-                    WHERE table_name = 'dados_meteorologicos' 
-                    AND column_name = 'updated_at'
-                );
-            """)
-            coluna_updated_existe = cursor.fetchone()[0]
-            
-            if not coluna_updated_existe:
-                print(" Adicionando coluna updated_at...")
-                cursor.execute("""
-                    ALTER TABLE dados_meteorologicos ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
-                """)
-                print("✓ Coluna updated_at adicionada!")
-            
-            # Verificar e adicionar constraint UNIQUE se não existir
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.table_constraints 
-                    WHERE table_name = 'dados_meteorologicos' 
-                    AND constraint_name = 'dados_meteorologicos_estacao_data_hora_key'
-                );
-            """)
-            constraint_existe = cursor.fetchone()[0]
-            
-            if not constraint_existe:
-                print(" Adicionando constraint UNIQUE(estacao, data, hora)...")
-                cursor.execute("""
-                    ALTER TABLE dados_meteorologicos 
-                    ADD CONSTRAINT dados_meteorologicos_estacao_data_hora_key 
-                    UNIQUE(estacao, data, hora);
-                """)
-                print("✓ Constraint UNIQUE adicionada!")
-        
-        # Verificar se a tabela arquivos_processados existe
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name = 'arquivos_processados'
-            );
-        """)
-        tabela_arquivos_existe = cursor.fetchone()[0]
-        
-        if not tabela_arquivos_existe:
-            print(" Criando tabela arquivos_processados...")
-            cursor.execute("""
-                CREATE TABLE arquivos_processados (
-                    id SERIAL PRIMARY KEY,
-                    arquivo_s3 VARCHAR(500) UNIQUE,
-                    data_processamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    registros_inseridos INTEGER DEFAULT 0,
-                    registros_atualizados INTEGER DEFAULT 0,
-                    status VARCHAR(20)
-                );
-            """)
-            print("✓ Tabela arquivos_processados criada!")
-        else:
-            print("✓ Tabela arquivos_processados já existe")
-        
-        # Criar índices
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_estacao_data 
-            ON dados_meteorologicos(estacao, data);
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_arquivo 
-            ON arquivos_processados(arquivo_s3);
-        """)
-        
+        # Todo o DDL em uma única requisição, sem consultar o information_schema
+        cursor.execute(INITIALIZE_DATABASE_SQL)
         conn.commit()
         print("✓ Banco de dados inicializado com sucesso!")
     except Exception as e:
@@ -169,7 +147,7 @@ def initialize_database():
 # Função para verificar se arquivo já foi processado
 def arquivo_ja_processado(arquivo_s3):
     """Verifica se o arquivo já foi processado com sucesso"""
-    conn = get_db_connection()
+    conn = get_worker_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("""
@@ -180,171 +158,254 @@ def arquivo_ja_processado(arquivo_s3):
         return resultado is not None
     except Exception as e:
         print(f"✗ Erro ao verificar arquivo: {e}")
+        conn.rollback()
         return False
     finally:
         cursor.close()
-        conn.close()
+
+# Função para carregar, de uma vez, os arquivos já processados com sucesso
+def listar_arquivos_processados():
+    """Retorna o conjunto de arquivos S3 já processados com sucesso"""
+    conn = get_worker_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT arquivo_s3 FROM arquivos_processados 
+            WHERE status = 'sucesso'
+        """)
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.rollback()
+
+# Registro (ou atualização) do status de processamento de um arquivo
+REGISTRAR_ARQUIVO_SQL = """
+    INSERT INTO arquivos_processados 
+        (arquivo_s3, registros_inseridos, registros_atualizados, status)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (arquivo_s3) 
+    DO UPDATE SET 
+        data_processamento = CURRENT_TIMESTAMP,
+        registros_inseridos = EXCLUDED.registros_inseridos,
+        registros_atualizados = EXCLUDED.registros_atualizados,
+        status = EXCLUDED.status;
+"""
 
 # Função para registrar arquivo processado
 def registrar_arquivo_processado(arquivo_s3, registros_inseridos, registros_atualizados, status):
     """Registra ou atualiza o processamento de um arquivo"""
-    conn = get_db_connection()
+    conn = get_worker_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO arquivos_processados 
-                (arquivo_s3, registros_inseridos, registros_atualizados, status)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (arquivo_s3) 
-            DO UPDATE SET 
-                data_processamento = CURRENT_TIMESTAMP,
-                registros_inseridos = EXCLUDED.registros_inseridos,
-                registros_atualizados = EXCLUDED.registros_atualizados,
-                status = EXCLUDED.status;
-        """, (arquivo_s3, registros_inseridos, registros_atualizados, status))
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        cursor.execute(
+            REGISTRAR_ARQUIVO_SQL,
+            (arquivo_s3, registros_inseridos, registros_atualizados, status)
+        )
         conn.commit()
     except Exception as e:
         print(f"✗ Erro ao registrar arquivo: {e}")
         conn.rollback()
     finally:
         cursor.close()
-        conn.close()
 
-# Função para listar objetos no S3
+# Função para listar objetos no S3 (todas as páginas, entregues conforme chegam)
 def list_s3_objects(bucket_name, prefix):
     print(f"Listando objetos no bucket {bucket_name} com prefixo {prefix}...")
-    response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-    if 'Contents' in response:
-        return [obj['Key'] for obj in response['Contents']]
-    else:
-        print("Nenhum objeto encontrado no prefixo especificado.")
-        return []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(
+        Bucket=bucket_name, Prefix=prefix, PaginationConfig={'PageSize': 1000}
+    ):
+        for obj in page.get('Contents', []):
+            yield obj['Key']
 
-# Função para extrair dados de um objeto no S3
+# Função para extrair dados de um objeto no S3 (linha a linha, sem carregar o arquivo inteiro)
 def extract_from_s3(bucket_name, object_name):
     print(f"Extraindo dados do objeto {object_name} no bucket {bucket_name}...")
     response = s3_client.get_object(Bucket=bucket_name, Key=object_name)
-    content = response['Body'].read()
+    body = response['Body']
+    if object_name.endswith('.gz') or response.get('ContentEncoding') == 'gzip':
+        # Descompacta enquanto baixa; o arquivo descompactado nunca fica inteiro em memória
+        raw_lines = (line.rstrip(b'\r\n') for line in gzip.GzipFile(fileobj=body))
+    else:
+        raw_lines = body.iter_lines(chunk_size=65536)
+    for raw_line in raw_lines:
+        try:
+            yield raw_line.decode('utf-8')
+        except UnicodeDecodeError:
+            # CSVs do INMET costumam vir em Latin-1
+            yield raw_line.decode('latin-1')
+
+# Tabela temporária que recebe o COPY; some no fim da transação
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE staging_dados_meteorologicos (
+        estacao VARCHAR(50),
+        data DATE,
+        hora VARCHAR(10),
+        temperatura FLOAT,
+        umidade FLOAT,
+        velocidade_vento FLOAT,
+        updated_at TIMESTAMP
+    ) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = """
+    COPY staging_dados_meteorologicos
+        (estacao, data, hora, temperatura, umidade, velocidade_vento, updated_at)
+    FROM STDIN WITH (FORMAT csv)
+"""
+
+# Upsert de toda a staging de uma vez (DISTINCT ON evita linha repetida no mesmo statement);
+# xmax = 0 identifica as linhas inseridas, as demais foram atualizadas
+UPSERT_FROM_STAGING_SQL = """
+    WITH upsert AS (
+        INSERT INTO dados_meteorologicos 
+            (estacao, data, hora, temperatura, umidade, velocidade_vento, updated_at) 
+        SELECT DISTINCT ON (estacao, data, hora)
+            estacao, data, hora, temperatura, umidade, velocidade_vento, updated_at
+        FROM staging_dados_meteorologicos
+        ON CONFLICT (estacao, data, hora) 
+        DO UPDATE SET 
+            temperatura = EXCLUDED.temperatura,
+            umidade = EXCLUDED.umidade,
+            velocidade_vento = EXCLUDED.velocidade_vento,
+            updated_at = EXCLUDED.updated_at
+        RETURNING (xmax = 0) AS inserido
+    )
+    SELECT
+        count(*) FILTER (WHERE inserido),
+        count(*) FILTER (WHERE NOT inserido)
+    FROM upsert
+"""
+
+# Linhas acumuladas em memória por COPY
+BATCH_SIZE = 50000
+
+# Colunas usadas do CSV do INMET
+# Data: index 0 | Hora: index 1 | Temperatura: 7 | Umidade: 15 | Vento: 18
+_CSV_COLUMNS = [0, 1, 7, 15, 18]
+
+class _LinesReader:
+    """Expõe um iterável de linhas como arquivo (read) para o pandas.read_csv."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            parts.append("\n")
+            length += len(line) + 1
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def __iter__(self):
+        return iter(self.read().splitlines(keepends=True))
+
+def _to_float(values):
+    """Converte uma coluna com vírgula decimal em float (NaN se inválido/vazio)."""
+    return pd.to_numeric(values.str.replace(",", ".", regex=False), errors="coerce")
+
+# Converte as linhas de dados (após o cabeçalho) em DataFrames prontos para o COPY
+def parse_chunks(lines, estacao, updated_at):
+    # Linhas truncadas (menos de 19 colunas) são descartadas antes do pandas,
+    # que as completaria com '' (dtype=str) e gravaria medições NULL no upsert
+    completas = (line for line in lines if line.count(";") >= 18)
     try:
-        return content.decode('utf-8')
-    except UnicodeDecodeError:
-        print("Falha ao decodificar UTF-8, tentando Latin-1...")
-        return content.decode('latin-1')
+        chunks = pd.read_csv(
+            _LinesReader(completas),
+            sep=";",
+            header=None,
+            usecols=_CSV_COLUMNS,
+            dtype=str,
+            keep_default_na=False,
+            on_bad_lines="skip",
+            chunksize=BATCH_SIZE,
+        )
+    except pd.errors.EmptyDataError:
+        return
+    
+    for chunk in chunks:
+        datas = pd.to_datetime(
+            chunk[0].str.replace("/", "-", regex=False),
+            format="%Y-%m-%d",
+            errors="coerce",
+        )
+        validas = datas.notna()
+        chunk = chunk[validas]
+        
+        yield pd.DataFrame({
+            "estacao": estacao,
+            "data": datas[validas].dt.strftime("%Y-%m-%d"),
+            "hora": chunk[1],
+            "temperatura": _to_float(chunk[7]),
+            "umidade": _to_float(chunk[15]),
+            "velocidade_vento": _to_float(chunk[18]),
+            "updated_at": updated_at,
+        })
 
 # Função para carregar dados no NEON
 def load_to_neon(data, arquivo_s3):
     print("Carregando dados no NEON (Modo Batch)...")
-    conn = get_db_connection()
+    conn = get_worker_connection()
     cursor = conn.cursor()
     
-    lines = data.splitlines()
+    # Aceita o texto completo ou um iterável de linhas (streaming do S3)
+    lines = iter(data.splitlines() if isinstance(data, str) else data)
     estacao = None
-    header_found = False
-    
-    # Buffer para batch insert
-    batch_rows = []
-    BATCH_SIZE = 1000  # Envia 1000 linhas por vez
     
     total_processed = 0
+    # Mesmo instante para todas as linhas do arquivo
+    updated_at = datetime.now()
+    
+    # Envia o buffer CSV acumulado para a staging via COPY
+    def flush(buffer):
+        buffer.seek(0)
+        cursor.copy_expert(COPY_STAGING_SQL, buffer)
     
     try:
+        # Metadados até o cabeçalho (extrai o nome da estação)
         for line in lines:
-            # Extract station name from metadata
             if line.startswith("ESTACAO:"):
                 parts = line.split(";")
                 if len(parts) > 1:
                     estacao = parts[1].strip()
+            elif line.upper().startswith("DATA;HORA UTC"):
+                break
+        
+        # Carga em massa reprocessável: o commit não espera o flush do WAL
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        cursor.execute(CREATE_STAGING_SQL)
+        
+        # Dados parseados em blocos vetorizados e enviados por COPY (NaN/None = NULL)
+        for df in parse_chunks(lines, estacao, updated_at):
+            if df.empty:
                 continue
-                
-            # Skip metadata until header
-            if not header_found:
-                if line.upper().startswith("DATA;HORA UTC"):
-                    header_found = True
-                continue
-                
-            # Process data rows
-            row = line.split(";")
-            if len(row) < 19: # Ensure enough columns
-                continue
-                
-            # Map columns
-            # Data: index 0
-            # Hora: index 1
-            # Temperatura: index 7
-            # Umidade: index 15
-            # Velocidade Vento: index 18
-            
-            data_medicao = row[0]
-            hora_medicao = row[1]  
-            
-            # Convert date format
-            try:
-                # Clean date format YYYY/MM/DD to YYYY-MM-DD
-                if "/" in data_medicao:
-                    data_medicao = data_medicao.replace("/", "-")
-                
-                # Parse date
-                data_obj = datetime.strptime(data_medicao, "%Y-%m-%d").date()
-            except (ValueError, IndexError) as e:
-                # print(f"⚠ Erro ao processar data: {data_medicao} - {e}")
-                continue
-            
-            def parse_float(value):
-                if not value:
-                    return None
-                try:
-                    return float(value.replace(",", "."))
-                except ValueError:
-                    return None
-
-            temperatura = parse_float(row[7])
-            umidade = parse_float(row[15])
-            velocidade_vento = parse_float(row[18])
-            
-            # Adicionar à lista de batch (tupla com os dados)
-            batch_rows.append((
-                estacao, 
-                data_obj, 
-                hora_medicao, 
-                temperatura, 
-                umidade, 
-                velocidade_vento, 
-                datetime.now()
-            ))
-            
-            # Se o buffer encheu, executa o batch
-            if len(batch_rows) >= BATCH_SIZE:
-                execute_values(cursor, """
-                    INSERT INTO dados_meteorologicos 
-                        (estacao, data, hora, temperatura, umidade, velocidade_vento, updated_at) 
-                    VALUES %s
-                    ON CONFLICT (estacao, data, hora) 
-                    DO UPDATE SET 
-                        temperatura = EXCLUDED.temperatura,
-                        umidade = EXCLUDED.umidade,
-                        velocidade_vento = EXCLUDED.velocidade_vento,
-                        updated_at = EXCLUDED.updated_at
-                """, batch_rows)
-                conn.commit()
-                total_processed += len(batch_rows)
-                print(f"  ✓ Processados: {total_processed} linhas...")
-                batch_rows = [] # Limpa o buffer
-
-        # Processar o restante das linhas que sobraram no buffer
-        if batch_rows:
-            execute_values(cursor, """
-                INSERT INTO dados_meteorologicos 
-                    (estacao, data, hora, temperatura, umidade, velocidade_vento, updated_at) 
-                VALUES %s
-                ON CONFLICT (estacao, data, hora) 
-                DO UPDATE SET 
-                    temperatura = EXCLUDED.temperatura,
-                    umidade = EXCLUDED.umidade,
-                    velocidade_vento = EXCLUDED.velocidade_vento,
-                    updated_at = EXCLUDED.updated_at
-            """, batch_rows)
-            conn.commit()
-            total_processed += len(batch_rows)
+            buffer = StringIO()
+            df.to_csv(buffer, header=False, index=False)
+            flush(buffer)
+            total_processed += len(df)
+            print(f"  ✓ Processados: {total_processed} linhas...")
+
+        # Um único upsert da staging para a tabela final, numa única transação
+        cursor.execute(UPSERT_FROM_STAGING_SQL)
+        inseridos, atualizados = cursor.fetchone()
+        
+        # Registrar arquivo como processado na mesma transação dos dados
+        cursor.execute(
+            REGISTRAR_ARQUIVO_SQL, (arquivo_s3, inseridos, atualizados, 'sucesso')
+        )
+        conn.commit()
 
     except Exception as e:
         print(f"  ✗ Erro ao processar batch: {e}")
@@ -352,12 +413,31 @@ def load_to_neon(data, arquivo_s3):
         raise e
     finally:
         cursor.close()
-        conn.close()
     
-    # Registrar arquivo como processado
-    registrar_arquivo_processado(arquivo_s3, total_processed, 0, 'sucesso')
+    print(f"✓ Arquivo processado! Total de linhas: {total_processed} "
+          f"({inseridos} inseridas, {atualizados} atualizadas)")
+
+# Processa um objeto do S3: verifica, extrai e carrega no Neon
+def process_object(bucket_name, object_name, idx, processados):
+    print(f"\n[{idx}] Verificando arquivo: {object_name}")
+    
+    # Verificar se arquivo já foi processado (consulta feita uma única vez em main)
+    if object_name in processados:
+        print(f"  ⏭ Arquivo já processado anteriormente. Pulando: {object_name}")
+        return 'ignorado'
     
-    print(f"✓ Arquivo processado! Total de linhas: {total_processed}")
+    try:
+        print(f"  📥 Extraindo dados do S3: {object_name}")
+        data = extract_from_s3(bucket_name, object_name)
+        
+        print(f"  💾 Carregando no Neon: {object_name}")
+        load_to_neon(data, object_name)
+        
+        return 'processado'
+    except Exception as e:
+        print(f"  ✗ Erro ao processar arquivo {object_name}: {e}")
+        registrar_arquivo_processado(object_name, 0, 0, 'erro')
+        return 'erro'
 
 # Pipeline principal
 def main():
@@ -375,32 +455,28 @@ def main():
     print(f"\n=== Listando objetos no bucket {bucket_name} com prefixo {prefix} ===")
     objects = list_s3_objects(bucket_name, prefix)
     
-    total_arquivos = len(objects)
-    processados = 0
-    ignorados = 0
-    
-    # Processar cada objeto
-    for idx, object_name in enumerate(objects, 1):
-        print(f"\n[{idx}/{total_arquivos}] Verificando arquivo: {object_name}")
-        
-        # Verificar se arquivo já foi processado
-        if arquivo_ja_processado(object_name):
-            print(f"  ⏭ Arquivo já processado anteriormente. Pulando...")
-            ignorados += 1
-            continue
+    # Processar os objetos em paralelo, enquanto a listagem ainda pagina;
+    # cada worker reutiliza sua própria conexão
+    try:
+        # Uma consulta para todos os arquivos, em vez de uma por objeto
+        processados_antes = listar_arquivos_processados()
         
-        try:
-            print(f"  📥 Extraindo dados do S3...")
-            data = extract_from_s3(bucket_name, object_name)
-            
-            print(f"  💾 Carregando no Neon...")
-            load_to_neon(data, object_name)
-            
-            processados += 1
-        except Exception as e:
-            print(f"  ✗ Erro ao processar arquivo: {e}")
-            registrar_arquivo_processado(object_name, 0, 0, 'erro')
-            continue
+        with ThreadPoolExecutor(max_workers=MAX_PIPELINE_WORKERS) as executor:
+            status = list(executor.map(
+                lambda item: process_object(
+                    bucket_name, item[1], item[0], processados_antes
+                ),
+                enumerate(objects, 1)
+            ))
+    finally:
+        close_worker_connections()
+    
+    total_arquivos = len(status)
+    if not total_arquivos:
+        print("Nenhum objeto encontrado no prefixo especificado.")
+    
+    processados = status.count('processado')
+    ignorados = status.count('ignorado')
     
     print(f"\n{'='*60}")
     print(f"Pipeline concluído!")
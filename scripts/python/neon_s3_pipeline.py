@@ -1,7 +1,13 @@
 import os
+import select
+import tempfile
 import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import boto3
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+from boto3.s3.transfer import TransferConfig
 from datetime import datetime
 import time
 import sys
@@ -22,6 +28,37 @@ S3_CONFIG = {
     'region': os.getenv('AWS_REGION', 'us-east-1')
 }
 
+# Tipos das colunas exportadas (o CSV do COPY é convertido direto em Arrow);
+# medições em float64, a mesma precisão das colunas FLOAT do Postgres
+EXPORT_COLUMN_TYPES = {
+    'id': pa.int64(),
+    'estacao': pa.string(),
+    'data': pa.date32(),
+    'temperatura': pa.float64(),
+    'umidade': pa.float64(),
+    'velocidade_vento': pa.float64(),
+    'sensacao_termica': pa.float64(),
+    'created_at': pa.timestamp('us'),
+}
+
+# Blocos grandes de leitura do CSV viram row groups de ~100k+ linhas no Parquet
+EXPORT_CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# CSV intermediário do COPY fica em memória até esse tamanho (depois vai para disco)
+EXPORT_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+# Margem (s) da marca d'água em relação ao momento da exportação: created_at
+# é o início da transação que inseriu, que pode fazer commit depois da
+# exportação. Menor que EXPORT_DEBOUNCE_SECONDS, para que a exportação
+# disparada por NOTIFY já inclua os dados avisados
+EXPORT_COMMIT_LAG_SECONDS = int(os.getenv('EXPORT_COMMIT_LAG_SECONDS', 10))
+
+# Upload multipart em paralelo para exports grandes
+EXPORT_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=10
+)
+
 def wait_for_database():
     """Aguarda o banco estar disponível"""
     max_retries = 30
@@ -74,6 +111,35 @@ def initialize_database():
             ON dados_meteorologicos(estacao, data);
         """)
         
+        # Exportação incremental: índice em created_at e marca d'água da última exportação
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_at 
+            ON dados_meteorologicos(created_at);
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exports_watermark (
+                id INTEGER PRIMARY KEY DEFAULT 1,
+                last_ts TIMESTAMP
+            );
+        """)
+        
+        # Aviso (NOTIFY) a cada INSERT, por statement; o Postgres já agrupa
+        # notificações iguais da mesma transação
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION notify_dados_changed() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('dados_changed', '');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cursor.execute("""
+            DROP TRIGGER IF EXISTS dados_changed_notify ON dados_meteorologicos;
+            CREATE TRIGGER dados_changed_notify
+            AFTER INSERT ON dados_meteorologicos
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_dados_changed();
+        """)
+        
         conn.commit()
         
         # Verificar quantidade de registros
@@ -101,52 +167,151 @@ def export_to_s3():
             region_name=S3_CONFIG['region']
         )
         
-        # Verificar se há dados
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM dados_meteorologicos")
+        
+        # Marca d'água: só exporta registros criados após a última exportação
+        cursor.execute("SELECT last_ts FROM exports_watermark WHERE id = 1")
+        row = cursor.fetchone()
+        watermark = row[0] if row else None
+        
+        # Limite superior abaixo do qual todas as transações já fizeram commit:
+        # início da transação aberta mais antiga deste banco (suas linhas têm
+        # created_at >= ele) e, como margem, now() - EXPORT_COMMIT_LAG_SECONDS.
+        # Intervalo semiaberto [marca d'água, limite): linhas com created_at
+        # igual ao limite ficam para a próxima exportação, que começa nele
+        cursor.execute("""
+            SELECT LEAST(
+                now()::timestamp - make_interval(secs => %s),
+                (SELECT MIN(xact_start)::timestamp FROM pg_stat_activity
+                 WHERE datname = current_database()
+                   AND backend_type = 'client backend'
+                   AND xact_start IS NOT NULL
+                   AND pid <> pg_backend_pid())
+            )
+        """, (EXPORT_COMMIT_LAG_SECONDS,))
+        horizon = cursor.fetchone()[0]
+        
+        # Verificar se há dados novos
+        cursor.execute("""
+            SELECT COUNT(*) FROM dados_meteorologicos
+            WHERE created_at >= COALESCE(%s, '-infinity'::timestamp)
+              AND created_at < %s
+        """, (watermark, horizon))
         count = cursor.fetchone()[0]
         
         if count == 0:
-            print("⚠ Nenhum dado para exportar")
+            print("⚠ Nenhum dado novo para exportar")
             cursor.close()
             conn.close()
             return
         
-        print(f" Exportando {count} registros...")
+        print(f" Exportando {count} registros (criados a partir de {watermark or 'o início'})...")
         
-        # Exportar dados
-        query = """
+        # Exportar dados (COPY não aceita parâmetros: o valor é escapado pelo mogrify)
+        query = cursor.mogrify("""
             SELECT 
                 id, estacao, data, temperatura, umidade, 
                 velocidade_vento, sensacao_termica, created_at
             FROM dados_meteorologicos
+            WHERE created_at >= COALESCE(%s, '-infinity'::timestamp)
+              AND created_at < %s
             ORDER BY data DESC, estacao
-        """
-        df = pd.read_sql(query, conn)
+        """, (watermark, horizon)).decode()
         
         # Salvar no S3
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         key = f"{S3_CONFIG['prefix']}/exports/meteorologia_{timestamp}.parquet"
         
-        temp_file = f'/tmp/temp_{timestamp}.parquet'
-        df.to_parquet(temp_file, index=False)
+        # O Postgres serializa o resultado via COPY (sem conversão linha a linha
+        # no Python) e o Arrow converte o CSV em Parquet em lotes colunares.
+        # O Parquet também fica em memória só até EXPORT_SPOOL_MAX_SIZE
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as parquet_buffer:
+            with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as csv_buffer:
+                cursor.copy_expert(
+                    f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", csv_buffer
+                )
+                csv_buffer.seek(0)
+                
+                reader = pa_csv.open_csv(
+                    csv_buffer,
+                    read_options=pa_csv.ReadOptions(block_size=EXPORT_CSV_BLOCK_SIZE),
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=EXPORT_COLUMN_TYPES,
+                        strings_can_be_null=True
+                    )
+                )
+                total_rows = 0
+                # zstd + dicionário na coluna estacao (valores muito repetidos)
+                with pq.ParquetWriter(
+                    parquet_buffer,
+                    reader.schema,
+                    compression='zstd',
+                    compression_level=3,
+                    use_dictionary=['estacao']
+                ) as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+                        total_rows += batch.num_rows
+            
+            file_size = parquet_buffer.tell()
+            parquet_buffer.seek(0)
+            s3_client.upload_fileobj(
+                parquet_buffer, S3_CONFIG['bucket'], key, Config=EXPORT_TRANSFER_CONFIG
+            )
         
-        s3_client.upload_file(temp_file, S3_CONFIG['bucket'], key)
-        
-        # Remover arquivo temporário
-        os.remove(temp_file)
+        # Avançar a marca d'água só depois do upload concluído
+        cursor.execute("""
+            INSERT INTO exports_watermark (id, last_ts) VALUES (1, %s)
+            ON CONFLICT (id) DO UPDATE SET last_ts = EXCLUDED.last_ts
+        """, (horizon,))
+        conn.commit()
         
-        print(f"✓ {len(df)} registros exportados para s3://{S3_CONFIG['bucket']}/{key}")
-        print(f"   Tamanho do arquivo: {os.path.getsize(temp_file) / 1024:.2f} KB")
+        print(f"✓ {total_rows} registros exportados para s3://{S3_CONFIG['bucket']}/{key}")
+        print(f"   Tamanho do arquivo: {file_size / 1024:.2f} KB")
         
         cursor.close()
         conn.close()
         
-    except FileNotFoundError:
-        print("⚠ Arquivo temporário não encontrado (já foi removido)")
     except Exception as e:
         print(f"✗ Erro na exportação: {e}")
 
+def listen_for_changes():
+    """Abre uma conexão em LISTEN dados_changed (None se não for possível)"""
+    try:
+        conn = psycopg2.connect(**NEON_CONFIG)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        conn.cursor().execute("LISTEN dados_changed;")
+        return conn
+    except Exception as e:
+        # Ex.: endpoint com pooler em modo transação não suporta LISTEN
+        print(f"⚠ LISTEN indisponível, usando apenas o intervalo fixo: {e}")
+        return None
+
+def wait_for_changes(listen_conn, timeout, debounce):
+    """
+    Espera por novos dados (NOTIFY) ou pelo timeout, o que vier primeiro.
+    
+    Notificações recebidas em sequência (ex.: vários arquivos carregados)
+    são agrupadas durante `debounce` segundos em uma única exportação.
+    
+    Returns:
+        A conexão de escuta, ou None se ela caiu (passa a usar só o timeout)
+    """
+    if listen_conn is None:
+        time.sleep(timeout)
+        return None
+    
+    try:
+        if select.select([listen_conn], [], [], timeout)[0]:
+            time.sleep(debounce)
+            listen_conn.poll()
+            listen_conn.notifies.clear()
+            print(" Novos dados detectados no Neon")
+        return listen_conn
+    except Exception as e:
+        print(f"⚠ Conexão de LISTEN perdida, usando apenas o intervalo fixo: {e}")
+        return None
+
 def get_database_stats():
     """Exibe estatísticas do banco de dados"""
     try:
@@ -205,15 +370,18 @@ if __name__ == '__main__':
     initialize_database()
     get_database_stats()
     
-    # Loop de exportação periódica
+    # Loop de exportação: dispara quando chegam dados novos (NOTIFY) e, no
+    # máximo, a cada intervalo como garantia
     export_interval = int(os.getenv('EXPORT_INTERVAL_SECONDS', 3600))
-    print(f"\n Pipeline ativo. Exportando a cada {export_interval/60:.0f} minutos...")
+    export_debounce = int(os.getenv('EXPORT_DEBOUNCE_SECONDS', 30))
+    print(f"\n Pipeline ativo. Exportando ao receber dados novos ou a cada {export_interval/60:.0f} minutos...")
     
+    listen_conn = listen_for_changes()
     try:
         while True:
             export_to_s3()
-            print(f"\n⏰ Próxima exportação em {export_interval/60:.0f} minutos...")
-            time.sleep(export_interval)
+            print(f"\n⏰ Próxima exportação com dados novos ou em {export_interval/60:.0f} minutos...")
+            listen_conn = wait_for_changes(listen_conn, export_interval, export_debounce)
     except KeyboardInterrupt:
         print("\n\n Pipeline encerrado pelo usuário")
     except Exception as e:
@@ -0,0 +1,51 @@
+"""
+Testes da conversão das linhas do CSV do INMET em parse_chunks.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("psycopg2")
+pytest.importorskip("pandas")
+pytest.importorskip("dotenv")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from neon_pipeline import parse_chunks  # noqa: E402
+
+
+def _linha_completa(data: str, hora: str) -> str:
+    campos = [""] * 19
+    campos[0] = data
+    campos[1] = hora
+    campos[7] = "25,5"
+    campos[15] = "80"
+    campos[18] = "3,2"
+    return ";".join(campos)
+
+
+def test_linha_truncada_e_descartada():
+    linhas = [
+        _linha_completa("2020/01/01", "0100 UTC"),
+        "2020/01/01;0200 UTC;0;1;2",
+        _linha_completa("2020/01/01", "0300 UTC"),
+    ]
+
+    chunks = list(parse_chunks(iter(linhas), "A001", datetime(2020, 1, 2)))
+    df = chunks[0]
+
+    assert list(df["hora"]) == ["0100 UTC", "0300 UTC"]
+    assert df["temperatura"].notna().all()
+    assert list(df["velocidade_vento"]) == [3.2, 3.2]
+
+
+def test_somente_linhas_truncadas_nao_gera_dados():
+    linhas = ["2020/01/01;0200 UTC;0;1;2"]
+
+    chunks = list(parse_chunks(iter(linhas), "A001", datetime(2020, 1, 2)))
+
+    assert sum(len(chunk) for chunk in chunks) == 0